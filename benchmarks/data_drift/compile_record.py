@@ -0,0 +1,146 @@
+"""Benchmark of compiling records with many features.
+
+Compares compiling a record from trusted values, as raitools does by default,
+with validating every model of the record, as it did before:
+
+    poetry run python benchmarks/data_drift/compile_record.py
+"""
+
+import random
+import time
+from typing import Callable, Dict, List
+
+from raitools.services.data_drift.data.bundle import Feature, FeatureMapping
+from raitools.services.data_drift.data.data_drift_record import (
+    BundleData,
+    DataDriftRecord,
+)
+from raitools.services.data_drift.data.job_config import DataDriftJobConfig
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_summaries,
+    validate_records,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    make_result_for_feature,
+)
+
+NUMS_FEATURES = [10_000, 50_000, 100_000]
+NUM_REPEATS = 3
+
+
+def make_feature_mapping(num_features: int) -> FeatureMapping:
+    """Makes a feature mapping with random importance scores."""
+    generator = random.Random(0)
+    feature_mapping = FeatureMapping(
+        feature_mapping={
+            f"feature_{i}": Feature(
+                name=f"feature_{i}",
+                kind=generator.choice(["numerical", "categorical"]),
+                importance_score=generator.random(),
+            )
+            for i in range(num_features)
+        }
+    )
+    return feature_mapping
+
+
+def make_drift_results(feature_mapping: FeatureMapping) -> DriftResultsType:
+    """Makes drift results with random test statistics and p-values."""
+    generator = random.Random(0)
+    drift_results = {
+        name: make_result_for_feature(
+            name,
+            feature.kind,
+            StatisticalTestResultType(
+                test_statistic=generator.random(), p_value=generator.random()
+            ),
+        )
+        for name, feature in feature_mapping.feature_mapping.items()
+    }
+    return drift_results
+
+
+def make_job_config() -> DataDriftJobConfig:
+    """Makes a job config."""
+    job_config = DataDriftJobConfig(
+        service_name="data_drift",
+        report_name="benchmark",
+        dataset_name="benchmark",
+        dataset_version="1",
+        feature_mapping_filename="feature_mapping.csv",
+        baseline_data_filename="baseline_data.csv",
+        test_data_filename="test_data.csv",
+        model_catalog_id="0",
+    )
+    return job_config
+
+
+def compile_record(
+    feature_mapping: FeatureMapping, drift_results: DriftResultsType
+) -> DataDriftRecord:
+    """Compiles a record from the benchmark's drift results."""
+    num_features = len(feature_mapping.feature_mapping)
+    record = create_record_from_summaries(
+        job_config=make_job_config(),
+        job_config_filename="job_config.json",
+        feature_mapping=feature_mapping,
+        bundle_filename="bundle.zip",
+        baseline_data=BundleData(
+            filename="baseline_data.csv", num_rows=1000, num_columns=num_features
+        ),
+        test_data=BundleData(
+            filename="test_data.csv", num_rows=1000, num_columns=num_features
+        ),
+        drift_results=drift_results,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    return record
+
+
+def best_time(
+    function: Callable[[FeatureMapping, DriftResultsType], DataDriftRecord],
+    feature_mapping: FeatureMapping,
+    drift_results: DriftResultsType,
+) -> float:
+    """Times the fastest of several runs of a function, in seconds."""
+    times: List[float] = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        function(feature_mapping, drift_results)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def compile_validated(
+    feature_mapping: FeatureMapping, drift_results: DriftResultsType
+) -> DataDriftRecord:
+    """Compiles a record, validating every model."""
+    with validate_records():
+        record = compile_record(feature_mapping, drift_results)
+    return record
+
+
+def main() -> None:
+    """Prints compile times with and without validation."""
+    print(f"{'features':>10} {'validated (s)':>14} {'trusted (s)':>12} {'speedup':>8}")
+    for num_features in NUMS_FEATURES:
+        feature_mapping = make_feature_mapping(num_features)
+        drift_results = make_drift_results(feature_mapping)
+
+        timings: Dict[str, float] = {
+            "validated": best_time(compile_validated, feature_mapping, drift_results),
+            "trusted": best_time(compile_record, feature_mapping, drift_results),
+        }
+
+        print(
+            f"{num_features:>10} {timings['validated']:>14.3f} "
+            f"{timings['trusted']:>12.3f} "
+            f"{timings['validated'] / timings['trusted']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
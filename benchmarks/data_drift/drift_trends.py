@@ -0,0 +1,66 @@
+"""Benchmark of drift trends and change points over a long history.
+
+Times laying out the statistics of many features over two years of daily
+records, and finding their change points:
+
+    poetry run python benchmarks/data_drift/drift_trends.py
+"""
+
+import time
+
+import numpy as np
+import pyarrow as pa
+
+from raitools.services.data_drift.use_cases.get_drift_trends import (
+    detect_change_points,
+    get_feature_trends,
+)
+
+NUM_FEATURES = 5_000
+NUM_RECORDS = 730
+NUM_SHIFTED_FEATURES = 50
+
+
+def make_statistics(num_features: int, num_records: int) -> pa.Table:
+    """Makes statistics of features, some of which shift halfway through."""
+    generator = np.random.default_rng(0)
+    test_statistics = generator.normal(0.2, 0.01, (num_features, num_records))
+    test_statistics[:NUM_SHIFTED_FEATURES, num_records // 2 :] += 0.05
+    timestamps = np.datetime64("2021-01-01") + np.arange(num_records)
+    statistics = pa.table(
+        {
+            "record_id": np.tile(np.arange(num_records), num_features),
+            "timestamp": np.tile(timestamps.astype(str), num_features),
+            "name": np.repeat(
+                [f"feature_{i}" for i in range(num_features)], num_records
+            ),
+            "test_statistic": test_statistics.ravel(),
+            "p_value": generator.random(num_features * num_records),
+            "drift_status": np.where(
+                test_statistics.ravel() > 0.25, "drifted", "not drifted"
+            ),
+        }
+    )
+    return statistics
+
+
+def main() -> None:
+    """Prints times to get trends and change points."""
+    statistics = make_statistics(NUM_FEATURES, NUM_RECORDS)
+
+    start_time = time.perf_counter()
+    trends = get_feature_trends(statistics)
+    trends_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    change_points = detect_change_points(trends)
+    change_points_time = time.perf_counter() - start_time
+
+    num_flagged = len(change_points) - change_points.column("change_point").null_count
+    print(f"{NUM_FEATURES} features x {NUM_RECORDS} records")
+    print(f"trends: {trends_time:.3f} s, change points: {change_points_time:.3f} s")
+    print(f"{num_flagged} features flagged, {NUM_SHIFTED_FEATURES} shifted")
+
+
+if __name__ == "__main__":
+    main()
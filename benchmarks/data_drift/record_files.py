@@ -0,0 +1,78 @@
+"""Benchmark of writing and reading records as JSON, Parquet and Arrow IPC.
+
+Compares file sizes, write times and read times for a record with many
+features:
+
+    poetry run python benchmarks/data_drift/record_files.py
+"""
+
+import json
+from pathlib import Path
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from compile_record import compile_record, make_drift_results, make_feature_mapping
+
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.record_tables import (
+    read_record_table,
+    write_record_table,
+)
+
+NUM_FEATURES = 20_000
+NUM_REPEATS = 3
+
+
+def write_json(record: DataDriftRecord, path: Path) -> None:
+    """Writes a record as JSON."""
+    path.write_text(json.dumps(record.dict()))
+
+
+def read_json(path: Path) -> DataDriftRecord:
+    """Reads a record from JSON."""
+    record = DataDriftRecord.parse_obj(json.loads(path.read_text()))
+    return record
+
+
+def best_time(function: Callable[[], object]) -> float:
+    """Times the fastest of several runs of a function, in seconds."""
+    times: List[float] = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def main() -> None:
+    """Prints file sizes and write and read times for each format."""
+    feature_mapping = make_feature_mapping(NUM_FEATURES)
+    record = compile_record(feature_mapping, make_drift_results(feature_mapping))
+
+    writers: Dict[str, Callable[[DataDriftRecord, Path], None]] = {
+        "json": write_json,
+        "parquet": lambda record, path: write_record_table(record, path, "parquet"),
+        "ipc": lambda record, path: write_record_table(record, path, "ipc"),
+    }
+    readers: Dict[str, Callable[[Path], DataDriftRecord]] = {
+        "json": read_json,
+        "parquet": read_record_table,
+        "ipc": read_record_table,
+    }
+
+    print(f"{NUM_FEATURES} features")
+    print(f"{'format':>8} {'size (MB)':>10} {'write (s)':>10} {'read (s)':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format, write in writers.items():
+            path = Path(directory) / f"record.{file_format}"
+            write_time = best_time(lambda: write(record, path))  # noqa: B023
+            read_time = best_time(lambda: readers[file_format](path))  # noqa: B023
+            print(
+                f"{file_format:>8} {path.stat().st_size / 1e6:>10.2f} "
+                f"{write_time:>10.3f} {read_time:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark of encoding and decoding record responses as JSON and binary.
+
+Compares payload sizes, encode times and decode times for a response with a
+record with many features:
+
+    poetry run python benchmarks/data_drift/wire_format.py
+"""
+
+import json
+import time
+from typing import Callable, Dict, List
+
+from compile_record import compile_record, make_drift_results, make_feature_mapping
+
+from raitools.services.data_drift.api.common import make_response
+from raitools.services.data_drift.data.response import Response
+from raitools.services.data_drift.wire_format import decode_response, encode_response
+
+NUM_FEATURES = 20_000
+NUM_REPEATS = 3
+
+
+def encode_json(response: Response) -> bytes:
+    """Encodes a response as JSON."""
+    return json.dumps(response.dict()).encode()
+
+
+def decode_json(payload: bytes) -> Response:
+    """Decodes a response from JSON."""
+    return Response(**json.loads(payload))
+
+
+def best_time(function: Callable[[], object]) -> float:
+    """Times the fastest of several runs of a function, in seconds."""
+    times: List[float] = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def main() -> None:
+    """Prints payload sizes and encode and decode times for each format."""
+    feature_mapping = make_feature_mapping(NUM_FEATURES)
+    response = make_response(
+        compile_record(feature_mapping, make_drift_results(feature_mapping))
+    )
+
+    encoders: Dict[str, Callable[[Response], bytes]] = {
+        "json": encode_json,
+        "binary": encode_response,
+    }
+    decoders: Dict[str, Callable[[bytes], Response]] = {
+        "json": decode_json,
+        "binary": decode_response,
+    }
+
+    print(f"{NUM_FEATURES} features")
+    print(f"{'format':>8} {'size (MB)':>10} {'encode (s)':>11} {'decode (s)':>11}")
+    for wire_format, encode in encoders.items():
+        payload = encode(response)
+        encode_time = best_time(lambda: encode(response))  # noqa: B023
+        decode_time = best_time(lambda: decoders[wire_format](payload))  # noqa: B023
+        print(
+            f"{wire_format:>8} {len(payload) / 1e6:>10.2f} "
+            f"{encode_time:>11.3f} {decode_time:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -47,3 +47,15 @@ class BadRecordError(DataDriftError):
     """Bad record error."""
 
     code = 506
+
+
+class WorkerError(DataDriftError):
+    """Drift worker error."""
+
+    code = 507
+
+
+class BadTopKError(DataDriftError):
+    """Bad top-k error."""
+
+    code = 508
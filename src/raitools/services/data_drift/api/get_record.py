@@ -1,29 +1,99 @@
 """Data Drift APIs."""
 
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Dict
+from typing import BinaryIO, Dict, Optional
 
 from raitools.services.data_drift.bundles import create_bundle_from_zip
 from raitools.exceptions import DataDriftError
 from raitools.services.data_drift.api.common import make_error_response, make_response
+from raitools.services.data_drift.data.response import Response
+from raitools.services.data_drift.diagnostics import collect_diagnostics
+from raitools.services.data_drift.result_cache import ResultCache
+from raitools.services.data_drift.serialization import write_json
 from raitools.services.data_drift.use_cases.create_record import (
     create_record_from_bundle,
 )
+from raitools.services.data_drift.wire_format import encode_response
 
 
-def get_record(bundle_path: str, timestamp: str, uuid: str) -> Dict:
+def get_record(
+    bundle_path: str,
+    timestamp: str,
+    uuid: str,
+    with_diagnostics: bool = False,
+    cache_dir: Optional[str] = None,
+) -> Dict:
     """Gets record.
 
     This is the integration point with components, RESTful APIs, CLIs, etc.
+    With diagnostics, the record includes the time and memory used by each
+    stage and feature. With a cache directory, per-feature results are
+    reused across calls for features whose data has not changed.
     """
+    response = _get_record_response(
+        bundle_path, timestamp, uuid, with_diagnostics, cache_dir
+    )
+    return response.dict()
+
+
+def write_record(
+    bundle_path: str,
+    timestamp: str,
+    uuid: str,
+    stream: BinaryIO,
+    with_diagnostics: bool = False,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Writes record response as JSON to a binary stream.
+
+    The JSON is the same as that of `get_record`'s response, but is written
+    as it is serialized, without first copying the record into dictionaries.
+    """
+    response = _get_record_response(
+        bundle_path, timestamp, uuid, with_diagnostics, cache_dir
+    )
+    write_json(response, stream)
+
+
+def get_record_binary(
+    bundle_path: str,
+    timestamp: str,
+    uuid: str,
+    with_diagnostics: bool = False,
+    cache_dir: Optional[str] = None,
+) -> bytes:
+    """Gets record response in the binary wire format.
+
+    The response is that of `get_record`, encoded by `encode_response`, and
+    decoded by `decode_response`.
+    """
+    response = _get_record_response(
+        bundle_path, timestamp, uuid, with_diagnostics, cache_dir
+    )
+    return encode_response(response)
+
+
+def _get_record_response(
+    bundle_path: str,
+    timestamp: str,
+    uuid: str,
+    with_diagnostics: bool,
+    cache_dir: Optional[str],
+) -> Response:
+    """Gets record, or the error creating it, as a response."""
     try:
-        bundle = create_bundle_from_zip(Path(bundle_path))
-        record = create_record_from_bundle(
-            bundle=bundle,
-            bundle_filename=Path(bundle_path).name,
-            timestamp=timestamp,
-            uuid=uuid,
-        )
-        return make_response(record).dict()
+        with ExitStack() as stack:
+            if with_diagnostics:
+                stack.enter_context(collect_diagnostics())
+            bundle = create_bundle_from_zip(Path(bundle_path))
+            record = create_record_from_bundle(
+                bundle=bundle,
+                bundle_filename=Path(bundle_path).name,
+                timestamp=timestamp,
+                uuid=uuid,
+                cache=None if cache_dir is None else ResultCache(Path(cache_dir)),
+            )
+        return make_response(record)
     except DataDriftError as excinfo:
-        return make_error_response("Failed to create DataDriftRecord.", excinfo).dict()
+        return make_error_response("Failed to create DataDriftRecord.", excinfo)
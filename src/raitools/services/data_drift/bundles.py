@@ -1,5 +1,6 @@
 """Data Drift bundle."""
 
+import io
 import json
 from pathlib import Path
 from typing import IO, List
@@ -17,42 +18,80 @@ from raitools.exceptions import (
     BadPathToBundleError,
 )
 from raitools.services.data_drift.data.bundle import Bundle, FeatureMapping
+from raitools.services.data_drift.data.common import FileName
 from raitools.services.data_drift.data_file_readers import read_data_file
+from raitools.services.data_drift.diagnostics import measure
+from raitools.services.data_drift.tracing import span
 from raitools.services.data_drift.data.job_config import DataDriftJobConfig
 
 
 def create_bundle_from_zip(bundle_path: Path) -> Bundle:
     """Creates a bundle."""
-    _validate_is_pathlib_path(bundle_path)
+    with measure("create_bundle"), span("open_bundle", bundle=str(bundle_path)):
+        _validate_is_pathlib_path(bundle_path)
 
-    job_config = get_job_config_from_bundle(bundle_path)
-    job_config_filename = get_job_config_filename_from_bundle(bundle_path)
-    feature_mapping = get_feature_mapping_from_bundle(
-        bundle_path, job_config.feature_mapping_filename
-    )
-    baseline_data = get_data_from_bundle(
-        bundle_path,
-        job_config.baseline_data_filename,
-        list(feature_mapping.feature_mapping.keys()),
-        list(feature_mapping.feature_mapping.values()),
-    )
-    test_data = get_data_from_bundle(
-        bundle_path,
-        job_config.test_data_filename,
-        list(feature_mapping.feature_mapping.keys()),
-        list(feature_mapping.feature_mapping.values()),
-    )
-
-    bundle = Bundle(
-        job_config_filename=job_config_filename,
-        feature_mapping_filename=job_config.feature_mapping_filename,
-        baseline_data_filename=job_config.baseline_data_filename,
-        test_data_filename=job_config.test_data_filename,
-        job_config=job_config,
-        feature_mapping=feature_mapping,
-        baseline_data=baseline_data,
-        test_data=test_data,
-    )
+        job_config = get_job_config_from_bundle(bundle_path)
+        job_config_filename = get_job_config_filename_from_bundle(bundle_path)
+        feature_mapping = get_feature_mapping_from_bundle(
+            bundle_path, job_config.feature_mapping_filename
+        )
+        baseline_data = get_data_from_bundle(
+            bundle_path,
+            job_config.baseline_data_filename,
+            list(feature_mapping.feature_mapping.keys()),
+            list(feature_mapping.feature_mapping.values()),
+        )
+        test_data = get_data_from_bundle(
+            bundle_path,
+            job_config.test_data_filename,
+            list(feature_mapping.feature_mapping.keys()),
+            list(feature_mapping.feature_mapping.values()),
+        )
+        additional_test_data_filenames = job_config.additional_test_data_filenames or []
+        additional_test_data = {
+            test_data_filename: get_data_from_bundle(
+                bundle_path,
+                test_data_filename,
+                list(feature_mapping.feature_mapping.keys()),
+                list(feature_mapping.feature_mapping.values()),
+            )
+            for test_data_filename in additional_test_data_filenames
+        }
+        all_test_data = {
+            job_config.test_data_filename: test_data,
+            **additional_test_data,
+        }
+        if job_config.timestamp_column is not None:
+            for test_data_filename, data in all_test_data.items():
+                _validate_data_file_has_timestamp_column(
+                    data, test_data_filename, job_config.timestamp_column
+                )
+        if job_config.slice_columns is not None:
+            _validate_data_file_has_slice_columns(
+                baseline_data,
+                job_config.baseline_data_filename,
+                job_config.slice_columns,
+            )
+            for test_data_filename, data in all_test_data.items():
+                _validate_data_file_has_slice_columns(
+                    data, test_data_filename, job_config.slice_columns
+                )
+
+        bundle = Bundle(
+            job_config_filename=job_config_filename,
+            feature_mapping_filename=job_config.feature_mapping_filename,
+            baseline_data_filename=job_config.baseline_data_filename,
+            test_data_filename=job_config.test_data_filename,
+            job_config=job_config,
+            feature_mapping=feature_mapping,
+            baseline_data=baseline_data,
+            test_data=test_data,
+            additional_test_data_filenames=[
+                FileName(test_data_filename)
+                for test_data_filename in additional_test_data_filenames
+            ],
+            additional_test_data=additional_test_data,
+        )
 
     return bundle
 
@@ -80,9 +119,14 @@ def get_job_config_from_bundle(bundle_path: Path) -> DataDriftJobConfig:
         job_config_path = Path(
             [file_path for file_path in files if file_path.endswith(".json")][0]
         )
-        job_config_json = json.loads(
-            zipfile.Path(zip_file, at=str(job_config_path)).read_text()
-        )
+        with span(
+            "read_member",
+            member=str(job_config_path),
+            bytes=zip_file.getinfo(str(job_config_path)).file_size,
+        ):
+            job_config_json = json.loads(
+                zipfile.Path(zip_file, at=str(job_config_path)).read_text()
+            )
 
     try:
         job_config = DataDriftJobConfig(**job_config_json)
@@ -95,11 +139,14 @@ def get_feature_mapping_from_bundle(
     bundle_path: Path, feature_mapping_filename: str
 ) -> FeatureMapping:
     """Gets specified feature mapping from the bundle."""
-    with zipfile.ZipFile(bundle_path, "r") as zip_file:
-        with zip_file.open(feature_mapping_filename) as feature_mapping_file:
-            feature_mapping_table = read_feature_mapping_file(
-                feature_mapping_file, feature_mapping_filename
-            )
+    with span("read_member", member=feature_mapping_filename) as member_span:
+        with zipfile.ZipFile(bundle_path, "r") as zip_file:
+            with zip_file.open(feature_mapping_filename) as feature_mapping_file:
+                feature_mapping_table = read_feature_mapping_file(
+                    feature_mapping_file, feature_mapping_filename
+                )
+        member_span.set_attribute("rows", feature_mapping_table.num_rows)
+        member_span.set_attribute("bytes", feature_mapping_table.nbytes)
 
     _validate_feature_mapping_file_has_observations(
         feature_mapping_table, feature_mapping_filename
@@ -119,13 +166,22 @@ def get_data_from_bundle(
     features: List,
 ) -> pa.Table:
     """Gets specified dataset from the bundle."""
-    with zipfile.ZipFile(bundle_path, "r") as zip_file:
-        with zip_file.open(data_filename) as data_file:
-            data = read_data_file(data_file, data_filename)
-
-    _validate_data_file_has_observations(data, data_filename)
-    _validate_data_file_has_required_fields(data, data_filename, required_fields)
-    _validate_fields_compatible_with_features(data, data_filename, features)
+    with span("read_member", member=data_filename) as member_span:
+        # Decompressing the member and parsing it are measured separately.
+        with measure(f"unzip_data/{data_filename}"):
+            with zipfile.ZipFile(bundle_path, "r") as zip_file:
+                data_bytes = zip_file.read(data_filename)
+        with measure(f"parse_data/{data_filename}"):
+            data = read_data_file(io.BytesIO(data_bytes), data_filename)
+        member_span.set_attribute("rows", data.num_rows)
+        member_span.set_attribute("bytes", data.nbytes)
+
+    with measure(f"validate_data/{data_filename}"), span(
+        "validate", member=data_filename, rows=data.num_rows
+    ):
+        _validate_data_file_has_observations(data, data_filename)
+        _validate_data_file_has_required_fields(data, data_filename, required_fields)
+        _validate_fields_compatible_with_features(data, data_filename, features)
     return data
 
 
@@ -171,6 +227,37 @@ def _validate_data_file_has_required_fields(
     return data
 
 
+def _validate_data_file_has_timestamp_column(
+    data: pa.Table, data_filename: str, timestamp_column: str
+) -> None:
+    if timestamp_column not in data.column_names:
+        raise BadDataFileError(
+            f"Data file `{data_filename}` does not contain timestamp column {timestamp_column!r} from job config."
+        )
+
+    field_type = data.schema.field(timestamp_column).type
+    if not (pa.types.is_timestamp(field_type) or pa.types.is_date(field_type)):
+        raise BadDataFileError(
+            f"Timestamp column `{timestamp_column}` in `{data_filename}` parsed as `{field_type}`."
+        )
+
+
+def _validate_data_file_has_slice_columns(
+    data: pa.Table, data_filename: str, slice_columns: List[str]
+) -> None:
+    for slice_column in slice_columns:
+        if slice_column not in data.column_names:
+            raise BadDataFileError(
+                f"Data file `{data_filename}` does not contain slice column {slice_column!r} from job config."
+            )
+
+        field_type = data.schema.field(slice_column).type
+        if not pa.types.is_string(field_type):
+            raise BadDataFileError(
+                f"Slice column `{slice_column}` in `{data_filename}` parsed as `{field_type}`."
+            )
+
+
 def _validate_fields_compatible_with_features(
     data: pa.Table, data_filename: str, features: List
 ) -> None:
@@ -249,10 +336,15 @@ def _validate_data_in_zip_file(bundle_path: Path) -> None:
         raise BadJobConfigError(
             f"Baseline data file `{baseline_data_filename}` referenced in `{job_config_filename}` not in `{bundle_path}`."
         )
-    if test_data_filename not in filenames:
-        raise BadJobConfigError(
-            f"Test data file `{test_data_filename}` referenced in `{job_config_filename}` not in `{bundle_path}`."
-        )
+    test_data_filenames = [
+        test_data_filename,
+        *(job_config_json.get("additional_test_data_filenames") or []),
+    ]
+    for test_data_filename in test_data_filenames:
+        if test_data_filename not in filenames:
+            raise BadJobConfigError(
+                f"Test data file `{test_data_filename}` referenced in `{job_config_filename}` not in `{bundle_path}`."
+            )
 
 
 def _validate_is_pathlib_path(bundle_path: Path) -> None:
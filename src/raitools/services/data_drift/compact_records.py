@@ -0,0 +1,287 @@
+"""Compact Data Drift records, with per-feature data stored once.
+
+A record keeps each feature twice: as a model in `results.features`, and as
+a row of `results.drift_details.observations`. A compact record, with
+`apiVersion` "raitools/v1-compact", instead keeps one column per field of
+`RANKED_RESULTS_SCHEMA`, in the order of `features`, and derives `features` and
+`drift_details` from them when first read:
+
+    compact = compact_record(record)
+    compact.results.features  # Same as record.results.features
+    record = expand_record(compact)
+
+Compact records are about half the size of records, and go wherever records
+are read for reports. Their columns are checked over whole columns, rather
+than feature by feature.
+
+Reports are made from records' metadata, summaries and drift details alone.
+`parse_report_record` parses those eagerly, checking drift details over
+whole columns, and leaves features and segments to be parsed if read.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import (
+    BaseModel,
+    Field,
+    parse_obj_as,
+    PrivateAttr,
+    root_validator,
+    validator,
+)
+
+import raitools
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift.data.data_drift_record import (
+    DataDriftRecord,
+    DriftSummaryFeature,
+    RecordBundle,
+    RecordDataSummary,
+    RecordDiagnostics,
+    RecordDriftDetails,
+    RecordDriftSummary,
+    RecordMetadata,
+    RecordResults,
+    RecordSegments,
+    ResultMetadata,
+)
+from raitools.services.data_drift.record_tables import (
+    check_feature_columns,
+    check_features_table,
+    record_to_table,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    RANKED_RESULTS_SCHEMA,
+    compile_features_for_drift_summary,
+)
+
+COMPACT_API_VERSION = "raitools/v1-compact"
+
+
+class CompactRecordResults(BaseModel):
+    """Data drift record results, with features as columns."""
+
+    metadata: ResultMetadata
+    data_summary: RecordDataSummary
+    drift_summary: RecordDriftSummary
+    fields: List[str]
+    columns: Dict[str, Any]
+    segments: Optional[RecordSegments] = None
+
+    _table: Optional[pa.Table] = PrivateAttr(None)
+    _features: Optional[Dict[str, DriftSummaryFeature]] = PrivateAttr(None)
+    _drift_details: Optional[RecordDriftDetails] = PrivateAttr(None)
+
+    @validator("columns")
+    def check_columns(cls, value: Dict[str, Any]) -> Dict[str, Any]:  # noqa: B902
+        """Checks that columns hold valid features."""
+        try:
+            check_features_table(_columns_table(value))
+        except BadRecordError as excinfo:
+            raise ValueError(excinfo.args[1]) from excinfo
+        return value
+
+    @property
+    def features(self) -> Dict[str, DriftSummaryFeature]:
+        """Gets features by name, as a record has them."""
+        if self._features is None:
+            self._features = compile_features_for_drift_summary(self.table)
+        return self._features
+
+    @property
+    def drift_details(self) -> RecordDriftDetails:
+        """Gets drift details, as a record has them."""
+        if self._drift_details is None:
+            self._drift_details = RecordDriftDetails(
+                fields=self.fields,
+                observations=self.table.sort_by("rank").select(self.fields).to_pydict(),
+            )
+        return self._drift_details
+
+    @property
+    def table(self) -> pa.Table:
+        """Gets features as a table."""
+        if self._table is None:
+            self._table = _columns_table(self.columns)
+        return self._table
+
+
+class CompactDataDriftRecord(BaseModel):
+    """A Data Drift record, with features as columns."""
+
+    apiVersion: str = Field(COMPACT_API_VERSION, const=True)
+    kind: str = Field("DataDriftRecord", const=True)
+    metadata: RecordMetadata = RecordMetadata(raitools_version=raitools.__version__)
+    results: CompactRecordResults
+    bundle: RecordBundle
+    diagnostics: Optional[RecordDiagnostics] = None
+
+
+class LazyRecordResults(BaseModel):
+    """Data drift record results, with features and segments parsed if read."""
+
+    metadata: ResultMetadata
+    data_summary: RecordDataSummary
+    drift_summary: RecordDriftSummary
+    drift_details: RecordDriftDetails
+    unparsed_features: Dict[str, Any] = Field(alias="features")
+    unparsed_segments: Optional[Dict[str, Any]] = Field(None, alias="segments")
+
+    _features: Optional[Dict[str, DriftSummaryFeature]] = PrivateAttr(None)
+    _segments: Optional[RecordSegments] = PrivateAttr(None)
+
+    @root_validator(skip_on_failure=True)
+    def check_details(cls, values: Dict[str, Any]) -> Dict[str, Any]:  # noqa: B902
+        """Checks that drift details hold valid features, one per feature.
+
+        Features are left unparsed, but must be the features of the drift
+        details, each as a mapping.
+        """
+        num_features = values["drift_summary"].num_total_features
+        try:
+            table = _drift_details_table(values["drift_details"])
+            check_feature_columns(table)
+        except BadRecordError as excinfo:
+            raise ValueError(excinfo.args[1]) from excinfo
+        if table.num_rows != num_features:
+            raise ValueError("Drift details do not have every feature.")
+        if "name" not in table.column_names:
+            raise ValueError("Drift details do not name their features.")
+
+        features = values["unparsed_features"]
+        # Names are distinct, so equal counts and containment mean equal sets.
+        if (
+            len(features) != num_features
+            or not pc.all(
+                pc.is_in(
+                    table.column("name"),
+                    value_set=pa.array(list(features), pa.string()),
+                )
+            ).as_py()
+        ):
+            raise ValueError("Features do not have every feature.")
+        if not all(isinstance(feature, dict) for feature in features.values()):
+            raise ValueError("Features are not all mappings.")
+        return values
+
+    @property
+    def features(self) -> Dict[str, DriftSummaryFeature]:
+        """Gets features by name, parsing them when first read."""
+        if self._features is None:
+            self._features = parse_obj_as(
+                Dict[str, DriftSummaryFeature], self.unparsed_features
+            )
+        return self._features
+
+    @property
+    def segments(self) -> Optional[RecordSegments]:
+        """Gets segments, if any, parsing them when first read."""
+        if self._segments is None and self.unparsed_segments is not None:
+            self._segments = RecordSegments.parse_obj(self.unparsed_segments)
+        return self._segments
+
+
+class LazyDataDriftRecord(BaseModel):
+    """A Data Drift record, with features and segments parsed if read."""
+
+    apiVersion: str = Field("raitools/v1", const=True)
+    kind: str = Field("DataDriftRecord", const=True)
+    metadata: RecordMetadata = RecordMetadata(raitools_version=raitools.__version__)
+    results: LazyRecordResults
+    bundle: RecordBundle
+    diagnostics: Optional[RecordDiagnostics] = None
+
+
+AnyDataDriftRecord = Union[DataDriftRecord, CompactDataDriftRecord, LazyDataDriftRecord]
+
+
+def compact_record(record: DataDriftRecord) -> CompactDataDriftRecord:
+    """Compacts a record."""
+    table = record_to_table(record)
+    results = record.results
+    compact = CompactDataDriftRecord(
+        apiVersion=COMPACT_API_VERSION,
+        kind=record.kind,
+        metadata=record.metadata,
+        results=CompactRecordResults(
+            metadata=results.metadata,
+            data_summary=results.data_summary,
+            drift_summary=results.drift_summary,
+            fields=results.drift_details.fields,
+            columns=table.to_pydict(),
+            segments=results.segments,
+        ),
+        bundle=record.bundle,
+        diagnostics=record.diagnostics,
+    )
+    return compact
+
+
+def expand_record(compact: CompactDataDriftRecord) -> DataDriftRecord:
+    """Expands a compact record into a record."""
+    results = compact.results
+    record = DataDriftRecord(
+        apiVersion=DataDriftRecord.__fields__["apiVersion"].default,
+        kind=compact.kind,
+        metadata=compact.metadata,
+        results=RecordResults(
+            metadata=results.metadata,
+            data_summary=results.data_summary,
+            drift_summary=results.drift_summary,
+            drift_details=results.drift_details,
+            features=results.features,
+            segments=results.segments,
+        ),
+        bundle=compact.bundle,
+        diagnostics=compact.diagnostics,
+    )
+    return record
+
+
+def parse_record(record: Dict) -> AnyDataDriftRecord:
+    """Parses a record or compact record, by its API version."""
+    RECORD_MODELS = {
+        DataDriftRecord.__fields__["apiVersion"].default: DataDriftRecord,
+        COMPACT_API_VERSION: CompactDataDriftRecord,
+    }
+    # Records of unknown versions fail validation as (uncompacted) records.
+    model = RECORD_MODELS.get(record.get("apiVersion"), DataDriftRecord)
+    parsed_record: AnyDataDriftRecord = model(**record)
+    return parsed_record
+
+
+def parse_report_record(record: Dict) -> AnyDataDriftRecord:
+    """Parses a record or compact record, as far as reports read it."""
+    REPORT_RECORD_MODELS = {
+        DataDriftRecord.__fields__["apiVersion"].default: LazyDataDriftRecord,
+        COMPACT_API_VERSION: CompactDataDriftRecord,
+    }
+    model = REPORT_RECORD_MODELS.get(record.get("apiVersion"), LazyDataDriftRecord)
+    parsed_record: AnyDataDriftRecord = model(**record)
+    return parsed_record
+
+
+def _columns_table(columns: Dict[str, Any]) -> pa.Table:
+    """Lays out feature columns as a table."""
+    try:
+        table = pa.table(columns, schema=RANKED_RESULTS_SCHEMA)
+    except (KeyError, TypeError, pa.ArrowException) as excinfo:
+        raise BadRecordError("Columns do not have record features.") from excinfo
+    return table
+
+
+def _drift_details_table(drift_details: RecordDriftDetails) -> pa.Table:
+    """Lays out drift details' observations as a table of feature columns."""
+    observations = drift_details.observations
+    try:
+        table = pa.table(
+            {field: observations[field] for field in drift_details.fields},
+            schema=pa.schema(
+                [RANKED_RESULTS_SCHEMA.field(field) for field in drift_details.fields]
+            ),
+        )
+    except (KeyError, TypeError, pa.ArrowException) as excinfo:
+        raise BadRecordError("Drift details do not have record features.") from excinfo
+    return table
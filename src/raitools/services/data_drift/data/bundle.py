@@ -1,6 +1,6 @@
 """Data model for Data Drift bundle."""
 
-from typing import Dict
+from typing import Dict, List
 
 import pyarrow as pa
 from pydantic import BaseModel, validator
@@ -57,6 +57,8 @@ class Bundle(BaseModel):
     feature_mapping: FeatureMapping
     baseline_data: pa.Table
     test_data: pa.Table
+    additional_test_data_filenames: List[FileName] = []
+    additional_test_data: Dict[str, pa.Table] = {}
 
     class Config:
         """Configuration for bundle data model."""
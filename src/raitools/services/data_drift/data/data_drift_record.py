@@ -1,7 +1,7 @@
 """The data drift record."""
 
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConstrainedFloat, ConstrainedInt, Field
 
@@ -107,6 +107,7 @@ class FeatureStatisticalTest(BaseModel):
     result: StatisticalTestResult
     significance_level: Probability
     outcome: StatisticalTestOutcome
+    approximation: Optional[str] = None
 
 
 class DriftSummaryFeature(BaseModel):
@@ -143,6 +144,13 @@ class RecordDriftDetails(BaseModel):
     observations: Dict[str, Any]
 
 
+class ResultWindow(BaseModel):
+    """Time window of test data that results are for."""
+
+    start: str
+    end: str
+
+
 class ResultMetadata(BaseModel):
     """Data drift result metadata."""
 
@@ -150,6 +158,27 @@ class ResultMetadata(BaseModel):
     timestamp: str
     uuid: str
     thresholds: Dict[str, Dict[str, float]]
+    window: Optional[ResultWindow] = None
+    top_k: Optional[PositiveCount] = None
+
+
+class RecordSegment(BaseModel):
+    """Data drift results for one segment of the data."""
+
+    key: Dict[str, Optional[str]]
+    num_baseline_rows: PositiveCount
+    num_test_rows: PositiveCount
+    drift_summary: RecordDriftSummary
+    features: Dict[str, DriftSummaryFeature]
+
+
+class RecordSegments(BaseModel):
+    """Data drift results by segment."""
+
+    slice_columns: List[str]
+    min_segment_rows: PositiveCount
+    num_skipped_segments: NonNegativeCount
+    segments: List[RecordSegment]
 
 
 class RecordResults(BaseModel):
@@ -160,6 +189,28 @@ class RecordResults(BaseModel):
     drift_summary: RecordDriftSummary
     drift_details: RecordDriftDetails
     features: Dict[str, DriftSummaryFeature]
+    segments: Optional[RecordSegments] = None
+
+
+class ResourceUsage(BaseModel):
+    """Resources used by one stage of work.
+
+    Wall and CPU times are in seconds. Arrow bytes are the net change in
+    bytes allocated from Arrow's default memory pool, and Arrow max memory is
+    the pool's high-water mark when the stage finished.
+    """
+
+    wall_time: float
+    cpu_time: float
+    arrow_bytes_allocated: int
+    arrow_max_memory: int
+
+
+class RecordDiagnostics(BaseModel):
+    """Resource usage per pipeline stage and per feature."""
+
+    stages: Dict[str, ResourceUsage]
+    features: Dict[str, Dict[str, ResourceUsage]]
 
 
 class DataDriftRecord(BaseModel):
@@ -170,3 +221,4 @@ class DataDriftRecord(BaseModel):
     metadata: RecordMetadata = RecordMetadata()
     results: RecordResults
     bundle: RecordBundle
+    diagnostics: Optional[RecordDiagnostics] = None
@@ -1,12 +1,69 @@
 """A Data Drift job config."""
 
+from datetime import timedelta
 import re
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, validator
+from pydantic.datetime_parse import parse_duration
 
 from raitools.exceptions import BadJobConfigError
 
 
+class WindowSpec(BaseModel):
+    """A spec for windows of test data over time.
+
+    Tumbling windows are back to back, so each observation falls in exactly
+    one window. Sliding windows start every `step` and may overlap. Durations
+    are ISO 8601 durations (e.g., "P1D") or a number of seconds.
+    """
+
+    kind: str
+    size: str
+    step: Optional[str] = None
+
+    @validator("kind")
+    def check_kind_supported(cls, value: str) -> str:
+        """Checks whether provided kind is supported."""
+        supported_kinds = ["tumbling", "sliding"]
+        if value not in supported_kinds:
+            raise BadJobConfigError(
+                f"Window kind {value!r} is not supported. "
+                "Supported window kinds are 'tumbling' and 'sliding'."
+            )
+
+        return value
+
+    @validator("size")
+    def check_size(cls, value: str) -> str:
+        """Checks that window size is a positive duration."""
+        _parse_positive_duration(value, "size")
+        return value
+
+    @validator("step", always=True)
+    def check_step(cls, value: Optional[str], values: Dict[str, Any]) -> Optional[str]:
+        """Checks that only sliding windows have a step, and that it's positive."""
+        if values.get("kind") == "tumbling" and value is not None:
+            raise BadJobConfigError("Tumbling windows do not take a step.")
+
+        if values.get("kind") == "sliding":
+            if value is None:
+                raise BadJobConfigError("Sliding windows require a step.")
+            _parse_positive_duration(value, "step")
+
+        return value
+
+    def get_size(self) -> timedelta:
+        """Gets window size."""
+        size = parse_duration(self.size)
+        return size
+
+    def get_step(self) -> timedelta:
+        """Gets time between the starts of consecutive windows."""
+        step = self.get_size() if self.step is None else parse_duration(self.step)
+        return step
+
+
 class DataDriftJobConfig(BaseModel):
     """A Data Drift job config."""
 
@@ -18,6 +75,11 @@ class DataDriftJobConfig(BaseModel):
     baseline_data_filename: str
     test_data_filename: str
     model_catalog_id: str
+    additional_test_data_filenames: Optional[List[str]] = None
+    timestamp_column: Optional[str] = None
+    window: Optional[WindowSpec] = None
+    slice_columns: Optional[List[str]] = None
+    min_segment_rows: int = 1
 
     @validator("service_name")
     def check_service_name(cls, value: str) -> str:
@@ -49,6 +111,53 @@ class DataDriftJobConfig(BaseModel):
 
         return value
 
+    @validator("window")
+    def check_window_has_timestamp_column(
+        cls, value: Optional[WindowSpec], values: Dict[str, Any]
+    ) -> Optional[WindowSpec]:
+        """Checks that a timestamp column is named if a window is given."""
+        if value is not None and values.get("timestamp_column") is None:
+            raise BadJobConfigError("Window requires a timestamp column.")
+
+        return value
+
+    @validator("additional_test_data_filenames")
+    def check_additional_test_data_filenames(
+        cls, value: Optional[List[str]], values: Dict[str, Any]
+    ) -> Optional[List[str]]:
+        """Checks that every test data file is named only once."""
+        if value is None:
+            return value
+
+        test_data_filenames = [values.get("test_data_filename"), *value]
+        if len(set(test_data_filenames)) != len(test_data_filenames):
+            raise BadJobConfigError(
+                f"Test data files {test_data_filenames} contain duplicates."
+            )
+
+        return value
+
+    @validator("slice_columns")
+    def check_slice_columns(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """Checks that slice columns, if given, are not empty or repeated."""
+        if value is not None and len(value) == 0:
+            raise BadJobConfigError("Slice columns are empty.")
+
+        if value is not None and len(set(value)) != len(value):
+            raise BadJobConfigError(f"Slice columns {value} contain duplicates.")
+
+        return value
+
+    @validator("min_segment_rows")
+    def check_min_segment_rows(cls, value: int) -> int:
+        """Checks that minimum segment row count is positive."""
+        if value < 1:
+            raise BadJobConfigError(
+                f"Minimum segment row count {value} is not positive."
+            )
+
+        return value
+
 
 def _find_unsupported_characters(value_string: str, search_string: str) -> bool:
     """Matches invalid characters.
@@ -59,3 +168,18 @@ def _find_unsupported_characters(value_string: str, search_string: str) -> bool:
     search = re.compile(search_string).search
     has_unsupported_characters = bool(search(value_string))
     return has_unsupported_characters
+
+
+def _parse_positive_duration(value: str, name: str) -> timedelta:
+    """Parses a duration, raising a job config error if it's not positive."""
+    try:
+        duration = parse_duration(value)
+    except (TypeError, ValueError) as excinfo:
+        raise BadJobConfigError(
+            f"Window {name} {value!r} is not a valid duration."
+        ) from excinfo
+
+    if duration <= timedelta(0):
+        raise BadJobConfigError(f"Window {name} {value!r} is not positive.")
+
+    return duration
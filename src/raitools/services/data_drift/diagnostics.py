@@ -0,0 +1,138 @@
+"""Timing and memory diagnostics for Data Drift.
+
+Diagnostics are only collected inside `collect_diagnostics`. Outside of it,
+measuring a stage costs a single context variable lookup.
+
+    with collect_diagnostics() as diagnostics:
+        bundle = create_bundle_from_zip(bundle_path)
+        record = create_record_from_bundle(bundle, bundle_path.name)
+        report = create_report(record, report_builder="plotly")
+
+    diagnostics.stages["render_report"].wall_time
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+import pyarrow as pa
+
+from raitools.services.data_drift.data.data_drift_record import (
+    RecordDiagnostics,
+    ResourceUsage,
+)
+
+DiagnosticsHookType = Callable[[str, Optional[str], ResourceUsage], None]
+
+
+class Diagnostics:
+    """Collects resource usage per pipeline stage and per feature."""
+
+    def __init__(self, hook: Optional[DiagnosticsHookType] = None) -> None:
+        """Initializes collector.
+
+        The hook, if given, is called with the stage name, feature name (or
+        `None` for pipeline stages), and resource usage as each measurement
+        completes.
+        """
+        self.hook = hook
+        self.stages: Dict[str, ResourceUsage] = {}
+        self.features: Dict[str, Dict[str, ResourceUsage]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, feature: Optional[str], usage: ResourceUsage) -> None:
+        """Adds a measurement.
+
+        Repeated measurements of the same stage (e.g., once per segment) are
+        totalled.
+        """
+        with self._lock:
+            usages = (
+                self.stages
+                if feature is None
+                else self.features.setdefault(feature, {})
+            )
+            if stage in usages:
+                usages[stage] = _add_usages(usages[stage], usage)
+            else:
+                usages[stage] = usage
+
+        if self.hook is not None:
+            self.hook(stage, feature, usage)
+
+    def to_record_diagnostics(self) -> RecordDiagnostics:
+        """Gets diagnostics collected so far, for a record."""
+        with self._lock:
+            record_diagnostics = RecordDiagnostics(
+                stages=dict(self.stages),
+                features={
+                    feature: dict(stages) for feature, stages in self.features.items()
+                },
+            )
+        return record_diagnostics
+
+
+def _add_usages(first: ResourceUsage, second: ResourceUsage) -> ResourceUsage:
+    """Totals two measurements of the same stage."""
+    total = ResourceUsage(
+        wall_time=first.wall_time + second.wall_time,
+        cpu_time=first.cpu_time + second.cpu_time,
+        arrow_bytes_allocated=first.arrow_bytes_allocated
+        + second.arrow_bytes_allocated,
+        arrow_max_memory=max(first.arrow_max_memory, second.arrow_max_memory),
+    )
+    return total
+
+
+_active_diagnostics: ContextVar[Optional[Diagnostics]] = ContextVar(
+    "data_drift_diagnostics", default=None
+)
+
+
+@contextmanager
+def collect_diagnostics(
+    hook: Optional[DiagnosticsHookType] = None,
+) -> Iterator[Diagnostics]:
+    """Collects diagnostics for all stages run inside this context."""
+    diagnostics = Diagnostics(hook)
+    token = _active_diagnostics.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        _active_diagnostics.reset(token)
+
+
+def get_active_diagnostics() -> Optional[Diagnostics]:
+    """Gets the diagnostics being collected, if any."""
+    return _active_diagnostics.get()
+
+
+@contextmanager
+def measure(stage: str, feature: Optional[str] = None) -> Iterator[None]:
+    """Measures resources used by a stage, if diagnostics are being collected.
+
+    Feature-level stages measure CPU time of the current thread, since
+    features may be evaluated concurrently. Pipeline stages measure CPU time
+    of the whole process.
+    """
+    diagnostics = _active_diagnostics.get()
+    if diagnostics is None:
+        yield
+        return
+
+    cpu_clock = time.process_time if feature is None else time.thread_time
+    start_bytes = pa.total_allocated_bytes()
+    start_cpu_time = cpu_clock()
+    start_wall_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        usage = ResourceUsage(
+            wall_time=time.perf_counter() - start_wall_time,
+            cpu_time=cpu_clock() - start_cpu_time,
+            arrow_bytes_allocated=pa.total_allocated_bytes() - start_bytes,
+            arrow_max_memory=pa.default_memory_pool().max_memory() or 0,
+        )
+        diagnostics.add(stage, feature, usage)
@@ -0,0 +1,346 @@
+"""Data Drift results computed by workers over TCP.
+
+A coordinator splits features into shards and sends each shard's baseline
+and test columns to a worker as Arrow IPC streams. The worker tests the
+shard's features and replies with their drift results as JSON. Shards whose
+worker fails (e.g., the connection drops or times out) are retried on
+another worker.
+
+Workers are started on each node with `serve_worker`. `LocalCluster` starts
+workers as processes on this machine instead, e.g., for testing:
+
+    with LocalCluster(num_workers=4) as cluster:
+        drift_results = get_distributed_drift_results(
+            baseline_data, test_data, feature_mapping, cluster.addresses
+        )
+
+Every message is a frame: an 8-byte big-endian payload length followed by
+the payload. A task is three frames (a JSON header naming the shard's
+features, the baseline IPC stream and the test IPC stream) and its reply is
+one JSON frame.
+"""
+
+import json
+import math
+import multiprocessing
+from multiprocessing.connection import Connection
+import queue
+import socket
+import socketserver
+import struct
+import threading
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import pyarrow as pa
+
+from raitools.exceptions import WorkerError
+from raitools.services.data_drift.tracing import span
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    FeatureType,
+    get_drift_results,
+)
+
+AddressType = Tuple[str, int]
+
+DEFAULT_PORT = 7470
+DEFAULT_SHARDS_PER_WORKER = 4
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Seconds a worker may take to connect or to reply to a shard before it is
+# dropped and the shard retried.
+DEFAULT_TIMEOUT = 600.0
+
+# How often idle coordinator threads check whether the job is done.
+POLL_INTERVAL = 0.05
+
+FRAME_HEADER = struct.Struct("!Q")
+
+
+class DriftWorkerServer(socketserver.ThreadingTCPServer):
+    """A worker that tests shards of features sent by coordinators."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: AddressType) -> None:
+        """Initializes worker listening at this address."""
+        super().__init__(address, _DriftWorkerHandler)
+
+
+class _DriftWorkerHandler(socketserver.BaseRequestHandler):
+    """Tests shards sent over one coordinator connection."""
+
+    def handle(self) -> None:
+        """Replies to tasks until the coordinator disconnects."""
+        while True:
+            try:
+                header = json.loads(_recv_frame(self.request))
+            except ConnectionError:
+                return
+            baseline_data = _from_ipc(_recv_frame(self.request))
+            test_data = _from_ipc(_recv_frame(self.request))
+
+            reply: Dict[str, Any]
+            try:
+                results = get_drift_results(
+                    baseline_data, test_data, header["feature_mapping"]
+                )
+                reply = {"results": results}
+            except Exception as error:
+                reply = {"error": f"{type(error).__name__}: {error}"}
+
+            _send_frame(self.request, json.dumps(reply).encode())
+
+
+def serve_worker(host: str = "0.0.0.0", port: int = DEFAULT_PORT) -> None:
+    """Runs a worker until interrupted."""
+    with DriftWorkerServer((host, port)) as server:
+        server.serve_forever()
+
+
+def get_distributed_drift_results(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    workers: List[AddressType],
+    shard_size: Optional[int] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> DriftResultsType:
+    """Gets drift results for all features from workers.
+
+    Features are split into shards of `shard_size` features (by default,
+    about `DEFAULT_SHARDS_PER_WORKER` shards per worker), which workers take
+    as they become free. A worker that fails, or takes longer than `timeout`
+    seconds to reply, is dropped and its shard retried on another worker, up
+    to `max_attempts` attempts per shard. A `timeout` of None waits for
+    workers indefinitely, so a hung worker then blocks the job.
+
+    Results are the same as `get_drift_results` gives.
+    """
+    if shard_size is None:
+        shard_size = math.ceil(
+            len(feature_mapping) / (len(workers) * DEFAULT_SHARDS_PER_WORKER)
+        )
+    feature_names = list(feature_mapping)
+    shards = [
+        {
+            name: feature_mapping[name]
+            for name in feature_names[start : start + shard_size]
+        }
+        for start in range(0, len(feature_names), shard_size)
+    ]
+
+    coordinator = _Coordinator(baseline_data, test_data, shards, max_attempts, timeout)
+    with span(
+        "get_distributed_drift_results", workers=len(workers), shards=len(shards)
+    ):
+        unordered_results = coordinator.run(workers)
+
+    results = {
+        feature_name: unordered_results[feature_name]
+        for feature_name in feature_mapping
+    }
+
+    return results
+
+
+class _Coordinator:
+    """Hands out shards to workers and gathers their results."""
+
+    def __init__(
+        self,
+        baseline_data: pa.Table,
+        test_data: pa.Table,
+        shards: List[Dict[str, FeatureType]],
+        max_attempts: int,
+        timeout: Optional[float],
+    ) -> None:
+        """Initializes coordinator with every shard pending."""
+        self.baseline_data = baseline_data
+        self.test_data = test_data
+        self.shards = shards
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.results: DriftResultsType = {}
+        self.errors: List[str] = []
+
+        self._pending: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+        for shard_index in range(len(shards)):
+            self._pending.put((shard_index, 1))
+        self._num_completed = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def run(self, workers: List[AddressType]) -> DriftResultsType:
+        """Runs every shard on the workers."""
+        threads = [
+            threading.Thread(target=self._drive_worker, args=(address,), daemon=True)
+            for address in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self.errors:
+            raise WorkerError(*self.errors)
+        if self._num_completed < len(self.shards):
+            raise WorkerError(
+                f"{len(self.shards) - self._num_completed} of {len(self.shards)} "
+                "shards could not be completed by any worker."
+            )
+
+        return self.results
+
+    def _drive_worker(self, address: AddressType) -> None:
+        """Sends shards to one worker until all are done or it fails."""
+        try:
+            connection = socket.create_connection(address, timeout=self.timeout)
+        except OSError:
+            return
+
+        with connection:
+            while not self._done.is_set():
+                try:
+                    shard_index, attempt = self._pending.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                try:
+                    reply = self._run_shard(connection, shard_index)
+                except OSError:
+                    self._retry(shard_index, attempt, address)
+                    return
+
+                self._complete(shard_index, reply)
+
+    def _run_shard(self, connection: socket.socket, shard_index: int) -> Dict[str, Any]:
+        """Sends a shard to a worker and waits for its reply."""
+        shard = self.shards[shard_index]
+        header = {"feature_mapping": shard}
+        with span("run_shard", shard=shard_index, features=len(shard)):
+            _send_frame(connection, json.dumps(header).encode())
+            _send_frame(connection, _to_ipc(self.baseline_data.select(list(shard))))
+            _send_frame(connection, _to_ipc(self.test_data.select(list(shard))))
+            reply = json.loads(_recv_frame(connection))
+        return reply
+
+    def _complete(self, shard_index: int, reply: Dict[str, Any]) -> None:
+        """Records a worker's reply for a shard."""
+        with self._lock:
+            if "error" in reply:
+                self.errors.append(f"Shard {shard_index}: {reply['error']}")
+                self._done.set()
+                return
+            self.results.update(reply["results"])
+            self._num_completed += 1
+            if self._num_completed == len(self.shards):
+                self._done.set()
+
+    def _retry(self, shard_index: int, attempt: int, address: AddressType) -> None:
+        """Puts a failed shard back for another worker, if attempts remain."""
+        with self._lock:
+            if attempt >= self.max_attempts:
+                self.errors.append(
+                    f"Shard {shard_index} failed {attempt} times, last on worker "
+                    f"{address[0]}:{address[1]}."
+                )
+                self._done.set()
+                return
+        self._pending.put((shard_index, attempt + 1))
+
+
+class LocalCluster:
+    """Worker processes on this machine, standing in for remote nodes."""
+
+    def __init__(self, num_workers: int) -> None:
+        """Initializes cluster of this many workers, not yet started."""
+        self.num_workers = num_workers
+        self.addresses: List[AddressType] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+
+    def __enter__(self) -> "LocalCluster":
+        """Starts every worker and waits until all are listening."""
+        context = multiprocessing.get_context("spawn")
+        connections = []
+        for _ in range(self.num_workers):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_run_local_worker, args=(child_connection,), daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+            connections.append(parent_connection)
+
+        self.addresses = [
+            ("127.0.0.1", connection.recv()) for connection in connections
+        ]
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stops every worker."""
+        for worker_index in range(len(self._processes)):
+            self.stop_worker(worker_index)
+
+    def stop_worker(self, worker_index: int) -> None:
+        """Stops one worker, as if its node failed."""
+        process = self._processes[worker_index]
+        process.terminate()
+        process.join()
+
+
+def _run_local_worker(connection: Connection) -> None:
+    """Runs a worker on a free local port, reporting the port back."""
+    with DriftWorkerServer(("127.0.0.1", 0)) as server:
+        connection.send(server.server_address[1])
+        connection.close()
+        server.serve_forever()
+
+
+def _send_frame(connection: socket.socket, payload: Union[bytes, pa.Buffer]) -> None:
+    """Sends one length-prefixed frame."""
+    connection.sendall(FRAME_HEADER.pack(len(payload)))
+    connection.sendall(payload)
+
+
+def _recv_frame(connection: socket.socket) -> bytes:
+    """Receives one length-prefixed frame."""
+    (size,) = FRAME_HEADER.unpack(_recv_exactly(connection, FRAME_HEADER.size))
+    payload = _recv_exactly(connection, size)
+    return payload
+
+
+def _recv_exactly(connection: socket.socket, size: int) -> bytes:
+    """Receives exactly this many bytes."""
+    payload = bytearray(size)
+    view = memoryview(payload)
+    num_received = 0
+    while num_received < size:
+        num_bytes = connection.recv_into(view[num_received:])
+        if num_bytes == 0:
+            raise ConnectionError("Connection closed mid-frame.")
+        num_received += num_bytes
+    return bytes(payload)
+
+
+def _to_ipc(data: pa.Table) -> pa.Buffer:
+    """Serializes a table as an Arrow IPC stream."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, data.schema) as writer:
+        writer.write_table(data)
+    return sink.getvalue()
+
+
+def _from_ipc(payload: bytes) -> pa.Table:
+    """Deserializes a table from an Arrow IPC stream."""
+    with pa.ipc.open_stream(pa.py_buffer(payload)) as reader:
+        data = reader.read_all()
+    return data
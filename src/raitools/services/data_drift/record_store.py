@@ -0,0 +1,318 @@
+"""Local store of Data Drift records, indexed for historical queries.
+
+Records are indexed in SQLite by report name, dataset name and version,
+model catalog ID and timestamp. Their per-feature statistics are kept apart,
+as Parquet files partitioned by model and month, so queries read only the
+columns and partitions they need rather than whole records:
+
+    with RecordStore(Path("records")) as store:
+        store.ingest(record)
+        entries = store.find_records(
+            model_catalog_id="model", start="2022-01-01", end="2022-04-01"
+        )
+        drifted = store.get_feature_statistics(
+            [entry["record_id"] for entry in entries],
+            columns=["name", "p_value"],
+            drift_status="drifted",
+        )
+
+Timestamps are compared as ISO 8601 strings, so should share a format and
+time zone. The store is append-only, and has one writer at a time.
+"""
+
+import json
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+from types import TracebackType
+from typing import Iterable, List, Optional, Type, TypedDict
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.record_tables import (
+    FIELDS_KEY,
+    RECORD_KEY,
+    record_from_table,
+    record_to_table,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    RANKED_RESULTS_SCHEMA,
+)
+
+# Per-feature statistics of every record, with the record they belong to.
+STATISTICS_SCHEMA = pa.schema(
+    [pa.field("record_id", pa.int64()), pa.field("timestamp", pa.string())]
+    + list(RANKED_RESULTS_SCHEMA)
+)
+
+# Partitions with more files than this are compacted into one file.
+MAX_FILES_PER_PARTITION = 16
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    partition_id INTEGER PRIMARY KEY,
+    model_catalog_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    UNIQUE (model_catalog_id, month)
+);
+CREATE TABLE IF NOT EXISTS records (
+    record_id INTEGER PRIMARY KEY,
+    uuid TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    report_name TEXT NOT NULL,
+    dataset_name TEXT NOT NULL,
+    dataset_version TEXT NOT NULL,
+    model_catalog_id TEXT NOT NULL,
+    partition_id INTEGER NOT NULL REFERENCES partitions,
+    record_json TEXT NOT NULL,
+    fields_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_by_model
+    ON records (model_catalog_id, timestamp);
+CREATE INDEX IF NOT EXISTS records_by_report
+    ON records (report_name, timestamp);
+CREATE INDEX IF NOT EXISTS records_by_dataset
+    ON records (dataset_name, dataset_version, timestamp);
+CREATE INDEX IF NOT EXISTS records_by_timestamp
+    ON records (timestamp);
+"""
+
+
+class RecordEntry(TypedDict):
+    """A record's entry in the store's index."""
+
+    record_id: int
+    uuid: str
+    timestamp: str
+    report_name: str
+    dataset_name: str
+    dataset_version: str
+    model_catalog_id: str
+
+
+class RecordStore:
+    """Directory of records, indexed for historical queries."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initializes store in this directory, creating it if needed."""
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.directory / "index.sqlite")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "RecordStore":
+        """Opens store."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Closes store."""
+        self.close()
+
+    def close(self) -> None:
+        """Closes the store's index."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Gets the number of stored records."""
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM records").fetchone()
+        return count
+
+    def ingest(self, record: DataDriftRecord) -> int:
+        """Adds a record to the store, returning its ID."""
+        table = record_to_table(record)
+        job_config = record.bundle.job_config
+        timestamp = record.results.metadata.timestamp
+
+        with self._connection:
+            partition_id = self._get_partition_id(
+                job_config.model_catalog_id, timestamp[:7]
+            )
+            cursor = self._connection.execute(
+                "INSERT INTO records (uuid, timestamp, report_name, dataset_name, "
+                "dataset_version, model_catalog_id, partition_id, record_json, "
+                "fields_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.results.metadata.uuid,
+                    timestamp,
+                    job_config.report_name,
+                    job_config.dataset_name,
+                    job_config.dataset_version,
+                    job_config.model_catalog_id,
+                    partition_id,
+                    table.schema.metadata[RECORD_KEY].decode(),
+                    table.schema.metadata[FIELDS_KEY].decode(),
+                ),
+            )
+            record_id = cursor.lastrowid
+            assert record_id is not None
+
+            statistics = pa.Table.from_arrays(
+                [
+                    pa.array([record_id] * table.num_rows, pa.int64()),
+                    pa.array([timestamp] * table.num_rows, pa.string()),
+                    *table.columns,
+                ],
+                schema=STATISTICS_SCHEMA,
+            )
+            self._append(partition_id, record_id, statistics)
+
+        return record_id
+
+    def find_records(
+        self,
+        report_name: Optional[str] = None,
+        dataset_name: Optional[str] = None,
+        dataset_version: Optional[str] = None,
+        model_catalog_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[RecordEntry]:
+        """Finds entries of records matching all of the given filters.
+
+        Records are those with timestamps from `start` up to, but not
+        including, `end`, in order of timestamp.
+        """
+        conditions = {
+            "report_name = ?": report_name,
+            "dataset_name = ?": dataset_name,
+            "dataset_version = ?": dataset_version,
+            "model_catalog_id = ?": model_catalog_id,
+            "timestamp >= ?": start,
+            "timestamp < ?": end,
+        }
+        clauses = [clause for clause, value in conditions.items() if value is not None]
+        parameters = [value for value in conditions.values() if value is not None]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        rows = self._connection.execute(
+            "SELECT record_id, uuid, timestamp, report_name, dataset_name, "
+            "dataset_version, model_catalog_id FROM records "
+            f"{where} ORDER BY timestamp, record_id",
+            parameters,
+        ).fetchall()
+        entries = [
+            RecordEntry(
+                record_id=row[0],
+                uuid=row[1],
+                timestamp=row[2],
+                report_name=row[3],
+                dataset_name=row[4],
+                dataset_version=row[5],
+                model_catalog_id=row[6],
+            )
+            for row in rows
+        ]
+        return entries
+
+    def get_record(self, record_id: int) -> DataDriftRecord:
+        """Gets a stored record."""
+        row = self._connection.execute(
+            "SELECT record_json, fields_json FROM records WHERE record_id = ?",
+            (record_id,),
+        ).fetchone()
+        if row is None:
+            raise BadRecordError(f"Record {record_id!r} is not in the store.")
+
+        statistics = self.get_feature_statistics(
+            [record_id], columns=RANKED_RESULTS_SCHEMA.names
+        )
+        table = statistics.replace_schema_metadata(
+            {RECORD_KEY: row[0], FIELDS_KEY: row[1]}
+        )
+        record = record_from_table(table)
+        return record
+
+    def get_feature_statistics(
+        self,
+        record_ids: Iterable[int],
+        columns: Optional[List[str]] = None,
+        features: Optional[List[str]] = None,
+        drift_status: Optional[str] = None,
+    ) -> pa.Table:
+        """Gets per-feature statistics of these records.
+
+        The table has the columns of `STATISTICS_SCHEMA`, or just `columns`,
+        with a row per feature of each record, optionally only for some
+        features or a drift status.
+        """
+        record_ids = list(record_ids)
+        partition_ids = self._get_partition_ids(record_ids)
+        paths = [
+            str(path)
+            for partition_id in partition_ids
+            for path in sorted(self._partition_path(partition_id).glob("*.parquet"))
+        ]
+
+        expression = ds.field("record_id").isin(record_ids)
+        if features is not None:
+            expression &= ds.field("name").isin(features)
+        if drift_status is not None:
+            expression &= ds.field("drift_status") == drift_status
+
+        dataset = ds.dataset(paths, schema=STATISTICS_SCHEMA, format="parquet")
+        statistics = dataset.to_table(columns=columns, filter=expression)
+        return statistics
+
+    def _get_partition_id(self, model_catalog_id: str, month: str) -> int:
+        """Gets the ID of a model's partition for a month, creating it if new."""
+        self._connection.execute(
+            "INSERT OR IGNORE INTO partitions (model_catalog_id, month) VALUES (?, ?)",
+            (model_catalog_id, month),
+        )
+        (partition_id,) = self._connection.execute(
+            "SELECT partition_id FROM partitions "
+            "WHERE model_catalog_id = ? AND month = ?",
+            (model_catalog_id, month),
+        ).fetchone()
+        return partition_id
+
+    def _get_partition_ids(self, record_ids: List[int]) -> List[int]:
+        """Gets the IDs of the partitions holding these records."""
+        rows = self._connection.execute(
+            "SELECT DISTINCT partition_id FROM records "
+            "WHERE record_id IN (SELECT value FROM json_each(?)) "
+            "ORDER BY partition_id",
+            (json.dumps(record_ids),),
+        ).fetchall()
+        partition_ids = [row[0] for row in rows]
+        return partition_ids
+
+    def _append(self, partition_id: int, record_id: int, statistics: pa.Table) -> None:
+        """Adds a record's statistics to its partition, compacting it if full."""
+        partition_path = self._partition_path(partition_id)
+        partition_path.mkdir(parents=True, exist_ok=True)
+        _write_atomically(statistics, partition_path / f"{record_id:012d}.parquet")
+
+        paths = sorted(partition_path.glob("*.parquet"))
+        if len(paths) > MAX_FILES_PER_PARTITION:
+            compacted_statistics = pa.concat_tables(
+                [pq.read_table(path, schema=STATISTICS_SCHEMA) for path in paths]
+            )
+            _write_atomically(
+                compacted_statistics,
+                partition_path / f"{record_id:012d}-compacted.parquet",
+            )
+            for path in paths:
+                path.unlink()
+
+    def _partition_path(self, partition_id: int) -> Path:
+        """Gets the directory of a partition's statistics."""
+        return self.directory / "statistics" / str(partition_id)
+
+
+def _write_atomically(table: pa.Table, path: Path) -> None:
+    """Writes table as a Parquet file, replacing any file at the path at once."""
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(file_descriptor)
+    pq.write_table(table, temporary_path)
+    os.replace(temporary_path, path)
@@ -0,0 +1,213 @@
+"""Data Drift records as Parquet or Arrow IPC files.
+
+A record's features are written as a table with a row per feature, in the
+columns of `RANKED_RESULTS_SCHEMA`. The rest of the record (its metadata,
+summaries, segments and bundle) is small, and is stored as JSON in the
+table's schema metadata. Drift details are not stored, since their
+observations are the features' columns ordered by rank.
+
+    write_record_table(record, Path("record.parquet"))
+    record = read_record_table(Path("record.parquet"))
+
+Files are far smaller than the record's JSON and are read by analytics tools
+as is. Reading a file back checks the feature table's invariants over whole
+columns, rather than validating each feature's models.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift.data.common import Name
+from raitools.services.data_drift.data.data_drift_record import (
+    DataDriftRecord,
+    DriftStatus,
+    FeatureKind,
+    RecordDriftDetails,
+    StatisticalTestOutcome,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    RANKED_RESULTS_SCHEMA,
+    compile_features_for_drift_summary,
+)
+
+RECORD_KEY = b"raitools.record"
+FIELDS_KEY = b"raitools.fields"
+
+PARQUET_MAGIC = b"PAR1"
+IPC_MAGIC = b"ARROW1"
+
+
+def record_to_table(record: DataDriftRecord) -> pa.Table:
+    """Lays out a record's features as a table, with the rest as metadata."""
+    columns: Dict[str, List] = {name: [] for name in RANKED_RESULTS_SCHEMA.names}
+    for feature in record.results.features.values():
+        statistical_test = feature.statistical_test
+        columns["name"].append(feature.name)
+        columns["test_name"].append(statistical_test.name)
+        columns["significance_level"].append(statistical_test.significance_level)
+        columns["test_statistic"].append(statistical_test.result.test_statistic)
+        columns["p_value"].append(statistical_test.result.p_value)
+        columns["outcome"].append(statistical_test.outcome.value)
+        columns["drift_status"].append(feature.drift_status.value)
+        columns["approximation"].append(statistical_test.approximation)
+        columns["kind"].append(feature.kind.value)
+        columns["importance_score"].append(feature.importance_score)
+        columns["rank"].append(feature.rank)
+
+    rest_of_record = record.json(
+        exclude={"results": {"features": ..., "drift_details": ...}}
+    )
+    table = pa.table(
+        columns,
+        schema=RANKED_RESULTS_SCHEMA.with_metadata(
+            {
+                RECORD_KEY: rest_of_record,
+                FIELDS_KEY: json.dumps(record.results.drift_details.fields),
+            }
+        ),
+    )
+    return table
+
+
+def record_from_table(table: pa.Table) -> DataDriftRecord:
+    """Reconstructs a record from its table."""
+    _check_table(table)
+
+    metadata = table.schema.metadata
+    rest_of_record = json.loads(metadata[RECORD_KEY])
+    fields = json.loads(metadata[FIELDS_KEY])
+    rest_of_record["results"]["features"] = {}
+    rest_of_record["results"]["drift_details"] = {"fields": fields, "observations": {}}
+    record = DataDriftRecord.parse_obj(rest_of_record)
+
+    record.results.features = compile_features_for_drift_summary(table)
+    record.results.drift_details = RecordDriftDetails(
+        fields=fields,
+        observations=table.sort_by("rank").select(fields).to_pydict(),
+    )
+
+    return record
+
+
+def write_record_table(
+    record: DataDriftRecord, path: Path, file_format: str = "parquet"
+) -> None:
+    """Writes a record as a Parquet or Arrow IPC ("ipc") file."""
+    write = _get_writer(file_format)
+    write(record_to_table(record), path)
+
+
+def read_record_table(path: Path) -> DataDriftRecord:
+    """Reads a record from a Parquet or Arrow IPC file."""
+    with open(path, "rb") as file:
+        magic = file.read(len(IPC_MAGIC))
+
+    if magic.startswith(PARQUET_MAGIC):
+        table = pq.read_table(path)
+    elif magic == IPC_MAGIC:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    else:
+        raise BadRecordError(f"File {path.name!r} is not a Parquet or Arrow file.")
+
+    record = record_from_table(table)
+    return record
+
+
+def check_features_table(table: pa.Table) -> None:
+    """Checks that a table holds valid features, over whole columns."""
+    if not table.schema.equals(RANKED_RESULTS_SCHEMA, check_metadata=False):
+        raise BadRecordError("Table does not have record feature columns.")
+    check_feature_columns(table)
+
+
+def check_feature_columns(table: pa.Table) -> None:
+    """Checks whichever feature columns a table has, over whole columns."""
+    for name in table.column_names:
+        if name != "approximation" and table.column(name).null_count > 0:
+            raise BadRecordError(f"Column {name!r} has missing values.")
+
+    checks = _get_column_checks()
+    for name in table.column_names:
+        if name in checks and not pc.all(checks[name](table.column(name))).as_py():
+            raise BadRecordError(f"Column {name!r} has invalid values.")
+
+    if (
+        "name" in table.column_names
+        and pc.count_distinct(table.column("name")).as_py() != table.num_rows
+    ):
+        raise BadRecordError("Column 'name' has duplicate values.")
+
+
+WriterType = Callable[[pa.Table, Path], None]
+
+
+def _get_writer(name: str) -> WriterType:
+    """Gets file format implementation by name."""
+    WRITERS: Dict[str, WriterType] = {
+        "parquet": _write_parquet,
+        "ipc": _write_ipc,
+    }
+    return WRITERS[name]
+
+
+def _write_parquet(table: pa.Table, path: Path) -> None:
+    """Writes table as a Parquet file."""
+    pq.write_table(table, path)
+
+
+def _write_ipc(table: pa.Table, path: Path) -> None:
+    """Writes table as an Arrow IPC file."""
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _check_table(table: pa.Table) -> None:
+    """Checks that a table holds a record's features."""
+    metadata = table.schema.metadata or {}
+    if RECORD_KEY not in metadata or FIELDS_KEY not in metadata:
+        raise BadRecordError("Table does not have record metadata.")
+    check_features_table(table)
+
+
+ColumnCheckType = Callable[[pa.ChunkedArray], pa.ChunkedArray]
+
+
+def _get_column_checks() -> Dict[str, ColumnCheckType]:
+    """Gets checks of which values are valid, by feature column."""
+    COLUMN_CHECKS: Dict[str, ColumnCheckType] = {
+        "name": lambda values: pc.and_(
+            pc.match_substring_regex(values, Name.regex.pattern),
+            pc.less_equal(pc.utf8_length(values), Name.max_length),
+        ),
+        "kind": lambda values: pc.is_in(
+            values, pa.array([kind.value for kind in FeatureKind])
+        ),
+        "outcome": lambda values: pc.is_in(
+            values, pa.array([outcome.value for outcome in StatisticalTestOutcome])
+        ),
+        "drift_status": lambda values: pc.is_in(
+            values, pa.array([status.value for status in DriftStatus])
+        ),
+        "importance_score": lambda values: _is_between(values, 0.0, 1.0),
+        "significance_level": lambda values: _is_between(values, 0.0, 1.0),
+        # Degenerate tests can give undefined (NaN) p-values.
+        "p_value": lambda values: pc.or_(
+            pc.is_nan(values), _is_between(values, 0.0, 1.0)
+        ),
+        "rank": lambda values: pc.greater_equal(values, 1),
+    }
+    return COLUMN_CHECKS
+
+
+def _is_between(values: pa.ChunkedArray, lower: float, upper: float) -> pa.ChunkedArray:
+    """Checks which values are within bounds, inclusive."""
+    is_between = pc.and_(pc.greater_equal(values, lower), pc.less_equal(values, upper))
+    return is_between
@@ -4,7 +4,7 @@
 from datetime import datetime
 from typing import Any, Callable, Dict, List
 
-from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.compact_records import AnyDataDriftRecord
 
 
 class HtmlReportBuilder:
@@ -14,8 +14,9 @@ class HtmlReportBuilder:
         self,
     ) -> None:
         """Initializes report builder."""
-        self.record: DataDriftRecord
+        self.record: AnyDataDriftRecord
 
+        self.head_maker: Callable[[], str] = basic_head_maker
         self.thresholds_list_maker: Callable[
             [Dict[str, Dict[str, float]]], str
         ] = basic_thresholds_list_maker
@@ -28,6 +29,7 @@ class HtmlReportBuilder:
         timestamp_date = datetime.fromisoformat(self.record.results.metadata.timestamp)
         timestamp_str = timestamp_date.strftime("%Y-%m-%d %H:%M:%S (%Z)")
 
+        head_html = self.head_maker()
         thresholds_list_html = self.thresholds_list_maker(
             self.record.results.metadata.thresholds
         )
@@ -50,6 +52,7 @@ class HtmlReportBuilder:
             <html>
                 <head>
                     <title>{self.record.bundle.job_config.report_name}</title>
+                    {head_html}
                 </head>
                 <body>
                     <h3 style ='color: darkred'>Timestamp: {timestamp_str}</h3>
@@ -96,6 +99,11 @@ class HtmlReportBuilder:
         return self.html
 
 
+def basic_head_maker() -> str:
+    """Creates no HTML for the head, beyond the title."""
+    return ""
+
+
 def basic_thresholds_list_maker(thresholds: Dict[str, Dict[str, float]]) -> str:
     """Creates HTML from thresholds list."""
     thresholds_list_html = "<ul>\n"
@@ -1,17 +1,216 @@
 """Plotly-based report builder."""
 
+from functools import partial
+from html import escape
+import json
+import math
+from pathlib import Path
 from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import quoteattr
 
 import plotly.graph_objs as go
+from plotly.offline import get_plotlyjs
 from plotly.subplots import make_subplots
 
-from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.compact_records import AnyDataDriftRecord
 from raitools.services.data_drift.reports.html_report_builder import HtmlReportBuilder
 
+PLOTLYJS_FILENAME = "plotly.min.js"
 
-def plotly_report_builder(record: DataDriftRecord) -> Any:
-    """Builds an HTML report with fancy plotly diagrams."""
+MAX_HEATMAP_FEATURES = 100
+
+DRIFT_DETAILS_STYLE = """
+#drift-details {
+    width: 1490px;
+    padding: 0 130px 40px 155px;
+    background-color: #111111;
+    color: white;
+    font-family: "Open Sans", verdana, arial, sans-serif;
+}
+#drift-details .controls {
+    display: flex;
+    gap: 10px;
+    align-items: center;
+    padding-bottom: 10px;
+    font-size: 14px;
+}
+#drift-details table {
+    width: 100%;
+    border-collapse: collapse;
+    color: black;
+}
+#drift-details th, #drift-details td {
+    border: 1px solid black;
+    padding: 4px 8px;
+    height: 22px;
+    text-align: left;
+}
+#drift-details th {
+    background-color: #AFEEEE;
+    font-size: 18px;
+    cursor: pointer;
+}
+#drift-details th[aria-sort="ascending"]::after { content: " \\25B2"; }
+#drift-details th[aria-sort="descending"]::after { content: " \\25BC"; }
+#drift-details td {
+    background-color: #E0FFFF;
+    font-size: 14px;
+}
+"""
+
+# Pages, sorts and filters the drift details table from its data payload.
+# Only the rows of the current page are ever in the document.
+DRIFT_DETAILS_SCRIPT = """
+(function () {
+    var root = document.getElementById("drift-details");
+    var data = JSON.parse(
+        document.getElementById("drift-details-data").textContent
+    );
+    var fields = data.fields;
+    var columns = data.columns;
+    var decimals = data.decimals;
+    var numRows = fields.length ? columns[fields[0]].length : 0;
+    var names = (columns.name || []).map(function (name) {
+        return String(name).toLowerCase();
+    });
+    var statuses = columns.drift_status || [];
+
+    var filterInput = document.getElementById("drift-details-filter");
+    var statusSelect = document.getElementById("drift-details-status");
+    var pageSizeSelect = document.getElementById("drift-details-page-size");
+    var previousButton = document.getElementById("drift-details-previous");
+    var nextButton = document.getElementById("drift-details-next");
+    var pageLabel = document.getElementById("drift-details-page");
+    var headers = Array.prototype.slice.call(root.querySelectorAll("th"));
+    var tbody = root.querySelector("tbody");
+
+    var state = {
+        filter: "", status: "", sortField: null, descending: false,
+        page: 0, pageSize: 10
+    };
+    var order = [];
+
+    function escapeHtml(text) {
+        return text.replace(/&/g, "&amp;").replace(/</g, "&lt;")
+            .replace(/>/g, "&gt;");
+    }
+
+    function format(field, value) {
+        if (value === null) {
+            return "";
+        }
+        if (field in decimals && typeof value === "number") {
+            return value.toFixed(decimals[field]);
+        }
+        return String(value);
+    }
+
+    function numPages() {
+        return Math.max(1, Math.ceil(order.length / state.pageSize));
+    }
+
+    function update() {
+        order = [];
+        for (var row = 0; row < numRows; row++) {
+            if (state.filter && names[row].indexOf(state.filter) === -1) {
+                continue;
+            }
+            if (state.status && statuses[row] !== state.status) {
+                continue;
+            }
+            order.push(row);
+        }
+        if (state.sortField !== null) {
+            var values = columns[state.sortField];
+            var sign = state.descending ? -1 : 1;
+            order.sort(function (a, b) {
+                if (values[a] < values[b]) {
+                    return -sign;
+                }
+                if (values[a] > values[b]) {
+                    return sign;
+                }
+                return a - b;
+            });
+        }
+        state.page = Math.min(state.page, numPages() - 1);
+        render();
+    }
+
+    function render() {
+        var start = state.page * state.pageSize;
+        var stop = Math.min(start + state.pageSize, order.length);
+        var rowsHtml = [];
+        for (var index = start; index < stop; index++) {
+            var row = order[index];
+            var cellsHtml = fields.map(function (field) {
+                return "<td>" + escapeHtml(format(field, columns[field][row])) +
+                    "</td>";
+            });
+            rowsHtml.push("<tr>" + cellsHtml.join("") + "</tr>");
+        }
+        tbody.innerHTML = rowsHtml.join("");
+        pageLabel.textContent = "Page " + (state.page + 1) + " of " +
+            numPages() + " (" + order.length + " features)";
+        previousButton.disabled = state.page === 0;
+        nextButton.disabled = stop >= order.length;
+        headers.forEach(function (header) {
+            var sort = "none";
+            if (header.dataset.field === state.sortField) {
+                sort = state.descending ? "descending" : "ascending";
+            }
+            header.setAttribute("aria-sort", sort);
+        });
+    }
+
+    filterInput.addEventListener("input", function () {
+        state.filter = filterInput.value.toLowerCase();
+        state.page = 0;
+        update();
+    });
+    statusSelect.addEventListener("change", function () {
+        state.status = statusSelect.value;
+        state.page = 0;
+        update();
+    });
+    pageSizeSelect.addEventListener("change", function () {
+        state.pageSize = Number(pageSizeSelect.value);
+        state.page = 0;
+        update();
+    });
+    previousButton.addEventListener("click", function () {
+        state.page = Math.max(0, state.page - 1);
+        render();
+    });
+    nextButton.addEventListener("click", function () {
+        state.page = Math.min(numPages() - 1, state.page + 1);
+        render();
+    });
+    headers.forEach(function (header) {
+        header.addEventListener("click", function () {
+            var field = header.dataset.field;
+            state.descending = state.sortField === field && !state.descending;
+            state.sortField = field;
+            update();
+        });
+    });
+
+    update();
+})();
+"""
+
+
+def plotly_report_builder(
+    record: AnyDataDriftRecord, plotlyjs_src: Optional[str] = None
+) -> Any:
+    """Builds an HTML report with fancy plotly diagrams.
+
+    By default, the plotly.js library is included in the report. Reports
+    can instead load it from a URL or path, such as that of a file shared by
+    many reports and written by `write_plotlyjs`.
+    """
     report_builder = HtmlReportBuilder()
+    report_builder.head_maker = partial(plotly_head_maker, plotlyjs_src)
     report_builder.data_summary_maker = plotly_data_summary_maker
     report_builder.drift_summary_maker = plotly_drift_summary_maker
     report_builder.drift_magnitude_maker = plotly_drift_magnitude_maker
@@ -20,6 +219,29 @@ def plotly_report_builder(record: DataDriftRecord) -> Any:
     return report_builder.get()
 
 
+def write_plotlyjs(directory: Path) -> Path:
+    """Writes the plotly.js library to a file for reports to share."""
+    path = directory / PLOTLYJS_FILENAME
+    path.write_text(get_plotlyjs(), encoding="utf-8")
+    return path
+
+
+def plotly_head_maker(plotlyjs_src: Optional[str] = None) -> str:
+    """Creates HTML for the head that loads plotly.js, once per report."""
+    if plotlyjs_src is None:
+        plotlyjs_script = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    else:
+        plotlyjs_script = (
+            f'<script src={quoteattr(plotlyjs_src)} charset="utf-8"></script>'
+        )
+    head_html = f"""
+        <meta charset="utf-8" />
+        <script type="text/javascript">window.PlotlyConfig = {{MathJaxConfig: 'local'}};</script>
+        {plotlyjs_script}
+    """  # noqa: B950
+    return head_html
+
+
 def plotly_data_summary_maker(
     num_numerical_features: int, num_categorical_features: int
 ) -> str:
@@ -108,7 +330,7 @@ def plotly_data_summary_maker(
             ],
         }
     )
-    html = fig.to_html()
+    html = fig.to_html(include_plotlyjs=False, full_html=False)
 
     return html
 
@@ -276,8 +498,12 @@ def plotly_drift_summary_maker(
 def plotly_drift_magnitude_maker(
     fields: List[str], observations: Dict[str, List[Any]]
 ) -> str:
-    """Creates an plotly version of drift magnitude section."""
-    num_observations = len(observations[fields[0]])
+    """Creates an plotly version of drift magnitude section.
+
+    The heatmap shows the top features. The table holds every feature, in a
+    single payload that the browser pages, sorts and filters.
+    """
+    num_observations = min(len(observations[fields[0]]), MAX_HEATMAP_FEATURES)
     heatmap_data: List[Optional[Dict[str, Any]]] = [
         {field: observations[field][index] for field in fields}
         for index in range(num_observations)
@@ -339,68 +565,6 @@ def plotly_drift_magnitude_maker(
         )
     )
     heatmap_fig.update_layout(
-        {
-            "title": {
-                "text": "(Each cell contains the p-value for the top <= 100 features)",
-                "font": {
-                    "size": 20,
-                },
-            },
-        }
-    )
-
-    def create_table_trace(fields: List[str], cell_values: List[List]) -> go.Table:
-        table = go.Table(
-            header=dict(values=fields, fill_color="grey", align="left"),
-            cells=dict(
-                values=cell_values,
-                fill_color="lightgrey",
-                align="left",
-                format=["g", ".6f", "", "", ".3f", ""],
-            ),
-            visible=False,
-        )
-        return table
-
-    cell_values = [observations[field] for field in fields]
-    table_fig = go.Figure()
-
-    num_observations_in_view = 10
-    for start in range(0, num_observations, num_observations_in_view):
-        stop = start + num_observations_in_view
-        if stop > num_observations:
-            view_values = [values[start:num_observations] for values in cell_values]
-        else:
-            view_values = [values[start:stop] for values in cell_values]
-        step_trace = create_table_trace(fields, view_values)
-        table_fig.add_trace(step_trace)
-
-    table_fig.data[0].visible = True
-
-    table_fig.update_traces(
-        header_line_color="black",
-        header_fill_color="#AFEEEE",
-        header_align="left",
-        header_font_size=18,
-        header_font_color="black",
-        header_values=fields,
-        cells_line_color="black",
-        cells_fill_color="#E0FFFF",
-        cells_align="left",
-        cells_font_size=14,
-        cells_font_color="black",
-        cells_height=30,
-    )
-
-    combined_fig = make_subplots(
-        rows=2, cols=1, specs=[[{"type": "heatmap"}], [{"type": "domain"}]]
-    )
-    for trace in heatmap_fig["data"]:
-        combined_fig.add_trace(trace=trace, row=1, col=1)
-    for trace in table_fig["data"]:
-        combined_fig.add_trace(trace=trace, row=2, col=1)
-    sliders = _create_sliders(len(table_fig.data), len(combined_fig.data))
-    combined_fig.update_layout(
         {
             "title": {
                 "text": "Drift details<br><br><sup>(Each cell contains the p-value for the top <= 100 features)</sup>",
@@ -411,45 +575,72 @@ def plotly_drift_magnitude_maker(
             "title_x": 0.49,
             "title_y": 0.87,
             "width": 1775,
-            "height": 1152,
+            "height": 700,
             "template": "plotly_dark",
-            "margin": {"l": 155, "r": 130, "b": 90, "t": 250},
+            "margin": {"l": 155, "r": 130, "b": 40, "t": 250},
             "xaxis": {"title": "x-label", "visible": False, "showticklabels": False},
             "yaxis": {
                 "title": "y-label",
                 "visible": False,
                 "showticklabels": False,
             },
-            "sliders": sliders,
         }
     )
 
-    html = combined_fig.to_html(include_plotlyjs=False, full_html=False)
+    html = heatmap_fig.to_html(include_plotlyjs=False, full_html=False)
+    html += _drift_details_table_html(fields, observations)
     return html
 
 
-def _create_sliders(num_pages: int, num_figs: int) -> List:
-    """Creates sliders for paginated table."""
-    steps = []
-    for index in range(num_pages):
-        step: Dict = dict(
-            method="restyle",
-            args=[
-                {"visible": [False] * num_figs},
-            ],
-            label=f"{index}",
-        )
-        step["args"][0]["visible"][0] = True  # Keep heatmap visible
-        step["args"][0]["visible"][1 + index] = True
-        steps.append(step)
-
-    sliders = [
-        dict(
-            active=0,
-            currentvalue={"prefix": "Table page: "},
-            pad={"t": 50},
-            steps=steps,
-        )
-    ]
+def _drift_details_table_html(
+    fields: List[str], observations: Dict[str, List[Any]]
+) -> str:
+    """Creates a table of every feature, paged in the browser."""
+    payload = {
+        "fields": fields,
+        "columns": {field: _json_safe(observations[field]) for field in fields},
+        "decimals": {"importance_score": 6, "p_value": 3},
+    }
+    # Escaping "<" keeps the payload from closing its script element.
+    payload_json = json.dumps(payload).replace("<", "\\u003c")
+    header_html = "".join(
+        f"<th data-field={quoteattr(field)}>{escape(field)}</th>" for field in fields
+    )
+    html = f"""
+        <div id="drift-details">
+            <style>{DRIFT_DETAILS_STYLE}</style>
+            <div class="controls">
+                <input id="drift-details-filter" type="search" placeholder="Filter by name" />
+                <select id="drift-details-status">
+                    <option value="">All statuses</option>
+                    <option value="drifted">Drifted</option>
+                    <option value="not drifted">Not drifted</option>
+                </select>
+                <select id="drift-details-page-size">
+                    <option value="10">10 per page</option>
+                    <option value="25">25 per page</option>
+                    <option value="100">100 per page</option>
+                </select>
+                <button id="drift-details-previous" type="button">Previous</button>
+                <span id="drift-details-page"></span>
+                <button id="drift-details-next" type="button">Next</button>
+            </div>
+            <table>
+                <thead><tr>{header_html}</tr></thead>
+                <tbody></tbody>
+            </table>
+            <script type="application/json" id="drift-details-data">{payload_json}</script>
+            <script type="text/javascript">{DRIFT_DETAILS_SCRIPT}</script>
+        </div>
+    """  # noqa: B950
+    return html
+
 
-    return sliders
+def _json_safe(values: List[Any]) -> List[Any]:
+    """Replaces undefined (NaN) numbers, which JSON does not have, with nulls."""
+    if not any(isinstance(value, float) and math.isnan(value) for value in values):
+        return values
+    return [
+        None if isinstance(value, float) and math.isnan(value) else value
+        for value in values
+    ]
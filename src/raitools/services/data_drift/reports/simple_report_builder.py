@@ -4,11 +4,11 @@ from typing import Any, Dict, List
 
 import bs4
 
-from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.compact_records import AnyDataDriftRecord
 from raitools.services.data_drift.reports.html_report_builder import HtmlReportBuilder
 
 
-def simple_report_builder(record: DataDriftRecord) -> str:
+def simple_report_builder(record: AnyDataDriftRecord) -> str:
     """Creates a report builder for the simple test case."""
     report_builder = HtmlReportBuilder()
     report_builder.data_summary_maker = basic_data_summary_maker
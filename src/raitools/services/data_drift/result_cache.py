@@ -0,0 +1,141 @@
+"""Content-addressed cache of per-feature statistical test results.
+
+A feature's result is keyed by a hash of its baseline and test column
+buffers together with the test's name and parameters, so a feature whose
+columns are byte-identical to a previously tested feature is not tested
+again. Entries are JSON files in a directory, evicted least recently used
+first.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Union
+
+import pyarrow as pa
+
+import raitools
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+
+ColumnType = Union[pa.Array, pa.ChunkedArray]
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class ResultCache:
+    """On-disk, least recently used cache of statistical test results."""
+
+    def __init__(self, directory: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initializes cache from any entries already in the directory."""
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry_paths = sorted(
+            self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime
+        )
+        self._keys: "OrderedDict[str, None]" = OrderedDict(
+            (path.stem, None) for path in entry_paths
+        )
+
+    def __len__(self) -> int:
+        """Gets the number of cached results."""
+        return len(self._keys)
+
+    def get(self, key: str) -> Optional[StatisticalTestResultType]:
+        """Gets the cached result for this key, if any."""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._keys:
+                self.misses += 1
+                return None
+            self._keys.move_to_end(key)
+            self.hits += 1
+
+        try:
+            result = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._keys.pop(key, None)
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+        return StatisticalTestResultType(
+            test_statistic=result["test_statistic"], p_value=result["p_value"]
+        )
+
+    def put(self, key: str, result: StatisticalTestResultType) -> None:
+        """Caches a result, evicting the least recently used if full."""
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        with os.fdopen(file_descriptor, "w") as temporary_file:
+            json.dump(
+                {
+                    "test_statistic": result["test_statistic"],
+                    "p_value": result["p_value"],
+                },
+                temporary_file,
+            )
+        os.replace(temporary_path, self._path(key))
+
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            evicted_keys = []
+            while len(self._keys) > self.max_entries:
+                evicted_key, _ = self._keys.popitem(last=False)
+                evicted_keys.append(evicted_key)
+
+        for evicted_key in evicted_keys:
+            self._path(evicted_key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Gets the path of the entry for this key."""
+        return self.directory / f"{key}.json"
+
+
+def make_cache_key(
+    baseline_data: ColumnType,
+    test_data: ColumnType,
+    test_name: str,
+    parameters: Dict[str, Any],
+) -> str:
+    """Hashes feature data, test name and test parameters into a cache key."""
+    digest = hashlib.blake2b(digest_size=32)
+    header = {
+        "raitools_version": raitools.__version__,
+        "test_name": test_name,
+        "parameters": parameters,
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    _update_digest(digest, baseline_data)
+    _update_digest(digest, test_data)
+
+    key = digest.hexdigest()
+    return key
+
+
+def _update_digest(digest: Any, data: ColumnType) -> None:
+    """Feeds a column's type, layout and buffers into a digest."""
+    chunks = data.chunks if isinstance(data, pa.ChunkedArray) else [data]
+    digest.update(f"{data.type}:{len(chunks)}".encode())
+    for chunk in chunks:
+        digest.update(f"{chunk.offset}:{len(chunk)}:{chunk.null_count}".encode())
+        if pa.types.is_dictionary(chunk.type):
+            _update_digest(digest, chunk.dictionary)
+        for buffer in chunk.buffers():
+            if buffer is None:
+                digest.update(b"-")
+            else:
+                digest.update(f"{buffer.size}".encode())
+                digest.update(buffer)
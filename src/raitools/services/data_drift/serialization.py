@@ -0,0 +1,128 @@
+"""Streaming JSON serialization of records and responses.
+
+`write_json(model, stream)` writes the same bytes as
+
+    stream.write(json.dumps(model.dict()).encode())
+
+but walks the model as it writes, rather than first copying every nested
+model into a tree of dictionaries, so memory stays flat however many
+features a record has. Small parts of the model, such as a feature's
+summary, and runs of plain values, such as a column of observations, are
+each encoded in one go by the standard library's C-accelerated encoder.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator
+
+from pydantic import BaseModel
+
+# Values holding no more items than this are copied and encoded whole, and
+# larger ones are written item by item.
+MAX_COPIED_ITEMS = 1000
+
+_ENCODER = json.JSONEncoder()
+
+
+def write_json(model: BaseModel, stream: BinaryIO) -> None:
+    """Writes a model as JSON to a binary stream."""
+    for chunk in iter_json(model):
+        stream.write(chunk.encode())
+
+
+def write_json_file(model: BaseModel, path: Path) -> None:
+    """Writes a model as a JSON file."""
+    with open(path, "wb") as stream:
+        write_json(model, stream)
+
+
+def iter_json(value: Any) -> Iterator[str]:
+    """Yields the JSON of a model, or of any value holding models, in chunks."""
+    if _is_plain(value):
+        yield _ENCODER.encode(value)
+    elif not _is_large(value):
+        yield _ENCODER.encode(_to_plain(value))
+    elif isinstance(value, BaseModel):
+        yield from _iter_mapping(value.__dict__)
+    elif isinstance(value, dict):
+        yield from _iter_mapping(value)
+    else:
+        yield from _iter_sequence(value)
+
+
+def _iter_mapping(mapping: Dict) -> Iterator[str]:
+    """Yields the JSON of a dictionary, item by item."""
+    yield "{"
+    separator = ""
+    for key, item in mapping.items():
+        yield f"{separator}{_encode_key(key)}: "
+        yield from iter_json(item)
+        separator = ", "
+    yield "}"
+
+
+def _iter_sequence(sequence: Any) -> Iterator[str]:
+    """Yields the JSON of a list or tuple, item by item."""
+    yield "["
+    separator = ""
+    for item in sequence:
+        yield separator
+        yield from iter_json(item)
+        separator = ", "
+    yield "]"
+
+
+def _encode_key(key: Any) -> str:
+    """Encodes a dictionary key, which JSON requires to be a string."""
+    if isinstance(key, str):
+        return _ENCODER.encode(key)
+    # Other keys are converted as json.dumps converts them.
+    encoded_key = _ENCODER.encode({key: None})[1 : -len(": null}")]
+    return encoded_key
+
+
+def _is_plain(value: Any) -> bool:
+    """Checks whether a value holds no models or containers, beyond itself."""
+    if isinstance(value, BaseModel):
+        return False
+    items: Iterable[Any]
+    if isinstance(value, dict):
+        items = value.values()
+    elif isinstance(value, (list, tuple)):
+        items = value
+    else:
+        return True
+    is_plain = not any(
+        isinstance(item, (BaseModel, dict, list, tuple)) for item in items
+    )
+    return is_plain
+
+
+def _is_large(value: Any) -> bool:
+    """Checks whether a value holds a container too large to copy at once."""
+    items: Iterable[Any]
+    if isinstance(value, BaseModel):
+        items = value.__dict__.values()
+    elif isinstance(value, dict):
+        if len(value) > MAX_COPIED_ITEMS:
+            return True
+        items = value.values()
+    elif isinstance(value, (list, tuple)):
+        if len(value) > MAX_COPIED_ITEMS:
+            return True
+        items = value
+    else:
+        return False
+    is_large = any(_is_large(item) for item in items)
+    return is_large
+
+
+def _to_plain(value: Any) -> Any:
+    """Copies a value with its models as dictionaries, as `.dict()` does."""
+    if isinstance(value, BaseModel):
+        return {key: _to_plain(item) for key, item in value.__dict__.items()}
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
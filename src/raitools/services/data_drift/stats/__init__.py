@@ -14,10 +14,12 @@ statistical_tests: Dict[str, StatisticalTestType] = {
         "name": "kolmogorov-smirnov",
         "kind": "numerical",
         "method": kolmogorov_smirnov,
+        "thread_safe": True,
     },
     "categorical": {
         "name": "chi-squared",
         "kind": "categorical",
         "method": chi_squared,
+        "thread_safe": True,
     },
 }
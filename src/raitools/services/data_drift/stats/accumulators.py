@@ -0,0 +1,143 @@
+"""Running accumulators for data drift statistical tests.
+
+An accumulator is built once from a feature's baseline data and then folds
+in test observations batch by batch. Each update costs time proportional to
+the batch, and computing a result costs time proportional to the size of
+the baseline summary, no matter how many test observations have been seen.
+"""
+
+import copy
+from typing import Any, Dict, Type, TypeVar, Union
+
+import numpy as np
+import pyarrow as pa
+
+from raitools import stats
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.stats.profiles import (
+    CategoricalProfile,
+    NumericalProfile,
+    count_categories,
+    to_numpy,
+)
+
+ArrayType = Union[pa.Array, pa.ChunkedArray]
+AccumulatorType = TypeVar("AccumulatorType", bound="Accumulator")
+
+
+class Accumulator:
+    """Accumulates test observations for one feature."""
+
+    def __init__(self, baseline_data: ArrayType) -> None:
+        """Initializes from the feature's baseline data."""
+        self.num_test_observations = 0
+
+    def update(self, test_data: ArrayType) -> None:
+        """Folds a batch of test observations into the accumulator."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forgets all test observations, keeping the baseline summary."""
+        self.num_test_observations = 0
+
+    def spawn(self: AccumulatorType) -> AccumulatorType:
+        """Creates an accumulator without test observations.
+
+        The new accumulator shares this one's (read-only) baseline summary, so
+        several test datasets can be compared against one baseline, including
+        concurrently, without summarizing the baseline again.
+        """
+        accumulator = copy.copy(self)
+        accumulator.reset()
+        return accumulator
+
+    def result(self) -> StatisticalTestResultType:
+        """Computes the test result for all observations seen so far."""
+        raise NotImplementedError
+
+
+class NumericalAccumulator(Accumulator):
+    """Accumulates test observations for the Kolmogorov-Smirnov test.
+
+    The baseline is reduced to its sorted distinct values and their
+    cumulative counts. Test observations are binned against those values.
+    """
+
+    def __init__(self, baseline_data: ArrayType) -> None:
+        """Initializes from the feature's baseline data."""
+        super().__init__(baseline_data)
+        baseline_profile = NumericalProfile(baseline_data)
+        self.values = baseline_profile.values
+        self.baseline_cumulative_counts = baseline_profile.cumulative_counts
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets all test observations, keeping the baseline summary."""
+        super().reset()
+        self.test_counts_at = np.zeros(len(self.values), dtype=np.int64)
+        self.test_counts_below = np.zeros(len(self.values) + 1, dtype=np.int64)
+
+    def update(self, test_data: ArrayType) -> None:
+        """Folds a batch of test observations into the accumulator."""
+        test_values = to_numpy(test_data)
+        left = np.searchsorted(self.values, test_values, side="left")
+        right = np.searchsorted(self.values, test_values, side="right")
+        is_at_value = right > left
+        self.test_counts_at += np.bincount(
+            left[is_at_value], minlength=len(self.test_counts_at)
+        )
+        self.test_counts_below += np.bincount(
+            left[~is_at_value], minlength=len(self.test_counts_below)
+        )
+        self.num_test_observations += len(test_values)
+
+    def result(self) -> StatisticalTestResultType:
+        """Computes the test result for all observations seen so far."""
+        test_statistic, p_value = stats.kolmogorov_smirnov_from_counts(
+            self.baseline_cumulative_counts,
+            self.test_counts_at,
+            self.test_counts_below,
+        )
+
+        return StatisticalTestResultType(
+            test_statistic=test_statistic,
+            p_value=p_value,
+        )
+
+
+class CategoricalAccumulator(Accumulator):
+    """Accumulates per-category counts for the Chi-Squared test."""
+
+    def __init__(self, baseline_data: ArrayType) -> None:
+        """Initializes from the feature's baseline data."""
+        super().__init__(baseline_data)
+        self.baseline_counts = CategoricalProfile(baseline_data).counts
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets all test observations, keeping the baseline summary."""
+        super().reset()
+        self.test_counts: Dict[Any, int] = {}
+
+    def update(self, test_data: ArrayType) -> None:
+        """Folds a batch of test observations into the accumulator."""
+        for category, count in count_categories(test_data).items():
+            self.test_counts[category] = self.test_counts.get(category, 0) + count
+        self.num_test_observations += len(test_data)
+
+    def result(self) -> StatisticalTestResultType:
+        """Computes the test result for all observations seen so far."""
+        test_statistic, p_value = stats.chi_squared_from_counts(
+            self.baseline_counts, self.test_counts
+        )
+
+        return StatisticalTestResultType(
+            test_statistic=test_statistic,
+            p_value=p_value,
+        )
+
+
+accumulators: Dict[str, Type[Accumulator]] = {
+    "numerical": NumericalAccumulator,
+    "categorical": CategoricalAccumulator,
+}
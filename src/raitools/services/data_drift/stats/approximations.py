@@ -0,0 +1,120 @@
+"""Approximate statistical tests for features too costly to test exactly.
+
+Each approximation trades precision for a bounded cost: numerical features
+are tested on a uniform random subsample, and categorical features are
+tested on a uniform random subsample's most frequent categories, with all
+other categories binned together.
+"""
+
+from typing import Any, Callable, Dict, Set, TypedDict
+
+import numpy as np
+import pyarrow as pa
+
+from raitools import stats
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.stats.profiles import (
+    ArrayType,
+    NumericalProfile,
+    count_categories,
+)
+
+# Subsamples never have fewer rows than this, however tight the budget.
+MIN_SAMPLE_ROWS = 1000
+
+# Binned categorical tests keep this many of the most frequent categories.
+MAX_CATEGORIES = 100
+
+# Subsamples are drawn reproducibly.
+SAMPLE_SEED = 0
+
+# Stands in for all binned categories, and so never collides with a real one.
+OTHER_CATEGORY = object()
+
+
+class ApproximationType(TypedDict):
+    """Approximate statistical test."""
+
+    name: str
+    kind: str
+    method: Callable[[ArrayType, ArrayType, int], StatisticalTestResultType]
+
+
+def subsampled_kolmogorov_smirnov(
+    baseline_data: ArrayType, test_data: ArrayType, max_rows: int
+) -> StatisticalTestResultType:
+    """Applies Kolmogorov-Smirnov test to at most `max_rows` rows of each dataset."""
+    num_rows = max(max_rows, MIN_SAMPLE_ROWS)
+    baseline_profile = NumericalProfile(_subsample(baseline_data, num_rows))
+    test_profile = NumericalProfile(_subsample(test_data, num_rows))
+    result = baseline_profile.compare(test_profile)
+    return result
+
+
+def binned_chi_squared(
+    baseline_data: ArrayType, test_data: ArrayType, max_rows: int
+) -> StatisticalTestResultType:
+    """Applies Chi-Squared test to the most frequent categories.
+
+    Categories are counted in at most `max_rows` rows of each dataset.
+    Categories outside the `MAX_CATEGORIES` most frequent across both
+    datasets are counted together, in each dataset, as one "other" category.
+    """
+    num_rows = max(max_rows, MIN_SAMPLE_ROWS)
+    baseline_counts = count_categories(_subsample(baseline_data, num_rows))
+    test_counts = count_categories(_subsample(test_data, num_rows))
+
+    total_counts = dict(baseline_counts)
+    for category, count in test_counts.items():
+        total_counts[category] = total_counts.get(category, 0) + count
+    kept_categories = set(
+        sorted(total_counts, key=total_counts.__getitem__, reverse=True)[
+            :MAX_CATEGORIES
+        ]
+    )
+    test_statistic, p_value = stats.chi_squared_from_counts(
+        _bin_counts(baseline_counts, kept_categories),
+        _bin_counts(test_counts, kept_categories),
+    )
+
+    return StatisticalTestResultType(test_statistic=test_statistic, p_value=p_value)
+
+
+approximations: Dict[str, ApproximationType] = {
+    "numerical": {
+        "name": "subsample",
+        "kind": "numerical",
+        "method": subsampled_kolmogorov_smirnov,
+    },
+    "categorical": {
+        "name": "binned",
+        "kind": "categorical",
+        "method": binned_chi_squared,
+    },
+}
+
+
+def _subsample(data: ArrayType, num_rows: int) -> ArrayType:
+    """Draws a uniform random sample of rows without replacement."""
+    if len(data) <= num_rows:
+        return data
+
+    generator = np.random.default_rng(SAMPLE_SEED)
+    indices = np.sort(generator.choice(len(data), size=num_rows, replace=False))
+    sample = data.take(pa.array(indices))
+    return sample
+
+
+def _bin_counts(counts: Dict[Any, int], kept_categories: Set[Any]) -> Dict[Any, int]:
+    """Collapses counts of all but the kept categories into one category."""
+    binned_counts = {
+        category: count
+        for category, count in counts.items()
+        if category in kept_categories
+    }
+    other_count = sum(
+        count for category, count in counts.items() if category not in kept_categories
+    )
+    if other_count > 0:
+        binned_counts[OTHER_CATEGORY] = other_count
+    return binned_counts
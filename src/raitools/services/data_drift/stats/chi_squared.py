@@ -6,13 +6,16 @@ implementation and the general interface that the data drift service will
 work with.
 """
 
-from typing import List
-
 from raitools import stats
-from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.stats.common import (
+    SampleType,
+    StatisticalTestResultType,
+)
 
 
-def chi_squared(baseline_data: List, test_data: List) -> StatisticalTestResultType:
+def chi_squared(
+    baseline_data: SampleType, test_data: SampleType
+) -> StatisticalTestResultType:
     """Applies Chi-Squared test."""
     test_statistic, p_value = stats.chi_squared(baseline_data, test_data)
 
@@ -0,0 +1,28 @@
+"""Common types for data drift statistical tests."""
+
+from typing import Callable, List, TypedDict, Union
+
+import numpy as np
+
+# A feature's values in one dataset, as a list or a NumPy array.
+SampleType = Union[List, np.ndarray]
+
+
+class StatisticalTestResultType(TypedDict):
+    """Statistical test result."""
+
+    test_statistic: float
+    p_value: float
+
+
+class StatisticalTestType(TypedDict):
+    """Statistical test.
+
+    Tests that are safe to call concurrently from several threads set
+    `thread_safe`; anything else is run serially by the drift engine.
+    """
+
+    name: str
+    kind: str
+    method: Callable[[SampleType, SampleType], StatisticalTestResultType]
+    thread_safe: bool
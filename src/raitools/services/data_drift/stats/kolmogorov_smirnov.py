@@ -1,13 +1,14 @@
 """Kilmogorov-Smirnov statistical test."""
 
-from typing import List
-
 from raitools import stats
-from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.stats.common import (
+    SampleType,
+    StatisticalTestResultType,
+)
 
 
 def kolmogorov_smirnov(
-    baseline_data: List, test_data: List
+    baseline_data: SampleType, test_data: SampleType
 ) -> StatisticalTestResultType:
     """Applies Kilmogorov-Smirnov test."""
     test_statistic, p_value = stats.kolmogorov_smirnov(baseline_data, test_data)
@@ -0,0 +1,103 @@
+"""Distribution profiles for data drift statistical tests.
+
+A profile summarizes one feature of one dataset (sorted distinct values and
+their cumulative counts, or per-category counts) so that it can be compared
+against many other profiles without going back to the data.
+"""
+
+from typing import Any, Dict, Type, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools import stats
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+
+ArrayType = Union[pa.Array, pa.ChunkedArray]
+
+
+class Profile:
+    """A summary of a feature's data."""
+
+    def __init__(self, data: ArrayType) -> None:
+        """Summarizes the feature's data."""
+        self.num_observations = len(data)
+
+    def compare(self, other: "Profile") -> StatisticalTestResultType:
+        """Tests this (baseline) profile against another (test) profile."""
+        raise NotImplementedError
+
+
+class NumericalProfile(Profile):
+    """Sorted distinct values and cumulative counts of numerical data."""
+
+    def __init__(self, data: ArrayType) -> None:
+        """Summarizes the feature's data."""
+        super().__init__(data)
+        self.values, counts = np.unique(to_numpy(data), return_counts=True)
+        self.cumulative_counts = np.cumsum(counts)
+
+    def compare(self, other: Profile) -> StatisticalTestResultType:
+        """Applies Kolmogorov-Smirnov test against another profile."""
+        if not isinstance(other, NumericalProfile):
+            raise BadDataFileError(
+                f"{type(other).__name__} cannot be compared with a NumericalProfile."
+            )
+        test_statistic, p_value = stats.kolmogorov_smirnov_from_distributions(
+            self.values,
+            self.cumulative_counts,
+            other.values,
+            other.cumulative_counts,
+        )
+
+        return StatisticalTestResultType(
+            test_statistic=test_statistic,
+            p_value=p_value,
+        )
+
+
+class CategoricalProfile(Profile):
+    """Per-category counts of categorical data."""
+
+    def __init__(self, data: ArrayType) -> None:
+        """Summarizes the feature's data."""
+        super().__init__(data)
+        self.counts = count_categories(data)
+
+    def compare(self, other: Profile) -> StatisticalTestResultType:
+        """Applies Chi-Squared test against another profile."""
+        if not isinstance(other, CategoricalProfile):
+            raise BadDataFileError(
+                f"{type(other).__name__} cannot be compared with a CategoricalProfile."
+            )
+        test_statistic, p_value = stats.chi_squared_from_counts(
+            self.counts, other.counts
+        )
+
+        return StatisticalTestResultType(
+            test_statistic=test_statistic,
+            p_value=p_value,
+        )
+
+
+profiles: Dict[str, Type[Profile]] = {
+    "numerical": NumericalProfile,
+    "categorical": CategoricalProfile,
+}
+
+
+def to_numpy(data: ArrayType) -> np.ndarray:
+    """Converts numeric Arrow data to a float64 NumPy array."""
+    values = np.asarray(data.to_numpy(), dtype=np.float64)
+    return values
+
+
+def count_categories(data: ArrayType) -> Dict[Any, int]:
+    """Counts occurrences of each category."""
+    value_counts = pc.value_counts(data)
+    values = value_counts.field("values").to_pylist()
+    value_counts_list = value_counts.field("counts").to_pylist()
+    counts = {value: value_counts_list[index] for index, value in enumerate(values)}
+    return counts
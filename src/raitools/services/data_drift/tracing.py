@@ -0,0 +1,181 @@
+"""Tracing hooks for Data Drift.
+
+Every pipeline stage runs inside a span. Spans are only created while at
+least one observer is registered; otherwise `span` returns a shared no-op
+span. Call sites run once per feature check `is_tracing` first, so that
+they do not even build their spans' attributes when nothing observes them.
+
+    exporter = NdjsonSpanExporter(Path("spans.ndjson"))
+    add_observer(exporter)
+    try:
+        bundle = create_bundle_from_zip(bundle_path)
+        record = create_record_from_bundle(bundle, bundle_path.name)
+    finally:
+        remove_observer(exporter)
+        exporter.close()
+"""
+
+from contextvars import ContextVar
+from itertools import count
+import json
+from pathlib import Path
+import threading
+import time
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+AttributeValue = Any
+
+
+class Span:
+    """A timed pipeline stage with structured attributes."""
+
+    def __init__(
+        self,
+        name: str,
+        attributes: Dict[str, AttributeValue],
+        parent_id: Optional[int],
+    ) -> None:
+        """Initializes span."""
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.start_time = 0.0
+        self.end_time = 0.0
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Wall time in seconds between the span's start and end."""
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Sets an attribute, e.g., one only known once the stage is done."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Gets span as a JSON-serializable dictionary."""
+        span_dict = {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+        return span_dict
+
+    def __enter__(self) -> "Span":
+        """Starts span and notifies observers."""
+        self._token = _current_span.set(self)
+        self.start_time = time.time()
+        for observer in _observers:
+            observer.on_start(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Ends span and notifies observers."""
+        self.end_time = time.time()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        _current_span.reset(self._token)
+        for observer in _observers:
+            observer.on_end(self)
+
+
+class NoOpSpan:
+    """A span that records nothing, used when there are no observers."""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """Ignores attribute."""
+
+    def __enter__(self) -> "NoOpSpan":
+        """Does nothing."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Does nothing."""
+
+
+class SpanObserver:
+    """Receives spans as they start and end.
+
+    Observers may be called from several threads at once.
+    """
+
+    def on_start(self, span: Span) -> None:
+        """Called when a span starts."""
+
+    def on_end(self, span: Span) -> None:
+        """Called when a span ends."""
+
+
+class NdjsonSpanExporter(SpanObserver):
+    """Writes finished spans to a file as newline-delimited JSON."""
+
+    def __init__(self, path: Path) -> None:
+        """Initializes exporter, appending to the file at this path."""
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        """Writes span as one line of JSON."""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        """Flushes and closes the file."""
+        with self._lock:
+            self._file.close()
+
+
+NO_OP_SPAN = NoOpSpan()
+
+_span_ids = count(1)
+_current_span: ContextVar[Optional[Span]] = ContextVar("data_drift_span", default=None)
+_observers: Tuple[SpanObserver, ...] = ()
+_observers_lock = threading.Lock()
+
+
+def add_observer(observer: SpanObserver) -> None:
+    """Registers an observer for all spans."""
+    global _observers
+    with _observers_lock:
+        _observers = _observers + (observer,)
+
+
+def remove_observer(observer: SpanObserver) -> None:
+    """Unregisters an observer."""
+    global _observers
+    with _observers_lock:
+        _observers = tuple(other for other in _observers if other is not observer)
+
+
+def is_tracing() -> bool:
+    """Checks whether any observer is registered, so spans are recorded."""
+    return bool(_observers)
+
+
+def span(name: str, **attributes: AttributeValue) -> Union[Span, NoOpSpan]:
+    """Gets a span for a pipeline stage, to be used as a context manager."""
+    if not _observers:
+        return NO_OP_SPAN
+
+    parent = _current_span.get()
+    new_span = Span(name, attributes, None if parent is None else parent.span_id)
+    return new_span
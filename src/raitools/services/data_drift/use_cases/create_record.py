@@ -1,30 +1,83 @@
 """Process data drift bundle."""
 
-from collections import defaultdict
-from operator import attrgetter
-from typing import Any, Dict, List, Optional
-
-
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Type, TypeVar
+from uuid import uuid4
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+
+from raitools.exceptions import BadFeatureMappingError
 from raitools.services.data_drift.bundles import Bundle
+from raitools.services.data_drift.data.bundle import FeatureMapping
+from raitools.services.data_drift.data.common import FileName, Name
 from raitools.services.data_drift.data.data_drift_record import (
     BundleData,
     BundleManifest,
     DataDriftRecord,
+    DriftStatus,
     DriftSummaryFeature,
+    FeatureKind,
     FeatureStatisticalTest,
+    NonNegativeCount,
+    PositiveCount,
     RecordBundle,
     RecordDataSummary,
     RecordDriftDetails,
     RecordDriftSummary,
     RecordResults,
+    RecordSegment,
+    RecordSegments,
     ResultMetadata,
+    ResultWindow,
+    StatisticalTestOutcome,
     StatisticalTestResult,
 )
+from raitools.services.data_drift.data.job_config import DataDriftJobConfig
+from raitools.services.data_drift.diagnostics import get_active_diagnostics, measure
+from raitools.services.data_drift.result_cache import ResultCache
+from raitools.services.data_drift.tracing import span
 from raitools.services.data_drift.use_cases.get_drift_results import (
+    RESULTS_SCHEMA,
     DriftResultsType,
     FeatureType,
     get_drift_results,
+    to_results_table,
 )
+from raitools.services.data_drift.use_cases.get_segmented_drift_results import (
+    SegmentedDriftResults,
+    get_segmented_drift_results,
+)
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+# Drift results with each feature's kind, importance score and rank.
+RANKED_RESULTS_SCHEMA = (
+    RESULTS_SCHEMA.append(pa.field("kind", pa.string()))
+    .append(pa.field("importance_score", pa.float64()))
+    .append(pa.field("rank", pa.int64()))
+)
+
+_validate_records: ContextVar[bool] = ContextVar("validate_records", default=False)
+
+
+@contextmanager
+def validate_records() -> Iterator[None]:
+    """Fully validates records compiled within this context.
+
+    Records are otherwise assembled from values raitools itself produced
+    without validating them again, which would take most of the time to
+    compile records with many features. This is for debugging those values.
+    """
+    token = _validate_records.set(True)
+    try:
+        yield
+    finally:
+        _validate_records.reset(token)
 
 
 def create_record_from_bundle(
@@ -32,8 +85,16 @@ def create_record_from_bundle(
     bundle_filename: str,
     timestamp: Optional[str] = None,
     uuid: Optional[str] = None,
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+    feature_budget: Optional[float] = None,
+    job_budget: Optional[float] = None,
+    cache: Optional[ResultCache] = None,
 ) -> DataDriftRecord:
-    """Processes a data drift bundle."""
+    """Processes a data drift bundle.
+
+    See `get_drift_results` for execution modes, budgets and caching.
+    """
     feature_mapping = {
         name: FeatureType(name=details.name, kind=details.kind)
         for name, details in bundle.feature_mapping.feature_mapping.items()
@@ -43,47 +104,195 @@ def create_record_from_bundle(
         baseline_data=bundle.baseline_data,
         test_data=bundle.test_data,
         feature_mapping=feature_mapping,
+        execution_mode=execution_mode,
+        max_workers=max_workers,
+        feature_budget=feature_budget,
+        job_budget=job_budget,
+        cache=cache,
     )
 
-    record_bundle = _compile_bundle_for_record(bundle, bundle_filename)
-    results = _compile_drift_results_for_record(
-        drift_results,
-        bundle.feature_mapping.feature_mapping,
-        bundle.job_config.report_name,
-        timestamp,
-        uuid,
-    )
+    segments = None
+    if bundle.job_config.slice_columns is not None:
+        with measure("get_segmented_drift_results"):
+            segmented_drift_results = get_segmented_drift_results(
+                baseline_data=bundle.baseline_data,
+                test_data=bundle.test_data,
+                feature_mapping=feature_mapping,
+                slice_columns=bundle.job_config.slice_columns,
+                min_segment_rows=bundle.job_config.min_segment_rows,
+                execution_mode=execution_mode,
+                max_workers=max_workers,
+            )
+        segments = _compile_segments_for_record(
+            segmented_drift_results,
+            bundle.feature_mapping.feature_mapping,
+            bundle.job_config.slice_columns,
+            bundle.job_config.min_segment_rows,
+        )
 
-    record = DataDriftRecord(
-        bundle=record_bundle,
-        results=results,
+    with measure("compile_record"):
+        record = create_record_from_drift_results(
+            bundle=bundle,
+            bundle_filename=bundle_filename,
+            drift_results=drift_results,
+            timestamp=timestamp,
+            uuid=uuid,
+            segments=segments,
+        )
+
+    diagnostics = get_active_diagnostics()
+    if diagnostics is not None:
+        record.diagnostics = diagnostics.to_record_diagnostics()
+
+    return record
+
+
+def create_record_from_drift_results(
+    bundle: Bundle,
+    bundle_filename: str,
+    drift_results: DriftResultsType,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+    test_data: Optional[BundleData] = None,
+    window: Optional[ResultWindow] = None,
+    segments: Optional[RecordSegments] = None,
+    top_k: Optional[int] = None,
+) -> DataDriftRecord:
+    """Compiles a data drift record from already computed drift results.
+
+    By default, the record describes the bundle's test data. Results computed
+    over other test data (e.g., a window of it) pass a summary of that data.
+    Results for only the `top_k` most important features pass that count.
+    """
+    if test_data is None:
+        test_data = BundleData(
+            filename=bundle.job_config.test_data_filename,
+            num_rows=bundle.test_data.num_rows,
+            num_columns=bundle.test_data.num_columns,
+        )
+
+    record = create_record_from_summaries(
+        job_config=bundle.job_config,
+        job_config_filename=bundle.job_config_filename,
+        feature_mapping=bundle.feature_mapping,
+        bundle_filename=bundle_filename,
+        baseline_data=BundleData(
+            filename=bundle.job_config.baseline_data_filename,
+            num_rows=bundle.baseline_data.num_rows,
+            num_columns=bundle.baseline_data.num_columns,
+        ),
+        test_data=test_data,
+        drift_results=drift_results,
+        timestamp=timestamp,
+        uuid=uuid,
+        window=window,
+        segments=segments,
+        top_k=top_k,
     )
 
     return record
 
 
-def _compile_bundle_for_record(bundle: Bundle, bundle_filename: str) -> RecordBundle:
+def create_record_from_summaries(
+    job_config: DataDriftJobConfig,
+    job_config_filename: str,
+    feature_mapping: FeatureMapping,
+    bundle_filename: str,
+    baseline_data: BundleData,
+    test_data: BundleData,
+    drift_results: DriftResultsType,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+    window: Optional[ResultWindow] = None,
+    segments: Optional[RecordSegments] = None,
+    top_k: Optional[int] = None,
+) -> DataDriftRecord:
+    """Compiles a data drift record from summaries of a bundle's contents.
+
+    This is for drift results computed without the bundle's data in hand,
+    such as from partial aggregates computed where the data lives.
+    """
+    with span(
+        "compile_record",
+        report_name=job_config.report_name,
+        features=len(drift_results),
+    ):
+        record_bundle = _compile_bundle_for_record(
+            job_config, job_config_filename, bundle_filename, baseline_data, test_data
+        )
+        results = _compile_drift_results_for_record(
+            drift_results,
+            feature_mapping.feature_mapping,
+            job_config.report_name,
+            timestamp,
+            uuid,
+            window,
+            segments,
+            top_k,
+        )
+
+        record = DataDriftRecord(
+            bundle=record_bundle,
+            results=results,
+        )
+
+    return record
+
+
+def compile_features_for_drift_summary(
+    ranked_results: pa.Table,
+) -> Dict[str, DriftSummaryFeature]:
+    """Calculates drift statistics for all features.
+
+    Ranked results have the columns of `RANKED_RESULTS_SCHEMA`.
+    """
+    results: Dict[str, DriftSummaryFeature] = {}
+    for row in ranked_results.to_pylist():
+        name = row["name"]
+        results[name] = _make(
+            DriftSummaryFeature,
+            name=name,
+            kind=FeatureKind(row["kind"]),
+            rank=row["rank"],
+            importance_score=row["importance_score"],
+            statistical_test=_make(
+                FeatureStatisticalTest,
+                name=row["test_name"],
+                result=_make(
+                    StatisticalTestResult,
+                    test_statistic=row["test_statistic"],
+                    p_value=row["p_value"],
+                ),
+                significance_level=row["significance_level"],
+                outcome=StatisticalTestOutcome(row["outcome"]),
+                approximation=row["approximation"],
+            ),
+            drift_status=DriftStatus(row["drift_status"]),
+        )
+
+    return results
+
+
+def _compile_bundle_for_record(
+    job_config: DataDriftJobConfig,
+    job_config_filename: str,
+    bundle_filename: str,
+    baseline_data: BundleData,
+    test_data: BundleData,
+) -> RecordBundle:
     """Creates record bundle."""
     record_bundle = RecordBundle(
-        job_config=bundle.job_config,
+        job_config=job_config,
         data={
-            "baseline_data": BundleData(
-                filename=bundle.job_config.baseline_data_filename,
-                num_rows=bundle.baseline_data.num_rows,
-                num_columns=bundle.baseline_data.num_columns,
-            ),
-            "test_data": BundleData(
-                filename=bundle.job_config.test_data_filename,
-                num_rows=bundle.test_data.num_rows,
-                num_columns=bundle.test_data.num_columns,
-            ),
+            "baseline_data": baseline_data,
+            "test_data": test_data,
         },
         manifest=BundleManifest(
-            bundle_filename=bundle_filename,
-            job_config_filename=bundle.job_config_filename,
-            feature_mapping_filename=bundle.feature_mapping_filename,
-            baseline_data_filename=bundle.baseline_data_filename,
-            test_data_filename=bundle.test_data_filename,
+            bundle_filename=FileName(bundle_filename),
+            job_config_filename=FileName(job_config_filename),
+            feature_mapping_filename=FileName(job_config.feature_mapping_filename),
+            baseline_data_filename=FileName(job_config.baseline_data_filename),
+            test_data_filename=FileName(job_config.test_data_filename),
         ),
     )
     return record_bundle
@@ -95,133 +304,193 @@ def _compile_drift_results_for_record(
     report_name: str,
     timestamp: Optional[str] = None,
     uuid: Optional[str] = None,
+    window: Optional[ResultWindow] = None,
+    segments: Optional[RecordSegments] = None,
+    top_k: Optional[int] = None,
 ) -> RecordResults:
-    """Creates drift summary for record."""
-    features = feature_mapping
+    """Creates drift summary for record.
 
-    drift_summary_features = _compile_features_for_drift_summary(
-        drift_results, feature_mapping
-    )
+    Results are laid out as columns once, and everything summarizing them is
+    computed over whole columns. A missing timestamp defaults to now, in UTC,
+    and a missing UUID to a random one.
+    """
+    features = _features_table(feature_mapping)
+    ranked_results = _rank_results(to_results_table(drift_results), features)
 
-    thresholds = _thresholds_map(drift_summary_features)
+    drift_summary_features = compile_features_for_drift_summary(ranked_results)
+
+    thresholds = _thresholds_map(ranked_results)
 
     num_numerical_features = _compute_num_feature_kind(features, "numerical")
     num_categorical_features = _compute_num_feature_kind(features, "categorical")
 
-    features_list = list(drift_summary_features.values())
-    num_total_features = len(features_list)
-    num_features_drifted = len(_drifted_feature_list(features_list))
-    top_10_features_drifted = len(_top_10_drifted_features_list(features_list))
-    top_20_features_drifted = len(_top_20_drifted_features_list(features_list))
+    drift_summary = _compile_drift_summary(ranked_results)
 
     fields = _fields()
-    observations = _observations(features_list)
+    observations = _observations(ranked_results)
 
-    results = RecordResults(
+    results = _make(
+        RecordResults,
         metadata=ResultMetadata(
             report_name=report_name,
-            timestamp=timestamp,
-            uuid=uuid,
+            timestamp=(
+                datetime.now(timezone.utc).isoformat()
+                if timestamp is None
+                else timestamp
+            ),
+            uuid=str(uuid4()) if uuid is None else uuid,
             thresholds=thresholds,
+            window=window,
+            top_k=None if top_k is None else PositiveCount(top_k),
         ),
         data_summary=RecordDataSummary(
             num_numerical_features=num_numerical_features,
             num_categorical_features=num_categorical_features,
         ),
-        drift_summary=RecordDriftSummary(
-            num_total_features=num_total_features,
-            num_features_drifted=num_features_drifted,
-            top_10_features_drifted=top_10_features_drifted,
-            top_20_features_drifted=top_20_features_drifted,
-        ),
+        drift_summary=drift_summary,
         drift_details=RecordDriftDetails(
             fields=fields,
             observations=observations,
         ),
         features=drift_summary_features,
+        segments=segments,
     )
 
     return results
 
 
-def _compile_features_for_drift_summary(
-    drift_results: DriftResultsType, feature_mapping: Dict
-) -> Dict[str, DriftSummaryFeature]:
-    """Calculates drift statistics for all features."""
-    ranking = {
-        x.name: rank
-        for x, rank in zip(
-            sorted(
-                [value for value in feature_mapping.values()],
-                key=attrgetter("importance_score"),
-                reverse=True,
-            ),
-            range(1, len(feature_mapping.values()) + 1),
+def _compile_drift_summary(ranked_results: pa.Table) -> RecordDriftSummary:
+    """Creates drift summary counts for features."""
+    drift_summary = RecordDriftSummary(
+        num_total_features=ranked_results.num_rows,
+        num_features_drifted=_count(_drifted_features(ranked_results)),
+        top_10_features_drifted=_count(_top_n_drifted_features(ranked_results, 10)),
+        top_20_features_drifted=_count(_top_n_drifted_features(ranked_results, 20)),
+    )
+    return drift_summary
+
+
+def _compile_segments_for_record(
+    segmented_drift_results: SegmentedDriftResults,
+    feature_mapping: Dict,
+    slice_columns: List[str],
+    min_segment_rows: int,
+) -> RecordSegments:
+    """Creates segmented results for record."""
+    features = _features_table(feature_mapping)
+
+    segments = []
+    for segment_results in segmented_drift_results.segment_results:
+        ranked_results = _rank_results(
+            to_results_table(segment_results.drift_results), features
+        )
+        segments.append(
+            _make(
+                RecordSegment,
+                key=segment_results.segment.key,
+                num_baseline_rows=segment_results.segment.baseline_data.num_rows,
+                num_test_rows=segment_results.segment.test_data.num_rows,
+                drift_summary=_compile_drift_summary(ranked_results),
+                features=compile_features_for_drift_summary(ranked_results),
+            )
         )
-    }
 
-    results: Dict[str, DriftSummaryFeature] = {}
-    for feature_name, feature_results in drift_results.items():
-        kind = feature_mapping[feature_name].kind
-        importance_score = feature_mapping[feature_name].importance_score
-        results[feature_name] = DriftSummaryFeature(
-            name=feature_name,
-            kind=kind,
-            rank=ranking[feature_name],
-            importance_score=importance_score,
-            statistical_test=FeatureStatisticalTest(
-                name=feature_results["test_name"],
-                result=StatisticalTestResult(
-                    test_statistic=feature_results["drift_result"]["statistical_test"][
-                        "test_statistic"
-                    ],
-                    p_value=feature_results["drift_result"]["statistical_test"][
-                        "p_value"
-                    ],
-                ),
-                significance_level=feature_results["drift_result"]["statistical_test"][
-                    "significance_level"
-                ],
-                outcome=feature_results["drift_result"]["statistical_test"]["outcome"],
-            ),
-            drift_status=feature_results["drift_result"]["drift_status"],
+    record_segments = RecordSegments(
+        slice_columns=slice_columns,
+        min_segment_rows=PositiveCount(min_segment_rows),
+        num_skipped_segments=NonNegativeCount(
+            segmented_drift_results.num_skipped_segments
+        ),
+        segments=segments,
+    )
+    return record_segments
+
+
+def _features_table(feature_mapping: Dict) -> pa.Table:
+    """Lays out features with their rank by importance score, highest first.
+
+    Features with equal scores are ranked in the order of the mapping.
+    """
+    names = []
+    kinds = []
+    importance_scores = []
+    for feature in feature_mapping.values():
+        names.append(feature.name)
+        kinds.append(feature.kind)
+        importance_scores.append(feature.importance_score)
+
+    scores = np.asarray(importance_scores, dtype=np.float64)
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[np.argsort(-scores, kind="stable")] = np.arange(1, len(scores) + 1)
+
+    features = pa.table(
+        {
+            "name": _validate_feature_names(pa.array(names, pa.string())),
+            "kind": pa.array(kinds, pa.string()),
+            "importance_score": pa.array(scores),
+            "rank": pa.array(ranks),
+        }
+    )
+    return features
+
+
+def _validate_feature_names(names: pa.Array) -> pa.Array:
+    """Checks that feature names are valid names, as records require."""
+    is_valid = pc.and_(
+        pc.match_substring_regex(names, Name.regex.pattern),
+        pc.less_equal(pc.utf8_length(names), Name.max_length),
+    )
+    if not pc.all(is_valid).as_py():
+        name = names.filter(pc.invert(is_valid))[0].as_py()
+        raise BadFeatureMappingError(f"Feature name {name!r} is not valid.")
+
+    return names
+
+
+def _rank_results(results: pa.Table, features: pa.Table) -> pa.Table:
+    """Adds each feature's kind, importance score and rank to its results."""
+    result_features = features.take(
+        pc.index_in(results.column("name"), value_set=features.column("name"))
+    )
+
+    ranked_results = results
+    for column in ["kind", "importance_score", "rank"]:
+        ranked_results = ranked_results.append_column(
+            column, result_features.column(column)
         )
+    return ranked_results
 
-    return results
 
+def _make(model: Type[ModelType], **values: Any) -> ModelType:
+    """Makes a record model, validating its values only if asked to."""
+    if _validate_records.get():
+        return model(**values)
 
-def _compute_num_feature_kind(feature_mapping: Dict, kind: str) -> int:
+    return model.construct(**values)
+
+
+def _compute_num_feature_kind(features: pa.Table, kind: str) -> int:
     """Counts number of features of a specific kind."""
-    return len(
-        [feature for feature in feature_mapping.values() if feature.kind == kind]
-    )
+    return _count(pc.equal(features.column("kind"), kind))
 
 
-def _drifted_feature_list(
-    features: List[DriftSummaryFeature],
-) -> List[DriftSummaryFeature]:
-    drifted_features = [
-        feature for feature in features if feature.drift_status == "drifted"
-    ]
-    return drifted_features
+def _count(mask: pa.ChunkedArray) -> int:
+    """Counts true values in a mask."""
+    count = pc.sum(mask).as_py() or 0
+    return count
 
 
-def _top_10_drifted_features_list(
-    features: List[DriftSummaryFeature],
-) -> List[DriftSummaryFeature]:
-    top_10_drifted_features = [
-        feature for feature in _drifted_feature_list(features) if feature.rank <= 10
-    ]
-    return top_10_drifted_features
+def _drifted_features(ranked_results: pa.Table) -> pa.ChunkedArray:
+    drifted_features = pc.equal(ranked_results.column("drift_status"), "drifted")
+    return drifted_features
 
 
-def _top_20_drifted_features_list(
-    features: List[DriftSummaryFeature],
-) -> List[DriftSummaryFeature]:
-    top_20_drifted_features = [
-        feature for feature in _drifted_feature_list(features) if feature.rank <= 20
-    ]
-    return top_20_drifted_features
+def _top_n_drifted_features(ranked_results: pa.Table, n: int) -> pa.ChunkedArray:
+    top_n_drifted_features = pc.and_(
+        _drifted_features(ranked_results),
+        pc.less_equal(ranked_results.column("rank"), n),
+    )
+    return top_n_drifted_features
 
 
 def _fields() -> List[str]:
@@ -236,28 +505,21 @@ def _fields() -> List[str]:
     return fields
 
 
-def _observations(features: List[DriftSummaryFeature]) -> Dict[str, Any]:
-    ranked_features = sorted(features, key=lambda x: x.rank)
-    observations: Dict[str, Any] = {
-        "rank": [feature.rank for feature in ranked_features],
-        "importance_score": [feature.importance_score for feature in ranked_features],
-        "name": [feature.name for feature in ranked_features],
-        "kind": [feature.kind for feature in ranked_features],
-        "p_value": [
-            feature.statistical_test.result.p_value for feature in ranked_features
-        ],
-        "drift_status": [feature.drift_status for feature in ranked_features],
-    }
+def _observations(ranked_results: pa.Table) -> Dict[str, Any]:
+    observations: Dict[str, Any] = (
+        ranked_results.sort_by("rank").select(_fields()).to_pydict()
+    )
     return observations
 
 
-def _thresholds_map(
-    features: Dict[str, DriftSummaryFeature]
-) -> Dict[str, Dict[str, float]]:
-    thresholds: Dict[str, Dict[str, float]] = defaultdict(dict)
-    for feature in features.values():
-        kind = feature.kind
-        test_name = feature.statistical_test.name
-        threshold = feature.statistical_test.significance_level
-        thresholds[kind][test_name] = threshold
+def _thresholds_map(ranked_results: pa.Table) -> Dict[str, Dict[str, float]]:
+    significance_levels = ranked_results.group_by(
+        ["kind", "test_name"], use_threads=False
+    ).aggregate([("significance_level", "last")])
+
+    thresholds: Dict[str, Dict[str, float]] = {}
+    for row in significance_levels.to_pylist():
+        thresholds.setdefault(row["kind"], {})[row["test_name"]] = row[
+            "significance_level_last"
+        ]
     return thresholds
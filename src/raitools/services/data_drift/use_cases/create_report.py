@@ -2,8 +2,10 @@
 
 from typing import Any, Callable
 
-from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.compact_records import AnyDataDriftRecord
 from raitools.services.data_drift.data.data_drift_report import DataDriftReport
+from raitools.services.data_drift.diagnostics import measure
+from raitools.services.data_drift.tracing import span
 from raitools.services.data_drift.reports.plotly_report_builder import (
     plotly_report_builder,
 )
@@ -12,14 +14,19 @@ from raitools.services.data_drift.reports.simple_report_builder import (
 )
 
 
-def create_report(record: DataDriftRecord, report_builder: str) -> DataDriftReport:
+def create_report(record: AnyDataDriftRecord, report_builder: str) -> DataDriftReport:
     """Generates a report for the given record."""
     report_builder_impl = _get_report_builder(report_builder)
-    report = DataDriftReport(results=report_builder_impl(record))
+    with measure("render_report"), span(
+        "render_report",
+        report_builder=report_builder,
+        features=record.results.drift_summary.num_total_features,
+    ):
+        report = DataDriftReport(results=report_builder_impl(record))
     return report
 
 
-def _get_report_builder(name: str) -> Callable[[DataDriftRecord], Any]:
+def _get_report_builder(name: str) -> Callable[[AnyDataDriftRecord], Any]:
     """Gets report builder implementation by name."""
     REPORT_BUILDERS = {
         "simple": simple_report_builder,
@@ -0,0 +1,120 @@
+"""Data drift for many test datasets against one baseline."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import pyarrow as pa
+
+from raitools.services.data_drift.data.bundle import Bundle
+from raitools.services.data_drift.data.common import FileName
+from raitools.services.data_drift.data.data_drift_record import (
+    BundleData,
+    DataDriftRecord,
+    PositiveCount,
+)
+from raitools.services.data_drift.stats.accumulators import Accumulator, accumulators
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    make_result_for_feature,
+)
+
+
+def create_test_set_records_from_bundle(
+    bundle: Bundle,
+    bundle_filename: str,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> Dict[str, DataDriftRecord]:
+    """Processes a bundle into one record per test data file.
+
+    The baseline is summarized once and every test dataset (the bundle's test
+    data followed by any additional test data) is compared against that
+    shared summary. With the "thread" execution mode, test datasets are
+    evaluated on a pool of up to `max_workers` threads.
+
+    Records are keyed by test data filename.
+    """
+    all_test_data = {
+        bundle.test_data_filename: bundle.test_data,
+        **bundle.additional_test_data,
+    }
+
+    baseline_accumulators: Dict[str, Accumulator] = {
+        name: accumulators[feature.kind](bundle.baseline_data.column(name))
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    def get_test_set_drift_results(test_data: pa.Table) -> DriftResultsType:
+        return _get_drift_results_against_baseline(
+            bundle, baseline_accumulators, test_data
+        )
+
+    execute = _get_executor(execution_mode, max_workers)
+    all_drift_results = execute(
+        get_test_set_drift_results, list(all_test_data.values())
+    )
+
+    records = {
+        test_data_filename: create_record_from_drift_results(
+            bundle=bundle,
+            bundle_filename=bundle_filename,
+            drift_results=all_drift_results[index],
+            timestamp=timestamp,
+            uuid=uuid,
+            test_data=BundleData(
+                filename=FileName(test_data_filename),
+                num_rows=PositiveCount(test_data.num_rows),
+                num_columns=PositiveCount(test_data.num_columns),
+            ),
+        )
+        for index, (test_data_filename, test_data) in enumerate(all_test_data.items())
+    }
+
+    return records
+
+
+def _get_executor(
+    execution_mode: str, max_workers: Optional[int]
+) -> Callable[[Callable[[pa.Table], DriftResultsType], List[pa.Table]], List]:
+    """Gets execution mode implementation, over test datasets, by name."""
+
+    def execute_serially(
+        fn: Callable[[pa.Table], DriftResultsType], all_test_data: List[pa.Table]
+    ) -> List[DriftResultsType]:
+        return [fn(test_data) for test_data in all_test_data]
+
+    def execute_on_thread_pool(
+        fn: Callable[[pa.Table], DriftResultsType], all_test_data: List[pa.Table]
+    ) -> List[DriftResultsType]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fn, all_test_data))
+
+    EXECUTORS = {
+        "serial": execute_serially,
+        "thread": execute_on_thread_pool,
+    }
+    return EXECUTORS[execution_mode]
+
+
+def _get_drift_results_against_baseline(
+    bundle: Bundle,
+    baseline_accumulators: Dict[str, Accumulator],
+    test_data: pa.Table,
+) -> DriftResultsType:
+    """Gets drift results for test data against summarized baseline data."""
+    feature_mapping = bundle.feature_mapping.feature_mapping
+
+    results = {}
+    for name, baseline_accumulator in baseline_accumulators.items():
+        accumulator = baseline_accumulator.spawn()
+        accumulator.update(test_data.column(name))
+        results[name] = make_result_for_feature(
+            name, feature_mapping[name].kind, accumulator.result()
+        )
+
+    return results
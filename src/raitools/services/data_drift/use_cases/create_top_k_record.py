@@ -0,0 +1,98 @@
+"""Data drift for the most important features first."""
+
+from operator import attrgetter
+from typing import Dict, Generator, List, Optional, Tuple
+
+from raitools.exceptions import BadTopKError
+from raitools.services.data_drift.data.bundle import Bundle, Feature
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    ResultType,
+    iter_drift_results,
+)
+
+
+def iter_ranked_drift_results(
+    bundle: Bundle,
+    top_k: Optional[int] = None,
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> Generator[Tuple[str, ResultType], None, None]:
+    """Yields drift results for features in order of importance as they finish.
+
+    Only the `top_k` most important features are tested, if given. A bad
+    `top_k` is rejected when this is called, not when results are first read.
+    """
+    ranked_names = rank_features(bundle.feature_mapping.feature_mapping)
+    if top_k is not None:
+        _validate_top_k(top_k)
+        ranked_names = ranked_names[:top_k]
+
+    feature_mapping = {
+        name: FeatureType(
+            name=name, kind=bundle.feature_mapping.feature_mapping[name].kind
+        )
+        for name in ranked_names
+    }
+
+    results = iter_drift_results(
+        baseline_data=bundle.baseline_data,
+        test_data=bundle.test_data,
+        feature_mapping=feature_mapping,
+        execution_mode=execution_mode,
+        max_workers=max_workers,
+    )
+    return results
+
+
+def create_top_k_record_from_bundle(
+    bundle: Bundle,
+    bundle_filename: str,
+    top_k: int,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> DataDriftRecord:
+    """Processes a data drift bundle for its `top_k` most important features.
+
+    The record's features, drift summary and drift details cover just those
+    features, which keep the ranks they have among all features.
+    """
+    ranked_results = dict(
+        iter_ranked_drift_results(bundle, top_k, execution_mode, max_workers)
+    )
+    drift_results = {
+        name: ranked_results[name]
+        for name in rank_features(bundle.feature_mapping.feature_mapping)
+        if name in ranked_results
+    }
+
+    record = create_record_from_drift_results(
+        bundle=bundle,
+        bundle_filename=bundle_filename,
+        drift_results=drift_results,
+        timestamp=timestamp,
+        uuid=uuid,
+        top_k=top_k,
+    )
+
+    return record
+
+
+def rank_features(feature_mapping: Dict[str, Feature]) -> List[str]:
+    """Orders feature names by importance score, most important first."""
+    ranked_features = sorted(
+        feature_mapping.values(), key=attrgetter("importance_score"), reverse=True
+    )
+    ranked_names = [feature.name for feature in ranked_features]
+    return ranked_names
+
+
+def _validate_top_k(top_k: int) -> None:
+    if top_k < 1:
+        raise BadTopKError(f"Top-k {top_k} is not positive.")
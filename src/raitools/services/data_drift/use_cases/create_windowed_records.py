@@ -0,0 +1,140 @@
+"""Windowed data drift over a timestamp column."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.exceptions import BadJobConfigError
+from raitools.services.data_drift.data.bundle import Bundle
+from raitools.services.data_drift.data.common import FileName
+from raitools.services.data_drift.data.data_drift_record import (
+    BundleData,
+    DataDriftRecord,
+    PositiveCount,
+    ResultWindow,
+)
+from raitools.services.data_drift.data.job_config import WindowSpec
+from raitools.services.data_drift.stats.accumulators import Accumulator, accumulators
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    make_result_for_feature,
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class Window(NamedTuple):
+    """A window of test data."""
+
+    start: datetime
+    end: datetime
+    data: pa.Table
+
+
+def create_windowed_records_from_bundle(
+    bundle: Bundle,
+    bundle_filename: str,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+) -> List[DataDriftRecord]:
+    """Processes a data drift bundle into one record per window of test data.
+
+    The baseline is summarized once and reused for every window. Windows
+    without any test data are skipped.
+    """
+    timestamp_column = bundle.job_config.timestamp_column
+    window_spec = bundle.job_config.window
+    if timestamp_column is None or window_spec is None:
+        raise BadJobConfigError(
+            f"Job config `{bundle.job_config_filename}` does not specify a window."
+        )
+
+    feature_mapping = bundle.feature_mapping.feature_mapping
+    feature_accumulators: Dict[str, Accumulator] = {
+        name: accumulators[feature.kind](bundle.baseline_data.column(name))
+        for name, feature in feature_mapping.items()
+    }
+
+    records = []
+    for window in get_windows(bundle.test_data, timestamp_column, window_spec):
+        drift_results = {}
+        for name, accumulator in feature_accumulators.items():
+            accumulator.reset()
+            accumulator.update(window.data.column(name))
+            drift_results[name] = make_result_for_feature(
+                name, feature_mapping[name].kind, accumulator.result()
+            )
+
+        record = create_record_from_drift_results(
+            bundle=bundle,
+            bundle_filename=bundle_filename,
+            drift_results=drift_results,
+            timestamp=timestamp,
+            uuid=uuid,
+            test_data=BundleData(
+                filename=FileName(bundle.job_config.test_data_filename),
+                num_rows=PositiveCount(window.data.num_rows),
+                num_columns=PositiveCount(window.data.num_columns),
+            ),
+            window=ResultWindow(
+                start=window.start.isoformat(), end=window.end.isoformat()
+            ),
+        )
+        records.append(record)
+
+    return records
+
+
+def get_windows(
+    data: pa.Table, timestamp_column: str, window_spec: WindowSpec
+) -> List[Window]:
+    """Partitions data into non-empty windows over its timestamp column.
+
+    Rows are sorted by timestamp once, after which every window is a
+    zero-copy slice whose bounds are found with a single binary search.
+    Windows are aligned to multiples of their step since the Unix epoch (so
+    daily windows start at midnight UTC). Every aligned window holding any
+    rows is kept, so sliding windows that only partly overlap the data are
+    kept at both ends. Rows without a timestamp are dropped.
+    """
+    data = data.filter(pc.is_valid(data.column(timestamp_column)))
+    if data.num_rows == 0:
+        return []
+
+    timestamps = _to_microseconds(data.column(timestamp_column))
+    order = np.argsort(timestamps, kind="stable")
+    sorted_timestamps = timestamps[order]
+    sorted_data = data.take(pa.array(order))
+
+    size = window_spec.get_size() // MICROSECOND
+    step = window_spec.get_step() // MICROSECOND
+    # The first window is the earliest whose end is after the first row.
+    first_start = ((int(sorted_timestamps[0]) - size) // step + 1) * step
+    last_start = (int(sorted_timestamps[-1]) // step) * step
+    starts = np.arange(first_start, last_start + 1, step, dtype=np.int64)
+    ends = starts + size
+    lows = np.searchsorted(sorted_timestamps, starts, side="left")
+    highs = np.searchsorted(sorted_timestamps, ends, side="left")
+
+    windows = [
+        Window(
+            start=EPOCH + int(starts[index]) * MICROSECOND,
+            end=EPOCH + int(ends[index]) * MICROSECOND,
+            data=sorted_data.slice(lows[index], highs[index] - lows[index]),
+        )
+        for index in np.flatnonzero(highs > lows)
+    ]
+
+    return windows
+
+
+def _to_microseconds(timestamps: pa.ChunkedArray) -> np.ndarray:
+    """Converts timestamps or dates to microseconds since the Unix epoch."""
+    microseconds = pc.cast(timestamps, pa.timestamp("us")).cast(pa.int64()).to_numpy()
+    return microseconds
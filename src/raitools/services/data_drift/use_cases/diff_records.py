@@ -0,0 +1,108 @@
+"""Differences between two Data Drift records."""
+
+from operator import attrgetter
+from typing import List, NamedTuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+
+CHANGES_SCHEMA = pa.schema(
+    [
+        pa.field("name", pa.string()),
+        pa.field("old_drift_status", pa.string()),
+        pa.field("new_drift_status", pa.string()),
+        pa.field("old_rank", pa.int64()),
+        pa.field("new_rank", pa.int64()),
+        pa.field("rank_change", pa.int64()),
+        pa.field("test_statistic_change", pa.float64()),
+        pa.field("p_value_change", pa.float64()),
+    ]
+)
+
+
+class RecordDiff(NamedTuple):
+    """Differences from an old record's features to a new record's.
+
+    Changes have a row per feature in both records, in order of new rank.
+    Changes are new values less old ones, except for rank changes, which are
+    positive for features that moved up.
+    """
+
+    added_features: List[str]
+    removed_features: List[str]
+    flipped_features: List[str]
+    changes: pa.Table
+
+
+def diff_records(
+    old_record: DataDriftRecord, new_record: DataDriftRecord
+) -> RecordDiff:
+    """Gets the differences between two records' features.
+
+    Features are matched by name, over whole columns of the records' drift
+    details rather than feature by feature.
+    """
+    old_features = _features_table(old_record)
+    new_features = _features_table(new_record)
+
+    old_indices = pc.index_in(
+        new_features.column("name"), value_set=old_features.column("name")
+    )
+    is_added = pc.is_null(old_indices)
+    is_removed = pc.invert(
+        pc.is_in(old_features.column("name"), value_set=new_features.column("name"))
+    )
+
+    new_common = new_features.filter(pc.invert(is_added))
+    old_common = old_features.take(old_indices.drop_null())
+    old_drift_status = old_common.column("drift_status")
+    new_drift_status = new_common.column("drift_status")
+    changes = pa.table(
+        [
+            new_common.column("name"),
+            old_drift_status,
+            new_drift_status,
+            old_common.column("rank"),
+            new_common.column("rank"),
+            pc.subtract(old_common.column("rank"), new_common.column("rank")),
+            pc.subtract(
+                new_common.column("test_statistic"), old_common.column("test_statistic")
+            ),
+            pc.subtract(new_common.column("p_value"), old_common.column("p_value")),
+        ],
+        schema=CHANGES_SCHEMA,
+    )
+
+    record_diff = RecordDiff(
+        added_features=new_features.column("name").filter(is_added).to_pylist(),
+        removed_features=old_features.column("name").filter(is_removed).to_pylist(),
+        flipped_features=changes.column("name")
+        .filter(pc.not_equal(old_drift_status, new_drift_status))
+        .to_pylist(),
+        changes=changes,
+    )
+    return record_diff
+
+
+def _features_table(record: DataDriftRecord) -> pa.Table:
+    """Gets a record's features' names, ranks and statistics, by rank."""
+    observations = record.results.drift_details.observations
+    names = pa.array(observations["name"], pa.string())
+    # Drift details have no test statistics, so those are taken from features.
+    features = record.results.features
+    test_statistics = pa.array(
+        map(attrgetter("statistical_test.result.test_statistic"), features.values()),
+        pa.float64(),
+    ).take(pc.index_in(names, value_set=pa.array(list(features), pa.string())))
+    table = pa.table(
+        {
+            "name": names,
+            "rank": pa.array(observations["rank"], pa.int64()),
+            "drift_status": pa.array(observations["drift_status"], pa.string()),
+            "p_value": pa.array(observations["p_value"], pa.float64()),
+            "test_statistic": test_statistics,
+        }
+    )
+    return table
@@ -0,0 +1,97 @@
+"""Incremental data drift monitoring."""
+
+from typing import Dict, Optional, Union
+
+import pyarrow as pa
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.data.bundle import Bundle
+from raitools.services.data_drift.data.common import FileName
+from raitools.services.data_drift.data.data_drift_record import (
+    BundleData,
+    DataDriftRecord,
+    PositiveCount,
+)
+from raitools.services.data_drift.stats.accumulators import Accumulator, accumulators
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    make_result_for_feature,
+)
+
+
+class DriftMonitor:
+    """Monitors drift of a stream of test data against a bundle's baseline.
+
+    The baseline is summarized once, when the monitor is created. Each call to
+    `update` folds a batch of test data into running accumulators, and each
+    call to `snapshot` compiles a record from those accumulators without
+    revisiting earlier batches.
+    """
+
+    def __init__(self, bundle: Bundle) -> None:
+        """Initializes from the bundle's baseline data and feature mapping.
+
+        The bundle's own test data is not folded in; call `update` with it if
+        it should count towards the monitored test data.
+        """
+        self.bundle = bundle
+        self.num_test_rows = 0
+        self.num_test_columns = 0
+        self.accumulators: Dict[str, Accumulator] = {
+            name: accumulators[feature.kind](bundle.baseline_data.column(name))
+            for name, feature in bundle.feature_mapping.feature_mapping.items()
+        }
+
+    def update(self, batch: Union[pa.RecordBatch, pa.Table]) -> None:
+        """Folds a batch of test data into the monitor."""
+        for name in self.accumulators:
+            if name not in batch.schema.names:
+                raise BadDataFileError(
+                    f"Test data batch does not contain feature {name!r} "
+                    "from feature mapping."
+                )
+
+        for name, accumulator in self.accumulators.items():
+            accumulator.update(batch.column(name))
+        self.num_test_rows += batch.num_rows
+        self.num_test_columns = batch.num_columns
+
+    def get_drift_results(self) -> DriftResultsType:
+        """Gets drift results for all test data seen so far."""
+        feature_mapping = self.bundle.feature_mapping.feature_mapping
+        results = {
+            name: make_result_for_feature(
+                name, feature_mapping[name].kind, accumulator.result()
+            )
+            for name, accumulator in self.accumulators.items()
+        }
+
+        return results
+
+    def snapshot(
+        self,
+        bundle_filename: str,
+        timestamp: Optional[str] = None,
+        uuid: Optional[str] = None,
+    ) -> DataDriftRecord:
+        """Compiles a record for all test data seen so far."""
+        if self.num_test_rows == 0:
+            raise BadDataFileError("Drift monitor has not received any test data.")
+
+        record = create_record_from_drift_results(
+            bundle=self.bundle,
+            bundle_filename=bundle_filename,
+            drift_results=self.get_drift_results(),
+            timestamp=timestamp,
+            uuid=uuid,
+            test_data=BundleData(
+                filename=FileName(self.bundle.job_config.test_data_filename),
+                num_rows=PositiveCount(self.num_test_rows),
+                num_columns=PositiveCount(self.num_test_columns),
+            ),
+        )
+
+        return record
@@ -0,0 +1,79 @@
+"""Execution budgets for Data Drift results."""
+
+import threading
+import time
+from typing import Optional
+
+# Seconds per unit of estimated cost (see `KIND_COST` and
+# `DISTINCT_VALUE_COST`) assumed until a feature has been tested exactly and
+# the actual rate can be observed.
+DEFAULT_SECONDS_PER_COST = 1e-7
+
+
+class ExecutionBudget:
+    """Time allowed for testing features, per feature and for the whole job.
+
+    The time a feature's exact test will take is predicted from its estimated
+    cost and the rate observed on features tested so far. A feature is
+    tested approximately when that prediction exceeds its allowance: the
+    per-feature budget or whatever remains of the job budget, whichever is
+    less.
+    """
+
+    def __init__(
+        self,
+        feature_budget: Optional[float] = None,
+        job_budget: Optional[float] = None,
+    ) -> None:
+        """Initializes budget, in seconds, starting the job's clock."""
+        self.feature_budget = feature_budget
+        self.job_budget = job_budget
+        self.start_time = time.perf_counter()
+        self._total_cost = 0.0
+        self._total_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def seconds_per_cost(self) -> float:
+        """Observed (or, until observed, assumed) seconds per unit of cost."""
+        with self._lock:
+            if self._total_cost == 0:
+                return DEFAULT_SECONDS_PER_COST
+            return self._total_seconds / self._total_cost
+
+    def allowance(self) -> Optional[float]:
+        """Gets the time a feature may take now, if limited."""
+        allowances = []
+        if self.feature_budget is not None:
+            allowances.append(self.feature_budget)
+        if self.job_budget is not None:
+            elapsed = time.perf_counter() - self.start_time
+            allowances.append(max(self.job_budget - elapsed, 0.0))
+
+        allowance = min(allowances) if allowances else None
+        return allowance
+
+    def predict(self, cost: float) -> float:
+        """Predicts how long a feature's exact test will take."""
+        predicted_seconds = cost * self.seconds_per_cost
+        return predicted_seconds
+
+    def fits(self, cost: float) -> bool:
+        """Checks whether a feature's exact test is predicted to fit."""
+        allowance = self.allowance()
+        fits = allowance is None or self.predict(cost) <= allowance
+        return fits
+
+    def max_cost(self) -> Optional[float]:
+        """Gets the largest cost predicted to fit the current allowance."""
+        allowance = self.allowance()
+        if allowance is None:
+            return None
+        max_cost = allowance / self.seconds_per_cost
+        return max_cost
+
+    def observe(self, cost: float, seconds: float) -> None:
+        """Records how long an exact test of this cost took."""
+        with self._lock:
+            self._total_cost += cost
+            self._total_seconds += seconds
@@ -0,0 +1,148 @@
+"""Pairwise data drift across many datasets."""
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+import pyarrow as pa
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.stats.profiles import Profile, profiles
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    ResultType,
+    make_result_for_feature,
+)
+
+ArgumentType = TypeVar("ArgumentType")
+ReturnType = TypeVar("ReturnType")
+
+DRIFT_MATRIX_SCHEMA = pa.schema(
+    [
+        pa.field("baseline", pa.string()),
+        pa.field("test", pa.string()),
+        pa.field("feature", pa.string()),
+        pa.field("kind", pa.string()),
+        pa.field("test_name", pa.string()),
+        pa.field("test_statistic", pa.float64()),
+        pa.field("p_value", pa.float64()),
+        pa.field("drift_status", pa.string()),
+    ]
+)
+
+
+def get_drift_matrix(
+    datasets: Dict[str, pa.Table],
+    feature_mapping: Dict[str, FeatureType],
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> pa.Table:
+    """Gets drift results for every feature between every pair of datasets.
+
+    Each dataset's features are profiled exactly once, and every pair is
+    computed by comparing those profiles. Both statistical tests are
+    symmetric, so each unordered pair appears once, with the dataset given
+    first as the baseline. With the "thread" execution mode, profiles and
+    pairs are computed on a pool of up to `max_workers` threads.
+
+    Returns a table with one row per (pair, feature).
+    """
+    for dataset_name, data in datasets.items():
+        _validate_dataset_has_features(data, dataset_name, feature_mapping)
+
+    map_fn = _get_map_fn(execution_mode, max_workers)
+
+    all_profiles = map_fn(
+        lambda data: _profile_dataset(data, feature_mapping), datasets.values()
+    )
+    dataset_profiles = {
+        dataset_name: all_profiles[index] for index, dataset_name in enumerate(datasets)
+    }
+
+    pairs = list(combinations(datasets, 2))
+    pair_results = map_fn(
+        lambda pair: _compare_profiles(
+            dataset_profiles[pair[0]], dataset_profiles[pair[1]], feature_mapping
+        ),
+        pairs,
+    )
+
+    columns: Dict[str, List] = {field.name: [] for field in DRIFT_MATRIX_SCHEMA}
+    for index, (baseline_name, test_name) in enumerate(pairs):
+        for feature_name, result in pair_results[index].items():
+            statistical_test = result["drift_result"]["statistical_test"]
+            columns["baseline"].append(baseline_name)
+            columns["test"].append(test_name)
+            columns["feature"].append(feature_name)
+            columns["kind"].append(feature_mapping[feature_name]["kind"])
+            columns["test_name"].append(result["test_name"])
+            columns["test_statistic"].append(statistical_test["test_statistic"])
+            columns["p_value"].append(statistical_test["p_value"])
+            columns["drift_status"].append(result["drift_result"]["drift_status"])
+
+    drift_matrix = pa.Table.from_pydict(columns, schema=DRIFT_MATRIX_SCHEMA)
+    return drift_matrix
+
+
+def _profile_dataset(
+    data: pa.Table, feature_mapping: Dict[str, FeatureType]
+) -> Dict[str, Profile]:
+    """Profiles every feature of a dataset."""
+    dataset_profiles = {
+        feature_name: profiles[feature["kind"]](data.column(feature_name))
+        for feature_name, feature in feature_mapping.items()
+    }
+    return dataset_profiles
+
+
+def _compare_profiles(
+    baseline_profiles: Dict[str, Profile],
+    test_profiles: Dict[str, Profile],
+    feature_mapping: Dict[str, FeatureType],
+) -> Dict[str, ResultType]:
+    """Gets drift results for every feature from two datasets' profiles."""
+    results = {
+        feature_name: make_result_for_feature(
+            feature_name,
+            feature["kind"],
+            baseline_profiles[feature_name].compare(test_profiles[feature_name]),
+        )
+        for feature_name, feature in feature_mapping.items()
+    }
+    return results
+
+
+def _get_map_fn(
+    execution_mode: str, max_workers: Optional[int]
+) -> Callable[[Callable[[ArgumentType], ReturnType], Iterable[ArgumentType]], List]:
+    """Gets a function that maps over items serially or on a thread pool."""
+
+    def map_serially(
+        fn: Callable[[ArgumentType], ReturnType], items: Iterable[ArgumentType]
+    ) -> List[ReturnType]:
+        return [fn(item) for item in items]
+
+    def map_on_thread_pool(
+        fn: Callable[[ArgumentType], ReturnType], items: Iterable[ArgumentType]
+    ) -> List[ReturnType]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fn, items))
+
+    MAP_FNS = {
+        "serial": map_serially,
+        "thread": map_on_thread_pool,
+    }
+    return MAP_FNS[execution_mode]
+
+
+def _validate_dataset_has_features(
+    data: pa.Table, dataset_name: str, feature_mapping: Dict[str, FeatureType]
+) -> None:
+    if data.num_rows == 0:
+        raise BadDataFileError(f"Dataset `{dataset_name}` has no rows.")
+
+    for feature_name in feature_mapping:
+        if feature_name not in data.column_names:
+            raise BadDataFileError(
+                f"Dataset `{dataset_name}` does not contain feature {feature_name!r} from feature mapping."
+            )
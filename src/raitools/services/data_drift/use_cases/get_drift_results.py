@@ -1,11 +1,41 @@
 """Data Drift results."""
 
-from typing import Dict, List, TypedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+import time
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 
+from raitools.services.data_drift.diagnostics import measure
+from raitools.services.data_drift.result_cache import ResultCache, make_cache_key
 from raitools.services.data_drift.stats import statistical_tests
-from raitools.services.data_drift.stats.common import StatisticalTestType
+from raitools.services.data_drift.stats.approximations import approximations
+from raitools.services.data_drift.stats.common import (
+    SampleType,
+    StatisticalTestResultType,
+    StatisticalTestType,
+)
+from raitools.services.data_drift.tracing import (
+    is_tracing,
+    NO_OP_SPAN,
+    NoOpSpan,
+    Span,
+    span,
+)
+from raitools.services.data_drift.use_cases.execution_budget import ExecutionBudget
 
 OUTCOME_DESC = {
     True: "reject null hypothesis",
@@ -18,6 +48,20 @@ STATUS_DESC = {
 
 SIGNIFICANCE_LEVEL = 0.05
 
+# Relative cost of each feature kind's test, per row and per distinct value
+# across both datasets, used to schedule the most expensive features first
+# and to predict test times against budgets. Categorical tests count rows
+# in Python and build a contingency table with a column per category, while
+# numerical tests sort both samples in NumPy.
+KIND_COST = {
+    "numerical": 1.0,
+    "categorical": 1.5,
+}
+DISTINCT_VALUE_COST = {
+    "numerical": 0.0,
+    "categorical": 30.0,
+}
+
 
 class TestResultType(TypedDict):
     """Statistical test result."""
@@ -37,13 +81,20 @@ class DriftResultType(TypedDict):
     drift_status: str
 
 
-class ResultType(TypedDict):
-    """Statistical test result."""
-
+class _ExactResultType(TypedDict):
     test_name: str
     drift_result: DriftResultType
 
 
+class ResultType(_ExactResultType, total=False):
+    """Statistical test result.
+
+    Results of approximate tests name their approximation.
+    """
+
+    approximation: str
+
+
 class FeatureType(TypedDict):
     """Feature."""
 
@@ -53,17 +104,39 @@ class FeatureType(TypedDict):
 
 DriftResultsType = Dict[str, ResultType]
 
+# Drift results laid out as columns, one row per feature.
+RESULTS_SCHEMA = pa.schema(
+    [
+        pa.field("name", pa.string()),
+        pa.field("test_name", pa.string()),
+        pa.field("significance_level", pa.float64()),
+        pa.field("test_statistic", pa.float64()),
+        pa.field("p_value", pa.float64()),
+        pa.field("outcome", pa.string()),
+        pa.field("drift_status", pa.string()),
+        pa.field("approximation", pa.string()),
+    ]
+)
+
 
 def get_result_for_test(
-    baseline_data: List, test_data: List, test: StatisticalTestType
+    baseline_data: SampleType, test_data: SampleType, test: StatisticalTestType
 ) -> TestResultType:
     """Computes result for this test applied to feature data."""
     result = test["method"](baseline_data, test_data)
+    test_result = make_test_result(test["name"], result)
+    return test_result
+
+
+def make_test_result(
+    test_name: str, result: StatisticalTestResultType
+) -> TestResultType:
+    """Makes a test result from the test's statistic and p-value."""
     is_significant = result["p_value"] <= SIGNIFICANCE_LEVEL
     outcome = OUTCOME_DESC[is_significant]
 
     return TestResultType(
-        name=test["name"],
+        name=test_name,
         significance_level=SIGNIFICANCE_LEVEL,
         test_statistic=result["test_statistic"],
         p_value=result["p_value"],
@@ -71,23 +144,75 @@ def get_result_for_test(
     )
 
 
+def make_drift_result(feature_name: str, result: TestResultType) -> DriftResultType:
+    """Makes a drift result from a feature's test result."""
+    status = STATUS_DESC[result["outcome"]]
+
+    return DriftResultType(
+        name=feature_name, statistical_test=result, drift_status=status
+    )
+
+
+def make_result_for_feature(
+    feature_name: str,
+    feature_kind: str,
+    result: StatisticalTestResultType,
+    approximation: Optional[str] = None,
+) -> ResultType:
+    """Makes a feature's result from its test's statistic and p-value.
+
+    This is for results computed outside of the test's `method`, such as from
+    running accumulators or approximate tests.
+    """
+    test_name = statistical_tests[feature_kind]["name"]
+    test_result = make_test_result(test_name, result)
+    drift_result = make_drift_result(feature_name, test_result)
+
+    feature_result = ResultType(test_name=test_name, drift_result=drift_result)
+    if approximation is not None:
+        feature_result["approximation"] = approximation
+    return feature_result
+
+
+def to_results_table(drift_results: DriftResultsType) -> pa.Table:
+    """Lays out drift results as a table with one row per feature.
+
+    Columns are those of `RESULTS_SCHEMA`, and rows are in the order of the
+    results. Results of exact tests have no approximation.
+    """
+    columns: Dict[str, List] = {name: [] for name in RESULTS_SCHEMA.names}
+    for feature_name, result in drift_results.items():
+        statistical_test = result["drift_result"]["statistical_test"]
+        columns["name"].append(feature_name)
+        columns["test_name"].append(result["test_name"])
+        columns["significance_level"].append(statistical_test["significance_level"])
+        columns["test_statistic"].append(statistical_test["test_statistic"])
+        columns["p_value"].append(statistical_test["p_value"])
+        columns["outcome"].append(statistical_test["outcome"])
+        columns["drift_status"].append(result["drift_result"]["drift_status"])
+        columns["approximation"].append(result.get("approximation"))
+
+    results_table = pa.table(columns, schema=RESULTS_SCHEMA)
+    return results_table
+
+
 def get_drift_result_for_test(
-    baseline_data: List,
-    test_data: List,
+    baseline_data: SampleType,
+    test_data: SampleType,
     feature_name: str,
     test_details: StatisticalTestType,
 ) -> DriftResultType:
     """Gets drift result for this feature and test."""
     result = get_result_for_test(baseline_data, test_data, test_details)
-    status = STATUS_DESC[result["outcome"]]
-
-    return DriftResultType(
-        name=feature_name, statistical_test=result, drift_status=status
-    )
+    drift_result = make_drift_result(feature_name, result)
+    return drift_result
 
 
 def get_drift_results_for_feature(
-    baseline_data: List, test_data: List, feature_name: str, feature_kind: str
+    baseline_data: SampleType,
+    test_data: SampleType,
+    feature_name: str,
+    feature_kind: str,
 ) -> ResultType:
     """Gets drift result for all associated tests."""
     test_name = statistical_tests[feature_kind]["name"]
@@ -103,16 +228,375 @@ def get_drift_results(
     baseline_data: pa.Table,
     test_data: pa.Table,
     feature_mapping: Dict[str, FeatureType],
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+    feature_budget: Optional[float] = None,
+    job_budget: Optional[float] = None,
+    cache: Optional[ResultCache] = None,
+) -> DriftResultsType:
+    """Gets drift results for all features.
+
+    Features are evaluated one after another by default. With the "thread"
+    execution mode, features are evaluated on a pool of up to `max_workers`
+    threads, most costly first (by rows and, for categorical features,
+    categories), while features whose test is not thread-safe are
+    evaluated serially in the calling thread.
+
+    With a budget (in seconds, per feature and/or for the whole job), a
+    feature whose exact test is predicted to overrun it is tested
+    approximately instead, and its result names the approximation.
+
+    With a cache, a feature whose columns, test and test parameters match a
+    previously tested feature reuses that feature's test result.
+    """
+    budget = (
+        None
+        if feature_budget is None and job_budget is None
+        else ExecutionBudget(feature_budget, job_budget)
+    )
+    execute = _get_executor(execution_mode)
+    with measure("get_drift_results"), span(
+        "get_drift_results",
+        features=len(feature_mapping),
+        execution_mode=execution_mode,
+    ):
+        unordered_results = execute(
+            baseline_data, test_data, feature_mapping, max_workers, budget, cache
+        )
+
+    results = {
+        feature_name: unordered_results[feature_name]
+        for feature_name in feature_mapping
+    }
+
+    return results
+
+
+def iter_drift_results(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> Generator[Tuple[str, ResultType], None, None]:
+    """Yields each feature's drift results as soon as they are ready.
+
+    Features are scheduled in the order of the feature mapping. With the
+    "thread" execution mode, they are evaluated on a pool of up to
+    `max_workers` threads and yielded as they finish, so a later feature may
+    be yielded before an earlier one. Features whose test is not thread-safe
+    are evaluated in the calling thread. Closing the iterator early cancels
+    features not yet started.
+    """
+    iterate = _get_iterator(execution_mode)
+    yield from iterate(baseline_data, test_data, feature_mapping, max_workers)
+
+
+ExecutorType = Callable[
+    [
+        pa.Table,
+        pa.Table,
+        Dict[str, FeatureType],
+        Optional[int],
+        Optional[ExecutionBudget],
+        Optional[ResultCache],
+    ],
+    DriftResultsType,
+]
+
+
+def _get_executor(name: str) -> ExecutorType:
+    """Gets execution mode implementation by name."""
+    EXECUTORS: Dict[str, ExecutorType] = {
+        "serial": _execute_serially,
+        "thread": _execute_on_thread_pool,
+    }
+    return EXECUTORS[name]
+
+
+def _execute_serially(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    max_workers: Optional[int] = None,
+    budget: Optional[ExecutionBudget] = None,
+    cache: Optional[ResultCache] = None,
 ) -> DriftResultsType:
-    """Gets drift results for all features."""
+    """Evaluates every feature in the calling thread."""
     results = {
-        feature_name: get_drift_results_for_feature(
-            baseline_data.column(feature_name).to_pylist(),
-            test_data.column(feature_name).to_pylist(),
-            feature_details["name"],
-            feature_details["kind"],
+        feature_name: _get_drift_results_for_column(
+            baseline_data, test_data, feature_details, budget, cache
         )
         for feature_name, feature_details in feature_mapping.items()
     }
 
     return results
+
+
+def _execute_on_thread_pool(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    max_workers: Optional[int] = None,
+    budget: Optional[ExecutionBudget] = None,
+    cache: Optional[ResultCache] = None,
+) -> DriftResultsType:
+    """Evaluates thread-safe features on a thread pool, largest first."""
+    scheduled_features = sorted(
+        feature_mapping.values(),
+        key=lambda feature: _estimate_cost(baseline_data, test_data, feature),
+        reverse=True,
+    )
+    concurrent_features = [
+        feature for feature in scheduled_features if _is_thread_safe(feature)
+    ]
+    serial_features = [
+        feature for feature in scheduled_features if not _is_thread_safe(feature)
+    ]
+
+    results: DriftResultsType = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures: Dict[str, Future] = {
+            feature["name"]: executor.submit(
+                copy_context().run,
+                _get_drift_results_for_column,
+                baseline_data,
+                test_data,
+                feature,
+                budget,
+                cache,
+            )
+            for feature in concurrent_features
+        }
+        for feature in serial_features:
+            results[feature["name"]] = _get_drift_results_for_column(
+                baseline_data, test_data, feature, budget, cache
+            )
+        for feature_name, future in futures.items():
+            results[feature_name] = future.result()
+
+    return results
+
+
+IteratorType = Callable[
+    [pa.Table, pa.Table, Dict[str, FeatureType], Optional[int]],
+    Iterator[Tuple[str, ResultType]],
+]
+
+
+def _get_iterator(name: str) -> IteratorType:
+    """Gets streaming execution mode implementation by name."""
+    ITERATORS: Dict[str, IteratorType] = {
+        "serial": _iterate_serially,
+        "thread": _iterate_on_thread_pool,
+    }
+    return ITERATORS[name]
+
+
+def _iterate_serially(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, ResultType]]:
+    """Evaluates features in order in the calling thread."""
+    for feature_name, feature in feature_mapping.items():
+        yield feature_name, _get_drift_results_for_column(
+            baseline_data, test_data, feature
+        )
+
+
+def _iterate_on_thread_pool(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[str, ResultType]]:
+    """Evaluates thread-safe features in order on a thread pool."""
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures: Dict[Future, str] = {}
+    try:
+        futures = {
+            executor.submit(
+                copy_context().run,
+                _get_drift_results_for_column,
+                baseline_data,
+                test_data,
+                feature,
+            ): feature_name
+            for feature_name, feature in feature_mapping.items()
+            if _is_thread_safe(feature)
+        }
+        for feature_name, feature in feature_mapping.items():
+            if not _is_thread_safe(feature):
+                yield feature_name, _get_drift_results_for_column(
+                    baseline_data, test_data, feature
+                )
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Features not yet started are cancelled by hand, as
+        # `shutdown(cancel_futures=True)` needs Python 3.9.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _get_drift_results_for_column(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature: FeatureType,
+    budget: Optional[ExecutionBudget] = None,
+    cache: Optional[ResultCache] = None,
+) -> ResultType:
+    """Gets drift results for the feature's column in both datasets."""
+    cache_key = None
+    if cache is not None:
+        cache_key = _make_cache_key(baseline_data, test_data, feature)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            with _feature_span(baseline_data, test_data, feature, cache="hit"):
+                return make_result_for_feature(
+                    feature["name"], feature["kind"], cached_result
+                )
+
+    cost = 0.0
+    if budget is not None:
+        cost = _estimate_cost(baseline_data, test_data, feature)
+        if not budget.fits(cost):
+            return _get_approximate_drift_results_for_column(
+                baseline_data, test_data, feature, budget
+            )
+
+    start_time = time.perf_counter()
+    with _feature_span(baseline_data, test_data, feature) as feature_span:
+        with measure("to_numpy", feature["name"]):
+            baseline_values = _to_sample(baseline_data.column(feature["name"]))
+            test_values = _to_sample(test_data.column(feature["name"]))
+
+        with measure("statistical_test", feature["name"]):
+            result = get_drift_results_for_feature(
+                baseline_values, test_values, feature["name"], feature["kind"]
+            )
+        feature_span.set_attribute(
+            "drift_status", result["drift_result"]["drift_status"]
+        )
+
+    if budget is not None:
+        budget.observe(cost, time.perf_counter() - start_time)
+    if cache is not None and cache_key is not None:
+        statistical_test = result["drift_result"]["statistical_test"]
+        cache.put(
+            cache_key,
+            StatisticalTestResultType(
+                test_statistic=statistical_test["test_statistic"],
+                p_value=statistical_test["p_value"],
+            ),
+        )
+    return result
+
+
+def _get_approximate_drift_results_for_column(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature: FeatureType,
+    budget: ExecutionBudget,
+) -> ResultType:
+    """Gets drift results for the feature's column within the budget."""
+    approximation = approximations[feature["kind"]]
+    max_cost = budget.max_cost() or 0.0
+    max_rows = int(max_cost / KIND_COST[feature["kind"]] / 2)
+
+    with _feature_span(
+        baseline_data, test_data, feature, approximation=approximation["name"]
+    ) as feature_span:
+        with measure("approximate_test", feature["name"]):
+            test_result = approximation["method"](
+                baseline_data.column(feature["name"]),
+                test_data.column(feature["name"]),
+                max_rows,
+            )
+        result = make_result_for_feature(
+            feature["name"], feature["kind"], test_result, approximation["name"]
+        )
+        feature_span.set_attribute(
+            "drift_status", result["drift_result"]["drift_status"]
+        )
+
+    return result
+
+
+def _feature_span(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature: FeatureType,
+    approximation: Optional[str] = None,
+    cache: Optional[str] = None,
+) -> Union[Span, NoOpSpan]:
+    """Gets a feature's span, building its attributes only while tracing."""
+    if not is_tracing():
+        return NO_OP_SPAN
+
+    attributes = {
+        "feature": feature["name"],
+        "kind": feature["kind"],
+        "test_name": statistical_tests[feature["kind"]]["name"],
+        "baseline_rows": baseline_data.num_rows,
+        "test_rows": test_data.num_rows,
+    }
+    if approximation is not None:
+        attributes["approximation"] = approximation
+    if cache is not None:
+        attributes["cache"] = cache
+    feature_span = span("feature_test", **attributes)
+    return feature_span
+
+
+def _make_cache_key(
+    baseline_data: pa.Table, test_data: pa.Table, feature: FeatureType
+) -> str:
+    """Makes the cache key for a feature's exact test."""
+    cache_key = make_cache_key(
+        baseline_data.column(feature["name"]),
+        test_data.column(feature["name"]),
+        statistical_tests[feature["kind"]]["name"],
+        {"kind": feature["kind"], "significance_level": SIGNIFICANCE_LEVEL},
+    )
+    return cache_key
+
+
+def _estimate_cost(
+    baseline_data: pa.Table, test_data: pa.Table, feature: FeatureType
+) -> float:
+    """Estimates the relative cost of testing a feature for drift.
+
+    The cost grows with the rows of both datasets and, for kinds whose tests
+    depend on them, with the distinct values across both datasets.
+    """
+    num_rows = baseline_data.num_rows + test_data.num_rows
+    cost = num_rows * KIND_COST[feature["kind"]]
+    if DISTINCT_VALUE_COST[feature["kind"]] > 0:
+        values = pa.chunked_array(
+            baseline_data.column(feature["name"]).chunks
+            + test_data.column(feature["name"]).chunks
+        )
+        num_distinct_values = pc.count_distinct(values).as_py()
+        cost += num_distinct_values * DISTINCT_VALUE_COST[feature["kind"]]
+    return cost
+
+
+def _to_sample(column: pa.ChunkedArray) -> np.ndarray:
+    """Converts a feature's column to a NumPy array for its test.
+
+    Arrow converts in native code, without copying single-chunk numerical
+    columns, so tests on a thread pool spend little time holding the GIL.
+    """
+    sample = column.to_numpy()
+    return sample
+
+
+def _is_thread_safe(feature: FeatureType) -> bool:
+    """Checks whether the feature's test can run concurrently with others."""
+    test_details = statistical_tests[feature["kind"]]
+    is_thread_safe = bool(test_details.get("thread_safe", False))
+    return is_thread_safe
@@ -0,0 +1,162 @@
+"""Per-feature drift trends over a history of records."""
+
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.services.data_drift.record_store import RecordStore
+
+# CUSUM parameters, in units of each feature's reference standard deviation.
+# With these, about 3% of features whose statistics do not shift are flagged
+# over two years of daily records.
+DEFAULT_SLACK = 0.5
+DEFAULT_THRESHOLD = 15.0
+DEFAULT_NUM_REFERENCE_RECORDS = 30
+
+CHANGE_POINTS_SCHEMA = pa.schema(
+    [
+        pa.field("feature", pa.string()),
+        pa.field("first_drifted", pa.string()),
+        pa.field("change_point", pa.string()),
+        pa.field("max_cusum", pa.float64()),
+    ]
+)
+
+TREND_COLUMNS = [
+    "record_id",
+    "timestamp",
+    "name",
+    "test_statistic",
+    "p_value",
+    "drift_status",
+]
+
+
+class FeatureTrends(NamedTuple):
+    """Drift statistics of every feature over a series of records.
+
+    Arrays have a row per feature and a column per record, in order of
+    timestamp. Statistics are NaN, and features not drifted, for records
+    without the feature.
+    """
+
+    features: List[str]
+    record_ids: List[int]
+    timestamps: List[str]
+    test_statistics: np.ndarray
+    p_values: np.ndarray
+    drifted: np.ndarray
+
+
+def get_model_trends(
+    store: RecordStore,
+    model_catalog_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> FeatureTrends:
+    """Gets trends of a model's features from its records in a store."""
+    entries = store.find_records(
+        model_catalog_id=model_catalog_id, start=start, end=end
+    )
+    statistics = store.get_feature_statistics(
+        [entry["record_id"] for entry in entries], columns=TREND_COLUMNS
+    )
+    trends = get_feature_trends(statistics)
+    return trends
+
+
+def get_feature_trends(statistics: pa.Table) -> FeatureTrends:
+    """Gets trends from per-feature statistics of any number of records.
+
+    Statistics have a row per feature of each record, with (at least) the
+    columns in `TREND_COLUMNS`, as in a record store's statistics.
+    """
+    statistics = statistics.sort_by(
+        [("timestamp", "ascending"), ("record_id", "ascending")]
+    )
+    record_ids = statistics.column("record_id").to_numpy()
+    is_new_record = np.empty(len(record_ids), dtype=bool)
+    is_new_record[:1] = True
+    is_new_record[1:] = record_ids[1:] != record_ids[:-1]
+    record_indices = np.cumsum(is_new_record) - 1
+
+    features = pc.unique(statistics.column("name"))
+    feature_indices = pc.index_in(
+        statistics.column("name"), value_set=features
+    ).to_numpy()
+
+    shape = (len(features), int(is_new_record.sum()))
+    test_statistics = np.full(shape, np.nan)
+    test_statistics[feature_indices, record_indices] = statistics.column(
+        "test_statistic"
+    ).to_numpy()
+    p_values = np.full(shape, np.nan)
+    p_values[feature_indices, record_indices] = statistics.column("p_value").to_numpy()
+    drifted = np.zeros(shape, dtype=bool)
+    drifted[feature_indices, record_indices] = pc.equal(
+        statistics.column("drift_status"), "drifted"
+    ).to_numpy()
+
+    trends = FeatureTrends(
+        features=features.to_pylist(),
+        record_ids=record_ids[is_new_record].tolist(),
+        timestamps=statistics.column("timestamp").filter(is_new_record).to_pylist(),
+        test_statistics=test_statistics,
+        p_values=p_values,
+        drifted=drifted,
+    )
+    return trends
+
+
+def detect_change_points(
+    trends: FeatureTrends,
+    slack: float = DEFAULT_SLACK,
+    threshold: float = DEFAULT_THRESHOLD,
+    num_reference_records: int = DEFAULT_NUM_REFERENCE_RECORDS,
+) -> pa.Table:
+    """Finds where each feature first drifted, and where its statistic shifted.
+
+    A feature's statistic is standardized by its mean and standard deviation
+    over the first `num_reference_records` records. An upper CUSUM of the
+    standardized statistic, less `slack`, flags a change point at the first
+    record where it exceeds `threshold`. All features are scanned at once.
+
+    Returns a table with one row per feature, with the timestamps of the
+    first drifted record and the change point, where there are any.
+    """
+    reference = trends.test_statistics[:, :num_reference_records]
+    with np.errstate(all="ignore"):
+        means = np.nanmean(reference, axis=1, keepdims=True)
+        scales = np.nanstd(reference, axis=1, ddof=1, keepdims=True)
+    # A statistic that is constant over the reference is not standardized.
+    scales = np.where(scales > 0, scales, 1.0)
+    scores = np.nan_to_num((trends.test_statistics - means) / scales - slack)
+
+    # The upper CUSUM, max(0, previous CUSUM + score), is the cumulative
+    # score less its running minimum (or zero, if lower).
+    cumulative_scores = np.cumsum(scores, axis=1)
+    cusums = cumulative_scores - np.minimum.accumulate(
+        np.minimum(cumulative_scores, 0.0), axis=1
+    )
+
+    timestamps = pa.array(trends.timestamps, pa.string())
+    change_points = pa.table(
+        {
+            "feature": pa.array(trends.features, pa.string()),
+            "first_drifted": _first(trends.drifted, timestamps),
+            "change_point": _first(cusums > threshold, timestamps),
+            "max_cusum": np.max(cusums, axis=1, initial=0.0),
+        },
+        schema=CHANGE_POINTS_SCHEMA,
+    )
+    return change_points
+
+
+def _first(flags: np.ndarray, timestamps: pa.Array) -> pa.Array:
+    """Gets the timestamp of each feature's first flagged record, if any."""
+    first_indices = np.argmax(flags, axis=1) if flags.size else np.zeros(0, int)
+    is_flagged = flags.any(axis=1)
+    first_timestamps = timestamps.take(pa.array(first_indices, mask=~is_flagged))
+    return first_timestamps
@@ -0,0 +1,161 @@
+"""Data Drift results by segment."""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    FeatureType,
+    get_drift_results,
+)
+
+
+class Segment(NamedTuple):
+    """A segment of the baseline and test data."""
+
+    key: Dict[str, Optional[str]]
+    baseline_data: pa.Table
+    test_data: pa.Table
+
+
+class SegmentResults(NamedTuple):
+    """Drift results for a segment."""
+
+    segment: Segment
+    drift_results: DriftResultsType
+
+
+class SegmentedDriftResults(NamedTuple):
+    """Drift results for all segments that were large enough to test."""
+
+    segment_results: List[SegmentResults]
+    num_skipped_segments: int
+
+
+def get_segmented_drift_results(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    feature_mapping: Dict[str, FeatureType],
+    slice_columns: List[str],
+    min_segment_rows: int = 1,
+    execution_mode: str = "serial",
+    max_workers: Optional[int] = None,
+) -> SegmentedDriftResults:
+    """Gets drift results for every segment defined by the slice columns.
+
+    Segments with fewer than `min_segment_rows` rows in either the baseline or
+    the test data are skipped.
+    """
+    segments, num_skipped_segments = get_segments(
+        baseline_data, test_data, slice_columns, min_segment_rows
+    )
+
+    segment_results = [
+        SegmentResults(
+            segment=segment,
+            drift_results=get_drift_results(
+                baseline_data=segment.baseline_data,
+                test_data=segment.test_data,
+                feature_mapping=feature_mapping,
+                execution_mode=execution_mode,
+                max_workers=max_workers,
+            ),
+        )
+        for segment in segments
+    ]
+
+    return SegmentedDriftResults(
+        segment_results=segment_results, num_skipped_segments=num_skipped_segments
+    )
+
+
+def get_segments(
+    baseline_data: pa.Table,
+    test_data: pa.Table,
+    slice_columns: List[str],
+    min_segment_rows: int = 1,
+) -> Tuple[List[Segment], int]:
+    """Partitions baseline and test data into segments by the slice columns.
+
+    Each slice column is dictionary-encoded against the values seen in either
+    dataset, and the per-column codes are combined into one segment code per
+    row. Each dataset is then sorted by segment code once, so every segment is
+    a zero-copy slice. Returns the segments large enough to test and the
+    number of segments skipped.
+    """
+    slice_values = {
+        column: pc.unique(
+            pa.chunked_array(
+                baseline_data.column(column).chunks + test_data.column(column).chunks,
+                type=baseline_data.schema.field(column).type,
+            )
+        )
+        for column in slice_columns
+    }
+
+    baseline_segments = _partition(baseline_data, slice_columns, slice_values)
+    test_segments = _partition(test_data, slice_columns, slice_values)
+
+    segments = []
+    segment_codes = sorted(set(baseline_segments).union(test_segments))
+    for code in segment_codes:
+        segment_baseline_data = baseline_segments.get(code)
+        segment_test_data = test_segments.get(code)
+        if (
+            segment_baseline_data is None
+            or segment_test_data is None
+            or segment_baseline_data.num_rows < min_segment_rows
+            or segment_test_data.num_rows < min_segment_rows
+        ):
+            continue
+
+        segments.append(
+            Segment(
+                key=_decode_segment_key(code, slice_columns, slice_values),
+                baseline_data=segment_baseline_data,
+                test_data=segment_test_data,
+            )
+        )
+
+    num_skipped_segments = len(segment_codes) - len(segments)
+    return segments, num_skipped_segments
+
+
+def _partition(
+    data: pa.Table, slice_columns: List[str], slice_values: Dict[str, pa.Array]
+) -> Dict[int, pa.Table]:
+    """Partitions data by segment code."""
+    codes = np.zeros(data.num_rows, dtype=np.int64)
+    for column in slice_columns:
+        column_codes = pc.index_in(
+            data.column(column), value_set=slice_values[column], skip_nulls=False
+        )
+        codes = codes * len(slice_values[column]) + column_codes.to_numpy()
+
+    order = np.argsort(codes, kind="stable")
+    sorted_data = data.take(pa.array(order))
+    unique_codes, starts, counts = np.unique(
+        codes[order], return_index=True, return_counts=True
+    )
+
+    partitions = {
+        int(unique_codes[index]): sorted_data.slice(starts[index], counts[index])
+        for index in range(len(unique_codes))
+    }
+    return partitions
+
+
+def _decode_segment_key(
+    code: int, slice_columns: List[str], slice_values: Dict[str, pa.Array]
+) -> Dict[str, Optional[str]]:
+    """Decodes a segment code back into its slice column values."""
+    key: Dict[str, Optional[str]] = {}
+    for column in reversed(slice_columns):
+        code, column_code = divmod(code, len(slice_values[column]))
+        key[column] = slice_values[column][column_code].as_py()
+
+    ordered_key = {column: key[column] for column in slice_columns}
+    return ordered_key
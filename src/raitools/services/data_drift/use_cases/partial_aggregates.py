@@ -0,0 +1,329 @@
+"""Data drift as mergeable partial aggregates.
+
+This lets any executor compute drift where the data lives:
+
+    states = [partial(batch, feature_mapping, "baseline") for batch in baseline]
+    states += [partial(batch, feature_mapping, "test") for batch in test]
+    drift_results = finalize(merge(states))
+
+or, with the rest of the bundle's contents in hand, a record with
+`create_record_from_state`.
+
+States are plain dictionaries of lists, numbers and strings, and so can be
+serialized as JSON and shipped between processes. Each feature's state holds
+its distinct values and their counts in either dataset, which is all the
+statistical tests need: merging states and finalizing gives exactly the
+results that testing all of the data at once would.
+
+A numerical feature's state grows with its number of distinct values, which
+for continuous data is about its number of rows. Passing
+`max_numerical_values` to `partial` and `merge` bounds it instead: values are
+grouped into at most that many quantile bins, each kept as its largest value.
+The empirical distributions are then exact at the kept values and off by at
+most 1 / `max_numerical_values` between them, so the Kolmogorov-Smirnov
+statistic is off by at most 2 / `max_numerical_values`.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, TypedDict, Union
+
+import numpy as np
+import pyarrow as pa
+
+from raitools import stats
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.data.bundle import FeatureMapping
+from raitools.services.data_drift.data.common import FileName
+from raitools.services.data_drift.data.data_drift_record import (
+    BundleData,
+    DataDriftRecord,
+    PositiveCount,
+)
+from raitools.services.data_drift.data.job_config import DataDriftJobConfig
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.stats.profiles import count_categories, to_numpy
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_summaries,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    DriftResultsType,
+    FeatureType,
+    make_result_for_feature,
+)
+
+DATASETS = ("baseline", "test")
+
+
+class SummaryState(TypedDict):
+    """Distinct values of a feature in one dataset and their counts."""
+
+    values: List[Any]
+    counts: List[int]
+
+
+class FeatureState(TypedDict):
+    """Summaries of a feature in the baseline and test datasets."""
+
+    kind: str
+    baseline: SummaryState
+    test: SummaryState
+
+
+class DatasetState(TypedDict):
+    """Shape of a dataset."""
+
+    num_rows: int
+    num_columns: int
+
+
+class DriftState(TypedDict):
+    """Partial aggregate of data drift over any number of batches."""
+
+    baseline: DatasetState
+    test: DatasetState
+    features: Dict[str, FeatureState]
+
+
+def partial(
+    batch: Union[pa.RecordBatch, pa.Table],
+    feature_mapping: Dict[str, FeatureType],
+    dataset: str,
+    max_numerical_values: Optional[int] = None,
+) -> DriftState:
+    """Summarizes a batch of baseline or test data."""
+    _validate_dataset(dataset)
+    _validate_batch_has_features(batch, feature_mapping)
+
+    shapes = {
+        dataset_name: DatasetState(num_rows=0, num_columns=0)
+        for dataset_name in DATASETS
+    }
+    shapes[dataset] = DatasetState(
+        num_rows=batch.num_rows, num_columns=batch.num_columns
+    )
+
+    features = {}
+    for name, feature in feature_mapping.items():
+        summaries = {
+            dataset_name: SummaryState(values=[], counts=[])
+            for dataset_name in DATASETS
+        }
+        summaries[dataset] = _summarize(
+            batch.column(name), feature["kind"], max_numerical_values
+        )
+        features[name] = FeatureState(
+            kind=feature["kind"],
+            baseline=summaries["baseline"],
+            test=summaries["test"],
+        )
+
+    state = DriftState(
+        baseline=shapes["baseline"], test=shapes["test"], features=features
+    )
+    return state
+
+
+def merge(
+    states: Iterable[DriftState], max_numerical_values: Optional[int] = None
+) -> DriftState:
+    """Combines partial aggregates, in any order or grouping."""
+    states = list(states)
+    merged_state = DriftState(
+        baseline=_merge_datasets([state["baseline"] for state in states]),
+        test=_merge_datasets([state["test"] for state in states]),
+        features={},
+    )
+
+    feature_names = dict.fromkeys(
+        name for state in states for name in state["features"]
+    )
+    for name in feature_names:
+        feature_states = [
+            state["features"][name] for state in states if name in state["features"]
+        ]
+        kind = feature_states[0]["kind"]
+        merged_state["features"][name] = FeatureState(
+            kind=kind,
+            baseline=_merge_summaries(
+                [feature_state["baseline"] for feature_state in feature_states],
+                kind,
+                max_numerical_values,
+            ),
+            test=_merge_summaries(
+                [feature_state["test"] for feature_state in feature_states],
+                kind,
+                max_numerical_values,
+            ),
+        )
+
+    return merged_state
+
+
+def finalize(state: DriftState) -> DriftResultsType:
+    """Gets drift results for every feature from a complete aggregate."""
+    results = {}
+    for name, feature_state in state["features"].items():
+        for dataset, summary in [
+            ("baseline", feature_state["baseline"]),
+            ("test", feature_state["test"]),
+        ]:
+            if not summary["counts"]:
+                raise BadDataFileError(
+                    f"Feature {name!r} has no {dataset} observations."
+                )
+        results[name] = make_result_for_feature(
+            name, feature_state["kind"], _test(feature_state)
+        )
+
+    return results
+
+
+def create_record_from_state(
+    state: DriftState,
+    job_config: DataDriftJobConfig,
+    job_config_filename: str,
+    feature_mapping: FeatureMapping,
+    bundle_filename: str,
+    timestamp: Optional[str] = None,
+    uuid: Optional[str] = None,
+) -> DataDriftRecord:
+    """Compiles a data drift record from a complete aggregate."""
+    record = create_record_from_summaries(
+        job_config=job_config,
+        job_config_filename=job_config_filename,
+        feature_mapping=feature_mapping,
+        bundle_filename=bundle_filename,
+        baseline_data=BundleData(
+            filename=FileName(job_config.baseline_data_filename),
+            num_rows=PositiveCount(state["baseline"]["num_rows"]),
+            num_columns=PositiveCount(state["baseline"]["num_columns"]),
+        ),
+        test_data=BundleData(
+            filename=FileName(job_config.test_data_filename),
+            num_rows=PositiveCount(state["test"]["num_rows"]),
+            num_columns=PositiveCount(state["test"]["num_columns"]),
+        ),
+        drift_results=finalize(state),
+        timestamp=timestamp,
+        uuid=uuid,
+    )
+
+    return record
+
+
+def _summarize(
+    data: pa.ChunkedArray, kind: str, max_numerical_values: Optional[int] = None
+) -> SummaryState:
+    """Summarizes one feature of one batch."""
+    if kind == "numerical":
+        values, counts = np.unique(to_numpy(data), return_counts=True)
+        return _make_numerical_summary(values, counts, max_numerical_values)
+
+    category_counts = count_categories(data)
+    return SummaryState(
+        values=list(category_counts), counts=list(category_counts.values())
+    )
+
+
+def _merge_summaries(
+    summaries: List[SummaryState],
+    kind: str,
+    max_numerical_values: Optional[int] = None,
+) -> SummaryState:
+    """Combines summaries of one feature of one dataset."""
+    if kind == "numerical":
+        values = np.concatenate(
+            [np.asarray(summary["values"], dtype=np.float64) for summary in summaries]
+        )
+        counts = np.concatenate(
+            [np.asarray(summary["counts"], dtype=np.int64) for summary in summaries]
+        )
+        merged_values, inverse = np.unique(values, return_inverse=True)
+        merged_counts = np.bincount(
+            inverse, weights=counts, minlength=len(merged_values)
+        )
+        return _make_numerical_summary(
+            merged_values, merged_counts.astype(np.int64), max_numerical_values
+        )
+
+    category_counts: Dict[Any, int] = {}
+    for summary in summaries:
+        summary_counts = summary["counts"]
+        for index, value in enumerate(summary["values"]):
+            category_counts[value] = (
+                category_counts.get(value, 0) + summary_counts[index]
+            )
+    return SummaryState(
+        values=list(category_counts), counts=list(category_counts.values())
+    )
+
+
+def _make_numerical_summary(
+    values: np.ndarray, counts: np.ndarray, max_values: Optional[int]
+) -> SummaryState:
+    """Summarizes sorted distinct values, binned to at most `max_values`."""
+    if max_values is not None and len(values) > max_values:
+        cumulative_counts = np.cumsum(counts)
+        bins = np.ceil(cumulative_counts * max_values / cumulative_counts[-1]).astype(
+            np.int64
+        )
+        last_in_bin = np.flatnonzero(np.diff(bins, append=max_values + 1))
+        values = values[last_in_bin]
+        counts = np.diff(cumulative_counts[last_in_bin], prepend=0)
+
+    return SummaryState(values=values.tolist(), counts=counts.tolist())
+
+
+def _merge_datasets(datasets: List[DatasetState]) -> DatasetState:
+    """Combines shapes of batches of one dataset."""
+    dataset = DatasetState(
+        num_rows=sum(dataset["num_rows"] for dataset in datasets),
+        num_columns=max((dataset["num_columns"] for dataset in datasets), default=0),
+    )
+    return dataset
+
+
+def _test(feature_state: FeatureState) -> StatisticalTestResultType:
+    """Applies the feature kind's statistical test to complete summaries."""
+    baseline = feature_state["baseline"]
+    test = feature_state["test"]
+    if feature_state["kind"] == "numerical":
+        test_statistic, p_value = stats.kolmogorov_smirnov_from_distributions(
+            np.asarray(baseline["values"], dtype=np.float64),
+            np.cumsum(baseline["counts"]),
+            np.asarray(test["values"], dtype=np.float64),
+            np.cumsum(test["counts"]),
+        )
+    else:
+        test_statistic, p_value = stats.chi_squared_from_counts(
+            _to_category_counts(baseline),
+            _to_category_counts(test),
+        )
+
+    return StatisticalTestResultType(test_statistic=test_statistic, p_value=p_value)
+
+
+def _to_category_counts(summary: SummaryState) -> Dict[Any, int]:
+    """Gets the count of each category in a summary."""
+    counts = summary["counts"]
+    category_counts = {
+        value: counts[index] for index, value in enumerate(summary["values"])
+    }
+    return category_counts
+
+
+def _validate_dataset(dataset: str) -> None:
+    if dataset not in DATASETS:
+        raise BadDataFileError(
+            f"Dataset {dataset!r} is not supported. "
+            "Supported datasets are 'baseline' and 'test'."
+        )
+
+
+def _validate_batch_has_features(
+    batch: Union[pa.RecordBatch, pa.Table], feature_mapping: Dict[str, FeatureType]
+) -> None:
+    for name in feature_mapping:
+        if name not in batch.schema.names:
+            raise BadDataFileError(
+                f"Batch does not contain feature {name!r} from feature mapping."
+            )
@@ -0,0 +1,114 @@
+"""Binary encoding of Data Drift records and responses.
+
+Records and responses are encoded as compressed Arrow IPC streams, laid out
+as record tables are: a record's features are the columns of the stream's
+table, with floats packed as binary, and the rest of the record is JSON in
+the table's schema metadata. Responses add their status and message (and
+any body other than a record, as JSON) to that metadata:
+
+    payload = encode_response(response)
+    response = decode_response(payload)
+
+Encoding is lossless, and payloads are far smaller, and faster to encode
+and decode, than JSON for records with many features.
+"""
+
+import json
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.data.response import Response
+from raitools.services.data_drift.record_tables import (
+    record_from_table,
+    record_to_table,
+)
+
+RESPONSE_KEY = b"raitools.response"
+
+COMPRESSION = "lz4"
+
+# String columns with a value per feature, which are not worth encoding as
+# dictionaries.
+UNIQUE_COLUMNS = {"name"}
+
+
+def encode_record(record: DataDriftRecord) -> bytes:
+    """Encodes a record."""
+    return _encode_table(record_to_table(record))
+
+
+def decode_record(payload: bytes) -> DataDriftRecord:
+    """Decodes a record."""
+    return record_from_table(_decode_table(payload))
+
+
+def encode_response(response: Response) -> bytes:
+    """Encodes a response, with its record, if any, as a record table."""
+    envelope = response.dict(exclude={"body"})
+    if isinstance(response.body, DataDriftRecord):
+        table = record_to_table(response.body)
+    else:
+        table = pa.table({})
+        envelope["body"] = response.body.dict()
+
+    metadata = table.schema.metadata or {}
+    metadata[RESPONSE_KEY] = json.dumps(envelope)
+    payload = _encode_table(table.replace_schema_metadata(metadata))
+    return payload
+
+
+def decode_response(payload: bytes) -> Response:
+    """Decodes a response."""
+    table = _decode_table(payload)
+    metadata = table.schema.metadata or {}
+    if RESPONSE_KEY not in metadata:
+        raise BadRecordError("Payload does not have a response.")
+
+    envelope = json.loads(metadata[RESPONSE_KEY])
+    if "body" not in envelope:
+        envelope["body"] = record_from_table(table)
+    response = Response(**envelope)
+    return response
+
+
+def _encode_table(table: pa.Table) -> bytes:
+    """Writes a table as a compressed Arrow IPC stream."""
+    # Columns of a few distinct strings, such as test names, are written as
+    # indices into their distinct values.
+    columns = [
+        pc.dictionary_encode(table.column(name))
+        if pa.types.is_string(table.schema.field(name).type)
+        and name not in UNIQUE_COLUMNS
+        else table.column(name)
+        for name in table.column_names
+    ]
+    table = pa.table(columns, names=table.column_names).replace_schema_metadata(
+        table.schema.metadata
+    )
+
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_table(payload: bytes) -> pa.Table:
+    """Reads a table from an Arrow IPC stream."""
+    try:
+        encoded_table = pa.ipc.open_stream(payload).read_all()
+    except pa.ArrowInvalid as excinfo:
+        raise BadRecordError("Payload is not an Arrow IPC stream.") from excinfo
+
+    columns = [
+        pc.cast(column, column.type.value_type)
+        if pa.types.is_dictionary(column.type)
+        else column
+        for column in encoded_table.columns
+    ]
+    table = pa.table(columns, names=encoded_table.column_names)
+    table = table.replace_schema_metadata(encoded_table.schema.metadata)
+    return table
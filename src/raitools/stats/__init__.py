@@ -1,6 +1,16 @@
 """Stats for RAI Tooling."""
 
-__all__ = ["chi_squared", "kolmogorov_smirnov"]
+__all__ = [
+    "chi_squared",
+    "chi_squared_from_counts",
+    "kolmogorov_smirnov",
+    "kolmogorov_smirnov_from_counts",
+    "kolmogorov_smirnov_from_distributions",
+]
 
-from .chi_squared import chi_squared
-from .kolmogorov_smirnov import kolmogorov_smirnov
+from .chi_squared import chi_squared, chi_squared_from_counts
+from .kolmogorov_smirnov import (
+    kolmogorov_smirnov,
+    kolmogorov_smirnov_from_counts,
+    kolmogorov_smirnov_from_distributions,
+)
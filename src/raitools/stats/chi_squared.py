@@ -5,19 +5,33 @@ depends on concrete implementations from external packages.
 """
 
 
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
+import numpy as np
 from scipy.stats.contingency import chi2_contingency
 
 
-def chi_squared(baseline_data: List, test_data: List) -> Tuple[float, float]:
+def chi_squared(
+    baseline_data: Union[List, np.ndarray], test_data: Union[List, np.ndarray]
+) -> Tuple[float, float]:
     """Applies Chi-Squared test."""
     observed = create_contingency_table(baseline_data, test_data)
     chi2, p, _, _ = chi2_contingency(observed)
     return chi2, p
 
 
-def create_contingency_table(baseline_data: List, test_data: List) -> List[List[int]]:
+def chi_squared_from_counts(
+    baseline_counts: Dict[Any, int], test_counts: Dict[Any, int]
+) -> Tuple[float, float]:
+    """Applies Chi-Squared test to per-category counts."""
+    observed = create_contingency_table_from_counts(baseline_counts, test_counts)
+    chi2, p, _, _ = chi2_contingency(observed)
+    return chi2, p
+
+
+def create_contingency_table(
+    baseline_data: Union[List, np.ndarray], test_data: Union[List, np.ndarray]
+) -> List[List[int]]:
     """Creates a contingency table."""
     categories = set(baseline_data).union(set(test_data))
     baseline_counts = {category: 0 for category in categories}
@@ -32,3 +46,16 @@ def create_contingency_table(baseline_data: List, test_data: List) -> List[List[
     ]
 
     return observed
+
+
+def create_contingency_table_from_counts(
+    baseline_counts: Dict[Any, int], test_counts: Dict[Any, int]
+) -> List[List[int]]:
+    """Creates a contingency table from per-category counts."""
+    categories = set(baseline_counts).union(set(test_counts))
+    observed = [
+        [baseline_counts.get(category, 0) for category in categories],
+        [test_counts.get(category, 0) for category in categories],
+    ]
+
+    return observed
@@ -1,15 +1,96 @@
-"""Chi-Squared statistical test.
+"""Kolmogorov-Smirnov statistical test.
 
 This implementation does not depend on anything inside a service. It only
 depends on concrete implementations from external packages.
 """
 
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
-from scipy.stats import ks_2samp
+import numpy as np
+from scipy.stats import distributions, ks_2samp
 
 
-def kolmogorov_smirnov(baseline_data: List, test_data: List) -> Tuple[float, float]:
+def kolmogorov_smirnov(
+    baseline_data: Union[List, np.ndarray], test_data: Union[List, np.ndarray]
+) -> Tuple[float, float]:
     """Applies Kilmogorov-Smirnov test."""
     statistic, pvalue = ks_2samp(baseline_data, test_data, method="asymp")
     return statistic, pvalue
+
+
+def kolmogorov_smirnov_from_counts(
+    baseline_cumulative_counts: np.ndarray,
+    test_counts_at: np.ndarray,
+    test_counts_below: np.ndarray,
+) -> Tuple[float, float]:
+    """Applies Kolmogorov-Smirnov test to test counts binned on the baseline.
+
+    The baseline is summarized by the cumulative counts at each of its sorted
+    distinct values. Test observations are summarized by how many fall on each
+    of those values (`test_counts_at`) and how many fall strictly between a
+    value and its predecessor (`test_counts_below`, with one extra bin for
+    observations above the largest value). That is enough to compute the
+    exact two-sample statistic, because both ECDFs are step functions that
+    can only cross at those points.
+    """
+    num_baseline = int(baseline_cumulative_counts[-1])
+    test_cumulative_counts = np.cumsum(test_counts_at + test_counts_below[:-1])
+    num_test = int(test_cumulative_counts[-1] + test_counts_below[-1])
+
+    previous_baseline_cumulative_counts = np.concatenate(
+        ([0], baseline_cumulative_counts[:-1])
+    )
+    cddiffs = np.concatenate(
+        (
+            baseline_cumulative_counts / num_baseline
+            - test_cumulative_counts / num_test,
+            previous_baseline_cumulative_counts / num_baseline
+            - (test_cumulative_counts - test_counts_at) / num_test,
+        )
+    )
+    statistic = max(float(np.max(cddiffs)), float(np.clip(-np.min(cddiffs), 0, 1)))
+    pvalue = kolmogorov_smirnov_p_value(statistic, num_baseline, num_test)
+    return statistic, pvalue
+
+
+def kolmogorov_smirnov_from_distributions(
+    baseline_values: np.ndarray,
+    baseline_cumulative_counts: np.ndarray,
+    test_values: np.ndarray,
+    test_cumulative_counts: np.ndarray,
+) -> Tuple[float, float]:
+    """Applies Kolmogorov-Smirnov test to two summarized samples.
+
+    Each sample is summarized by its sorted distinct values and the
+    cumulative counts at each of them. Both ECDFs are evaluated at every
+    distinct value of either sample, which is where they can differ most.
+    """
+    num_baseline = int(baseline_cumulative_counts[-1])
+    num_test = int(test_cumulative_counts[-1])
+
+    values = np.concatenate((baseline_values, test_values))
+    baseline_cdf = np.concatenate(([0], baseline_cumulative_counts))[
+        np.searchsorted(baseline_values, values, side="right")
+    ]
+    test_cdf = np.concatenate(([0], test_cumulative_counts))[
+        np.searchsorted(test_values, values, side="right")
+    ]
+    cddiffs = baseline_cdf / num_baseline - test_cdf / num_test
+
+    statistic = max(float(np.max(cddiffs)), float(np.clip(-np.min(cddiffs), 0, 1)))
+    pvalue = kolmogorov_smirnov_p_value(statistic, num_baseline, num_test)
+    return statistic, pvalue
+
+
+def kolmogorov_smirnov_p_value(
+    statistic: float, num_baseline: int, num_test: int
+) -> float:
+    """Computes the asymptotic two-sided p-value for a two-sample statistic.
+
+    This mirrors `ks_2samp(..., method="asymp")`, so results computed from
+    counts match results computed from the raw samples.
+    """
+    m, n = sorted([float(num_baseline), float(num_test)], reverse=True)
+    en = m * n / (m + n)
+    pvalue = float(np.clip(distributions.kstwo.sf(statistic, np.round(en)), 0, 1))
+    return pvalue
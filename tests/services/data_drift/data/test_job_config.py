@@ -1,11 +1,14 @@
 """Tests for data drift job config."""
 
-from typing import Dict
+from typing import Any, Dict
 from pydantic import ValidationError
 import pytest
 
 from raitools.exceptions import BadJobConfigError
-from raitools.services.data_drift.data.job_config import DataDriftJobConfig
+from raitools.services.data_drift.data.job_config import (
+    DataDriftJobConfig,
+    WindowSpec,
+)
 
 
 @pytest.fixture
@@ -108,3 +111,78 @@ def test_report_name_with_special_characters(
         DataDriftJobConfig(**full_job_config_dict)
 
     assert type(excinfo.value) == type(error) and excinfo.value.args == error.args
+
+
+@pytest.mark.parametrize(
+    "window,error",
+    [
+        (
+            {"kind": "hopping", "size": "P1D"},
+            BadJobConfigError(
+                "Window kind 'hopping' is not supported. "
+                "Supported window kinds are 'tumbling' and 'sliding'."
+            ),
+        ),
+        (
+            {"kind": "tumbling", "size": "one day"},
+            BadJobConfigError("Window size 'one day' is not a valid duration."),
+        ),
+        (
+            {"kind": "tumbling", "size": "0"},
+            BadJobConfigError("Window size '0' is not positive."),
+        ),
+        (
+            {"kind": "tumbling", "size": "P1D", "step": "P1D"},
+            BadJobConfigError("Tumbling windows do not take a step."),
+        ),
+        (
+            {"kind": "sliding", "size": "P7D"},
+            BadJobConfigError("Sliding windows require a step."),
+        ),
+    ],
+)
+def test_error_on_invalid_window(window: Dict, error: BadJobConfigError) -> None:
+    """Tests that we raise error if window spec is invalid."""
+    with pytest.raises(BadJobConfigError) as excinfo:
+        WindowSpec(**window)
+
+    assert type(excinfo.value) is type(error) and excinfo.value.args == error.args
+
+
+def test_error_on_window_without_timestamp_column(full_job_config_dict: Dict) -> None:
+    """Tests that we raise error if a window is given without a timestamp column."""
+    full_job_config_dict["window"] = {"kind": "tumbling", "size": "P1D"}
+    error = BadJobConfigError("Window requires a timestamp column.")
+
+    with pytest.raises(BadJobConfigError) as excinfo:
+        DataDriftJobConfig(**full_job_config_dict)
+
+    assert type(excinfo.value) is type(error) and excinfo.value.args == error.args
+
+
+@pytest.mark.parametrize(
+    "field_name,value,error",
+    [
+        ("slice_columns", [], BadJobConfigError("Slice columns are empty.")),
+        (
+            "slice_columns",
+            ["region", "region"],
+            BadJobConfigError("Slice columns ['region', 'region'] contain duplicates."),
+        ),
+        (
+            "min_segment_rows",
+            0,
+            BadJobConfigError("Minimum segment row count 0 is not positive."),
+        ),
+    ],
+)
+def test_error_on_invalid_segmentation(
+    field_name: str, value: Any, error: BadJobConfigError, full_job_config_dict: Dict
+) -> None:
+    """Tests that we raise error if segmentation settings are invalid."""
+    full_job_config_dict[field_name] = value
+
+    with pytest.raises(BadJobConfigError) as excinfo:
+        DataDriftJobConfig(**full_job_config_dict)
+
+    assert type(excinfo.value) is type(error) and excinfo.value.args == error.args
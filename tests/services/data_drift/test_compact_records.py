@@ -0,0 +1,151 @@
+"""Tests for compact records."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+import pytest
+
+from raitools.services.data_drift.api.get_report import get_report
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.compact_records import (
+    CompactDataDriftRecord,
+    compact_record,
+    expand_record,
+    LazyDataDriftRecord,
+    parse_record,
+    parse_report_record,
+)
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_report import create_report
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def _record(tmp_path: Path) -> DataDriftRecord:
+    """Creates a record with many features."""
+    bundle_path = prepare_bundle("with_113_features_spec.json", tmp_path)
+    record = create_record_from_bundle(
+        bundle=create_bundle_from_zip(bundle_path),
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    return record
+
+
+def test_compact_record_survives_round_trip(tmp_path: Path) -> None:
+    """Tests that we get back the record we compacted, through JSON."""
+    record = _record(tmp_path)
+
+    compact = parse_record(json.loads(compact_record(record).json()))
+
+    assert isinstance(compact, CompactDataDriftRecord)
+    assert compact.results.features == record.results.features
+    assert compact.results.drift_details == record.results.drift_details
+    assert expand_record(compact).json() == record.json()
+    assert len(compact.json()) < len(record.json()) * 0.6
+
+
+def test_compact_record_reports_as_record(tmp_path: Path) -> None:
+    """Tests that we get the same report from a record and its compact form."""
+    record = _record(tmp_path)
+    compact = compact_record(record)
+
+    assert create_report(compact, "simple") == create_report(record, "simple")
+    assert get_report(json.loads(compact.json()))["status_code"] == 200
+
+
+def test_error_on_invalid_columns(tmp_path: Path) -> None:
+    """Tests that we raise error if a feature's column has an invalid value."""
+    compact = json.loads(compact_record(_record(tmp_path)).json())
+    compact["results"]["columns"]["importance_score"][3] = 1.5
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_record(compact)
+
+    assert "Column 'importance_score' has invalid values." in str(excinfo.value)
+    assert get_report(compact)["status_code"] == 506
+
+
+def test_report_record_parses_features_if_read(tmp_path: Path) -> None:
+    """Tests that a record parsed for reports reads as the record."""
+    record = _record(tmp_path)
+
+    report_record = parse_report_record(json.loads(record.json()))
+
+    assert isinstance(report_record, LazyDataDriftRecord)
+    assert report_record.results.features == record.results.features
+    assert create_report(report_record, "simple") == create_report(record, "simple")
+
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [
+        ("p_value", 1.5, "Column 'p_value' has invalid values."),
+        ("drift_status", "unknown", "Column 'drift_status' has invalid values."),
+        ("rank", None, "Column 'rank' has missing values."),
+    ],
+)
+def test_error_on_invalid_drift_details(
+    field: str, value: Any, message: str, tmp_path: Path
+) -> None:
+    """Tests that we raise error if drift details have an invalid value."""
+    record = json.loads(_record(tmp_path).json())
+    record["results"]["drift_details"]["observations"][field][3] = value
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_report_record(record)
+
+    assert message in str(excinfo.value)
+    assert get_report(record)["status_code"] == 506
+
+
+def test_error_on_missing_drift_details(tmp_path: Path) -> None:
+    """Tests that we raise error if drift details do not have every feature."""
+    record = json.loads(_record(tmp_path).json())
+    for column in record["results"]["drift_details"]["observations"].values():
+        column.pop()
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_report_record(record)
+
+    assert "Drift details do not have every feature." in str(excinfo.value)
+
+
+def test_error_on_features_not_in_drift_details(tmp_path: Path) -> None:
+    """Tests that we raise error if features are not those of drift details."""
+    record = json.loads(_record(tmp_path).json())
+    features = record["results"]["features"]
+    features["renamed"] = features.pop(next(iter(features)))
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_report_record(record)
+
+    assert "Features do not have every feature." in str(excinfo.value)
+    assert get_report(record)["status_code"] == 506
+
+
+@pytest.mark.parametrize(
+    "features, message",
+    [
+        ({}, "Features do not have every feature."),
+        (None, "Features are not all mappings."),
+    ],
+)
+def test_error_on_invalid_features(features: Any, message: str, tmp_path: Path) -> None:
+    """Tests that we raise error if features are missing or not mappings."""
+    record = json.loads(_record(tmp_path).json())
+    if features is None:
+        features = dict.fromkeys(record["results"]["features"], [])
+    record["results"]["features"] = features
+
+    with pytest.raises(ValidationError) as excinfo:
+        parse_report_record(record)
+
+    assert message in str(excinfo.value)
+    assert get_report(record)["status_code"] == 506
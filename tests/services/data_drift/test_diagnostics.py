@@ -0,0 +1,97 @@
+"""Tests for timing and memory diagnostics."""
+
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+from raitools.services.data_drift.api.get_record import get_record
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.data_drift_record import ResourceUsage
+from raitools.services.data_drift.diagnostics import (
+    collect_diagnostics,
+    get_active_diagnostics,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_report import create_report
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.mark.parametrize("execution_mode", ["serial", "thread"])
+def test_diagnostics_cover_stages_and_features(
+    execution_mode: str, tmp_path: Path
+) -> None:
+    """Tests that every stage and feature is measured."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+
+    with collect_diagnostics() as diagnostics:
+        bundle = create_bundle_from_zip(bundle_path)
+        record = create_record_from_bundle(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            timestamp="1970-01-01T00:00:00+00:00",
+            uuid="deadbeef0123456",
+            execution_mode=execution_mode,
+        )
+        create_report(record, report_builder="simple")
+
+    assert {
+        "create_bundle",
+        "get_drift_results",
+        "compile_record",
+        "render_report",
+    } <= set(diagnostics.stages)
+    for stage in ["unzip_data", "parse_data"]:
+        assert f"{stage}/{bundle.job_config.baseline_data_filename}" in (
+            diagnostics.stages
+        )
+    assert set(diagnostics.features) == set(bundle.feature_mapping.feature_mapping)
+    for stages in diagnostics.features.values():
+        assert set(stages) == {"to_numpy", "statistical_test"}
+
+    assert record.diagnostics is not None
+    assert "render_report" not in record.diagnostics.stages
+    assert record.diagnostics.features == diagnostics.features
+
+
+def test_diagnostics_hook_is_called(tmp_path: Path) -> None:
+    """Tests that the hook receives each measurement."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    measurements: List[Tuple[str, Optional[str], ResourceUsage]] = []
+
+    def hook(stage: str, feature: Optional[str], usage: ResourceUsage) -> None:
+        measurements.append((stage, feature, usage))
+
+    with collect_diagnostics(hook):
+        create_bundle_from_zip(bundle_path)
+
+    assert measurements[-1][:2] == ("create_bundle", None)
+    assert all(usage.wall_time >= 0 for _, _, usage in measurements)
+
+
+def test_no_diagnostics_by_default(tmp_path: Path) -> None:
+    """Tests that records have no diagnostics unless they are collected."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+
+    bundle = create_bundle_from_zip(bundle_path)
+    record = create_record_from_bundle(
+        bundle, bundle_path.name, "1970-01-01T00:00:00+00:00", "deadbeef0123456"
+    )
+
+    assert get_active_diagnostics() is None
+    assert record.diagnostics is None
+
+
+def test_get_record_with_diagnostics(tmp_path: Path) -> None:
+    """Tests that the API includes diagnostics on request."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+
+    response = get_record(
+        str(bundle_path), "1970-01-01T00:00:00+00:00", "deadbeef0123456", True
+    )
+
+    assert response["status_code"] == 200
+    assert "get_drift_results" in response["body"]["diagnostics"]["stages"]
@@ -0,0 +1,149 @@
+"""Tests for distributed drift results."""
+
+from pathlib import Path
+import socket
+import threading
+from typing import Iterator
+
+import pyarrow as pa
+import pytest
+
+from raitools.exceptions import WorkerError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.distributed import (
+    AddressType,
+    LocalCluster,
+    get_distributed_drift_results,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+    create_record_from_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    get_drift_results,
+)
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.fixture(scope="module")
+def cluster() -> Iterator[LocalCluster]:
+    """Starts two local workers shared by all tests."""
+    with LocalCluster(num_workers=2) as local_cluster:
+        yield local_cluster
+
+
+@pytest.fixture
+def failing_worker() -> Iterator[AddressType]:
+    """Starts a worker that drops every connection after reading from it."""
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def accept_and_drop() -> None:
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                connection.recv(1)
+
+    thread = threading.Thread(target=accept_and_drop, daemon=True)
+    thread.start()
+    yield server.getsockname()
+    server.close()
+
+
+def test_distributed_record_matches_local_record(
+    cluster: LocalCluster, tmp_path: Path
+) -> None:
+    """Tests that results gathered from workers give the same record."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    feature_mapping = {
+        name: FeatureType(name=name, kind=feature.kind)
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    drift_results = get_distributed_drift_results(
+        bundle.baseline_data,
+        bundle.test_data,
+        feature_mapping,
+        cluster.addresses,
+        shard_size=3,
+    )
+    record = create_record_from_drift_results(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        drift_results=drift_results,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    assert drift_results == get_drift_results(
+        bundle.baseline_data, bundle.test_data, feature_mapping
+    )
+    assert_equal_records(expected_record, record)
+
+
+def test_failed_shards_are_retried_on_other_workers(
+    cluster: LocalCluster, failing_worker: AddressType, tmp_path: Path
+) -> None:
+    """Tests that shards sent to a failing worker are completed elsewhere."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    feature_mapping = {
+        name: FeatureType(name=name, kind=feature.kind)
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    drift_results = get_distributed_drift_results(
+        bundle.baseline_data,
+        bundle.test_data,
+        feature_mapping,
+        [failing_worker, ("127.0.0.1", 1), *cluster.addresses],
+        shard_size=1,
+    )
+
+    assert drift_results == get_drift_results(
+        bundle.baseline_data, bundle.test_data, feature_mapping
+    )
+
+
+def test_error_if_no_worker_completes_shards(
+    failing_worker: AddressType, tmp_path: Path
+) -> None:
+    """Tests that we raise error if shards fail on every worker."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    feature_mapping = {
+        name: FeatureType(name=name, kind=feature.kind)
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    with pytest.raises(WorkerError):
+        get_distributed_drift_results(
+            bundle.baseline_data, bundle.test_data, feature_mapping, [failing_worker]
+        )
+
+
+def test_stopped_worker_is_dropped() -> None:
+    """Tests that shards complete when a worker has stopped."""
+    baseline_data = pa.table({"feature": list(range(100))})
+    test_data = pa.table({"feature": list(range(50, 150))})
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+
+    with LocalCluster(num_workers=2) as local_cluster:
+        local_cluster.stop_worker(0)
+        drift_results = get_distributed_drift_results(
+            baseline_data, test_data, feature_mapping, local_cluster.addresses
+        )
+
+    assert drift_results == get_drift_results(baseline_data, test_data, feature_mapping)
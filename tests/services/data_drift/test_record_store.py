@@ -0,0 +1,110 @@
+"""Tests for the local record store."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift import record_store
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.record_store import RecordStore
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+TIMESTAMPS = [
+    "2022-01-15T00:00:00+00:00",
+    "2022-02-15T00:00:00+00:00",
+    "2022-03-15T00:00:00+00:00",
+    "2022-04-15T00:00:00+00:00",
+]
+
+
+def _records(spec_filename: str, tmp_path: Path) -> List[DataDriftRecord]:
+    """Creates a bundle's record at each timestamp."""
+    bundle_path = prepare_bundle(spec_filename, tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    records = [
+        create_record_from_bundle(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            timestamp=timestamp,
+            uuid=f"deadbeef{i}",
+        )
+        for i, timestamp in enumerate(TIMESTAMPS)
+    ]
+    return records
+
+
+def test_stored_record_is_read_back(tmp_path: Path) -> None:
+    """Tests that we get back the records we ingest, across instances."""
+    records = _records("with_13_features_spec.json", tmp_path)
+    with RecordStore(tmp_path / "store") as store:
+        record_ids = [store.ingest(record) for record in records]
+
+    with RecordStore(tmp_path / "store") as store:
+        assert len(store) == len(records)
+        for index, record in enumerate(records):
+            assert store.get_record(record_ids[index]).json() == record.json()
+
+
+def test_records_are_found_by_index(tmp_path: Path) -> None:
+    """Tests that we find records by their job config and timestamp."""
+    records = _records("simple_drifted_spec.json", tmp_path)
+    job_config = records[0].bundle.job_config
+    with RecordStore(tmp_path / "store") as store:
+        record_ids = [store.ingest(record) for record in records]
+
+        entries = store.find_records(
+            model_catalog_id=job_config.model_catalog_id,
+            dataset_name=job_config.dataset_name,
+            start="2022-02-01",
+            end="2022-04-01",
+        )
+        other_entries = store.find_records(report_name="other report")
+
+    assert [entry["record_id"] for entry in entries] == record_ids[1:3]
+    assert [entry["timestamp"] for entry in entries] == TIMESTAMPS[1:3]
+    assert other_entries == []
+
+
+def test_feature_statistics_are_filtered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that we get statistics of only the features asked for."""
+    monkeypatch.setattr(record_store, "MAX_FILES_PER_PARTITION", 1)
+    records = _records("with_13_features_spec.json", tmp_path)
+    # Records in one month share a partition, which gets compacted.
+    records.append(records[0].copy(deep=True))
+    with RecordStore(tmp_path / "store") as store:
+        record_ids = [store.ingest(record) for record in records]
+
+        statistics = store.get_feature_statistics(
+            record_ids[:2] + record_ids[-1:],
+            columns=["record_id", "name", "p_value"],
+            drift_status="drifted",
+        )
+
+    drifted_features = [
+        (record_ids[index], feature.name, feature.statistical_test.result.p_value)
+        for index, record in enumerate(records)
+        if index in [0, 1, len(records) - 1]
+        for feature in record.results.features.values()
+        if feature.drift_status == "drifted"
+    ]
+    assert sorted(
+        (row["record_id"], row["name"], row["p_value"])
+        for row in statistics.to_pylist()
+    ) == sorted(drifted_features)
+    assert len(list((tmp_path / "store" / "statistics").glob("*/*.parquet"))) == 4
+
+
+def test_error_on_unknown_record(tmp_path: Path) -> None:
+    """Tests that we raise error if a record is not in the store."""
+    with RecordStore(tmp_path / "store") as store:
+        with pytest.raises(BadRecordError):
+            store.get_record(1)
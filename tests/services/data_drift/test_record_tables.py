@@ -0,0 +1,90 @@
+"""Tests for records as Parquet or Arrow IPC files."""
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from raitools.exceptions import BadRecordError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.record_tables import (
+    read_record_table,
+    record_from_table,
+    record_to_table,
+    write_record_table,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def _record(tmp_path: Path) -> DataDriftRecord:
+    """Creates a record with many features."""
+    bundle_path = prepare_bundle("with_113_features_spec.json", tmp_path)
+    record = create_record_from_bundle(
+        bundle=create_bundle_from_zip(bundle_path),
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    return record
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "ipc"])
+def test_record_survives_round_trip(file_format: str, tmp_path: Path) -> None:
+    """Tests that we read back the record we wrote."""
+    record = _record(tmp_path)
+    path = tmp_path / f"record.{file_format}"
+
+    write_record_table(record, path, file_format)
+    actual_record = read_record_table(path)
+
+    assert actual_record.json() == record.json()
+    assert path.stat().st_size < len(record.json())
+
+
+def test_table_has_row_per_feature(tmp_path: Path) -> None:
+    """Tests that features are laid out as rows, in the record's order."""
+    record = _record(tmp_path)
+
+    table = record_to_table(record)
+
+    assert table.column("name").to_pylist() == list(record.results.features)
+    assert table.sort_by("rank").column("name").to_pylist() == (
+        record.results.drift_details.observations["name"]
+    )
+
+
+def test_error_on_invalid_feature_values(tmp_path: Path) -> None:
+    """Tests that we raise error if a feature's values break invariants."""
+    table = record_to_table(_record(tmp_path))
+    index = table.schema.get_field_index("importance_score")
+    table = table.set_column(
+        index,
+        table.schema.field(index),
+        pc.multiply(table.column("importance_score"), 2.0),
+    )
+
+    with pytest.raises(BadRecordError) as excinfo:
+        record_from_table(table)
+
+    assert excinfo.value.args[1] == "Column 'importance_score' has invalid values."
+
+
+def test_error_on_table_without_record_metadata() -> None:
+    """Tests that we raise error if a table does not hold a record."""
+    with pytest.raises(BadRecordError):
+        record_from_table(pa.table({"name": ["feature"]}))
+
+
+def test_error_on_file_of_other_format(tmp_path: Path) -> None:
+    """Tests that we raise error if a file is not Parquet or Arrow."""
+    path = tmp_path / "record.json"
+    path.write_text("{}")
+
+    with pytest.raises(BadRecordError):
+        read_record_table(path)
@@ -0,0 +1,142 @@
+"""Tests for the per-feature result cache."""
+
+from pathlib import Path
+
+import pyarrow as pa
+
+from raitools.services.data_drift.result_cache import ResultCache, make_cache_key
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    get_drift_results,
+)
+
+
+def _feature_mapping() -> dict:
+    """Creates feature mapping with two identical numerical features."""
+    feature_mapping = {
+        "feature_0": FeatureType(name="feature_0", kind="numerical"),
+        "feature_1": FeatureType(name="feature_1", kind="numerical"),
+        "feature_2": FeatureType(name="feature_2", kind="categorical"),
+    }
+    return feature_mapping
+
+
+def _baseline_data() -> pa.Table:
+    """Creates baseline data."""
+    baseline_data = pa.table(
+        {
+            "feature_0": list(range(100)),
+            "feature_1": list(range(100)),
+            "feature_2": ["A", "B"] * 50,
+        }
+    )
+    return baseline_data
+
+
+def _test_data() -> pa.Table:
+    """Creates test data."""
+    test_data = pa.table(
+        {
+            "feature_0": list(range(50, 150)),
+            "feature_1": list(range(50, 150)),
+            "feature_2": ["A", "B", "B", "B"] * 25,
+        }
+    )
+    return test_data
+
+
+def test_resubmission_is_served_from_cache(tmp_path: Path) -> None:
+    """Tests that unchanged features are not tested again."""
+    expected_results = get_drift_results(
+        _baseline_data(), _test_data(), _feature_mapping()
+    )
+    cache = ResultCache(tmp_path / "cache")
+
+    first_results = get_drift_results(
+        _baseline_data(), _test_data(), _feature_mapping(), cache=cache
+    )
+    second_results = get_drift_results(
+        _baseline_data(), _test_data(), _feature_mapping(), cache=cache
+    )
+
+    assert first_results == expected_results
+    assert second_results == expected_results
+    # The two identical numerical features share an entry, even on first run.
+    assert (cache.misses, cache.hits) == (2, 4)
+    assert len(cache) == 2
+
+
+def test_changed_feature_is_tested_again(tmp_path: Path) -> None:
+    """Tests that only features whose data changed miss the cache."""
+    cache = ResultCache(tmp_path / "cache")
+    get_drift_results(_baseline_data(), _test_data(), _feature_mapping(), cache=cache)
+    changed_test_data = _test_data().set_column(
+        2, "feature_2", pa.array(["A", "B"] * 50)
+    )
+
+    results = get_drift_results(
+        _baseline_data(), changed_test_data, _feature_mapping(), cache=cache
+    )
+
+    assert (cache.misses, cache.hits) == (3, 3)
+    assert results["feature_2"]["drift_result"]["drift_status"] == "not drifted"
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    """Tests that entries are read back from disk."""
+    get_drift_results(
+        _baseline_data(),
+        _test_data(),
+        _feature_mapping(),
+        cache=ResultCache(tmp_path / "cache"),
+    )
+    cache = ResultCache(tmp_path / "cache")
+
+    get_drift_results(_baseline_data(), _test_data(), _feature_mapping(), cache=cache)
+
+    assert (cache.misses, cache.hits) == (0, 3)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path: Path) -> None:
+    """Tests that the cache evicts least recently used entries when full."""
+    cache = ResultCache(tmp_path / "cache", max_entries=2)
+    result = StatisticalTestResultType(test_statistic=0.5, p_value=0.25)
+
+    cache.put("a", result)
+    cache.put("b", result)
+    cache.get("a")
+    cache.put("c", result)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == result
+    assert cache.get("c") == result
+    assert sorted(path.name for path in (tmp_path / "cache").iterdir()) == [
+        "a.json",
+        "c.json",
+    ]
+
+
+def test_cache_key_depends_on_data_and_parameters() -> None:
+    """Tests that the key changes with the data, test and parameters."""
+    baseline_data = pa.chunked_array([[1, 2, 3]])
+    test_data = pa.chunked_array([[2, 3, 4]])
+    parameters = {"significance_level": 0.05}
+    key = make_cache_key(baseline_data, test_data, "kolmogorov-smirnov", parameters)
+
+    assert key == make_cache_key(
+        pa.chunked_array([[1, 2, 3]]),
+        pa.chunked_array([[2, 3, 4]]),
+        "kolmogorov-smirnov",
+        {"significance_level": 0.05},
+    )
+    assert key != make_cache_key(
+        test_data, baseline_data, "kolmogorov-smirnov", parameters
+    )
+    assert key != make_cache_key(baseline_data, test_data, "chi-squared", parameters)
+    assert key != make_cache_key(
+        baseline_data, test_data, "kolmogorov-smirnov", {"significance_level": 0.01}
+    )
+    assert key != make_cache_key(
+        pa.chunked_array([[1, 2, None]]), test_data, "kolmogorov-smirnov", parameters
+    )
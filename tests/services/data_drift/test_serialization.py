@@ -0,0 +1,90 @@
+"""Tests for streaming JSON serialization."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from raitools.rai_error import RaiError
+from raitools.services.data_drift import serialization
+from raitools.services.data_drift.api.get_record import get_record, write_record
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.response import Response
+from raitools.services.data_drift.serialization import (
+    iter_json,
+    write_json,
+    write_json_file,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.mark.parametrize("max_copied_items", [1, 1000])
+def test_json_matches_dumped_dict(
+    max_copied_items: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that streamed JSON is byte-for-byte what json.dumps gives."""
+    monkeypatch.setattr(serialization, "MAX_COPIED_ITEMS", max_copied_items)
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    record = create_record_from_bundle(
+        bundle=create_bundle_from_zip(bundle_path),
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    stream = io.BytesIO()
+
+    write_json(record, stream)
+
+    assert stream.getvalue() == json.dumps(record.dict()).encode()
+
+
+def test_json_file_matches_dumped_dict(tmp_path: Path) -> None:
+    """Tests that strings are escaped as json.dumps escapes them."""
+    response = Response(
+        status_code=503,
+        status_desc="Failure",
+        message='Failed with "quotes",\nnewlines and ✓.',
+        body=RaiError(
+            api_version="rai-tools/v1.0.0",
+            kind="RaiError",
+            message="Bad data file error.",
+        ),
+    )
+    path = tmp_path / "response.json"
+
+    write_json_file(response, path)
+
+    assert path.read_bytes() == json.dumps(response.dict()).encode()
+
+
+def test_values_are_converted_as_dumped() -> None:
+    """Tests that values json.dumps converts are streamed the same way."""
+    error = RaiError(api_version="rai-tools/v1.0.0", kind="RaiError", message="✓")
+    value = {
+        1: [float("nan"), float("inf"), None, True],
+        None: ({"error": error},),
+    }
+
+    actual_json = "".join(iter_json(value))
+
+    assert actual_json == json.dumps({1: value[1], None: [{"error": error.dict()}]})
+
+
+def test_write_record_matches_get_record(tmp_path: Path) -> None:
+    """Tests that the written response is the JSON of get_record's response."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    stream = io.BytesIO()
+
+    write_record(str(bundle_path), "1970-01-01T00:00:00+00:00", "deadbeef0", stream)
+
+    assert (
+        stream.getvalue()
+        == json.dumps(
+            get_record(str(bundle_path), "1970-01-01T00:00:00+00:00", "deadbeef0")
+        ).encode()
+    )
@@ -0,0 +1,142 @@
+"""Tests for tracing hooks."""
+
+import json
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.tracing import (
+    NO_OP_SPAN,
+    NdjsonSpanExporter,
+    Span,
+    SpanObserver,
+    add_observer,
+    is_tracing,
+    remove_observer,
+    span,
+)
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_report import create_report
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+class RecordingObserver(SpanObserver):
+    """Keeps every span it sees."""
+
+    def __init__(self) -> None:
+        """Initializes observer."""
+        self.started: List[Span] = []
+        self.ended: List[Span] = []
+
+    def on_start(self, span: Span) -> None:
+        """Keeps started span."""
+        self.started.append(span)
+
+    def on_end(self, span: Span) -> None:
+        """Keeps ended span."""
+        self.ended.append(span)
+
+
+@pytest.fixture
+def observer() -> Iterator[RecordingObserver]:
+    """Registers a recording observer for the duration of a test."""
+    recording_observer = RecordingObserver()
+    add_observer(recording_observer)
+    yield recording_observer
+    remove_observer(recording_observer)
+
+
+@pytest.mark.parametrize("execution_mode", ["serial", "thread"])
+def test_spans_cover_pipeline(
+    execution_mode: str, observer: RecordingObserver, tmp_path: Path
+) -> None:
+    """Tests that every pipeline stage is traced with its attributes."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+
+    bundle = create_bundle_from_zip(bundle_path)
+    record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+        execution_mode=execution_mode,
+    )
+    create_report(record, report_builder="simple")
+
+    names = {span.name for span in observer.ended}
+    assert names == {
+        "open_bundle",
+        "read_member",
+        "validate",
+        "get_drift_results",
+        "feature_test",
+        "compile_record",
+        "render_report",
+    }
+    assert len(observer.started) == len(observer.ended)
+
+    feature_spans = [span for span in observer.ended if span.name == "feature_test"]
+    drift_results_span = next(
+        span for span in observer.ended if span.name == "get_drift_results"
+    )
+    assert {span.attributes["feature"] for span in feature_spans} == set(
+        bundle.feature_mapping.feature_mapping
+    )
+    for feature_span in feature_spans:
+        assert feature_span.parent_id == drift_results_span.span_id
+        assert feature_span.attributes["baseline_rows"] == bundle.baseline_data.num_rows
+        assert feature_span.attributes["drift_status"] in {"drifted", "not drifted"}
+
+    member_spans = [span for span in observer.ended if span.name == "read_member"]
+    data_span = next(
+        span
+        for span in member_spans
+        if span.attributes["member"] == bundle.job_config.baseline_data_filename
+    )
+    assert data_span.attributes["rows"] == bundle.baseline_data.num_rows
+    assert data_span.attributes["bytes"] > 0
+
+
+def test_span_records_error(observer: RecordingObserver) -> None:
+    """Tests that a span notes the error that ended it."""
+    with pytest.raises(BadDataFileError):
+        with span("validate", member="some_data.csv"):
+            raise BadDataFileError("Bad data.")
+
+    assert observer.ended[0].error == "BadDataFileError"
+
+
+def test_no_op_span_without_observers() -> None:
+    """Tests that no spans are created without observers."""
+    assert not is_tracing()
+    assert span("feature_test", feature="some_feature") is NO_OP_SPAN
+
+
+def test_is_tracing_with_observers(observer: RecordingObserver) -> None:
+    """Tests that call sites can tell that spans are observed."""
+    assert is_tracing()
+
+
+def test_ndjson_exporter_writes_one_line_per_span(tmp_path: Path) -> None:
+    """Tests that the exporter writes spans as newline-delimited JSON."""
+    spans_path = tmp_path / "spans.ndjson"
+    exporter = NdjsonSpanExporter(spans_path)
+    add_observer(exporter)
+    try:
+        with span("compile_record", features=2):
+            with span("feature_test", feature="some_feature"):
+                pass
+    finally:
+        remove_observer(exporter)
+        exporter.close()
+
+    spans = [json.loads(line) for line in spans_path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["feature_test", "compile_record"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+    assert spans[1]["attributes"] == {"features": 2}
@@ -0,0 +1,73 @@
+"""Tests for the binary wire format."""
+
+from pathlib import Path
+
+import pytest
+
+from raitools.exceptions import BadRecordError
+from raitools.rai_error import RaiError
+from raitools.services.data_drift.api.get_record import get_record, get_record_binary
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.response import Response
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.wire_format import (
+    decode_record,
+    decode_response,
+    encode_record,
+    encode_response,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def test_record_survives_round_trip(tmp_path: Path) -> None:
+    """Tests that we decode the record we encoded, in fewer bytes than JSON."""
+    bundle_path = prepare_bundle("with_113_features_spec.json", tmp_path)
+    record = create_record_from_bundle(
+        bundle=create_bundle_from_zip(bundle_path),
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    payload = encode_record(record)
+
+    assert decode_record(payload).json() == record.json()
+    assert len(payload) < len(record.json()) / 2
+
+
+def test_record_response_matches_get_record(tmp_path: Path) -> None:
+    """Tests that the decoded response is get_record's response."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+
+    payload = get_record_binary(
+        str(bundle_path), "1970-01-01T00:00:00+00:00", "deadbeef0"
+    )
+
+    assert decode_response(payload).dict() == get_record(
+        str(bundle_path), "1970-01-01T00:00:00+00:00", "deadbeef0"
+    )
+
+
+def test_error_response_survives_round_trip() -> None:
+    """Tests that we decode responses without records."""
+    response = Response(
+        status_code=503,
+        status_desc="Failure",
+        message="Failed to create DataDriftRecord.",
+        body=RaiError(
+            api_version="rai-tools/v1.0.0",
+            kind="RaiError",
+            message="Bad data file error.",
+        ),
+    )
+
+    assert decode_response(encode_response(response)) == response
+
+
+def test_error_on_payload_of_other_format() -> None:
+    """Tests that we raise error if a payload is not in the wire format."""
+    with pytest.raises(BadRecordError):
+        decode_response(b'{"status_code": 200}')
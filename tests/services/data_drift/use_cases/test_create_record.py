@@ -2,11 +2,20 @@
 
 from pathlib import Path
 
+import pyarrow as pa
 import pytest
 
+from raitools.exceptions import BadFeatureMappingError
 from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.bundle import Feature, FeatureMapping
 from raitools.services.data_drift.use_cases.create_record import (
     create_record_from_bundle,
+    create_record_from_drift_results,
+    validate_records,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    get_drift_results,
 )
 
 from tests.asserts import assert_equal_records
@@ -40,3 +49,57 @@ def test_can_process_bundle(
     )
 
     assert_equal_records(expected_record, actual_record)
+
+
+def test_validated_record_matches_trusted_record(tmp_path: Path) -> None:
+    """Tests that fully validating a record does not change it."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    trusted_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    with validate_records():
+        validated_record = create_record_from_bundle(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            timestamp="1970-01-01T00:00:00+00:00",
+            uuid="deadbeef0123456",
+        )
+
+    assert validated_record.json() == trusted_record.json()
+
+
+def test_error_on_invalid_feature_name(tmp_path: Path) -> None:
+    """Tests that we raise error if a feature name cannot be in a record."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    feature = next(iter(bundle.feature_mapping.feature_mapping.values()))
+    bundle.feature_mapping = FeatureMapping(
+        feature_mapping={
+            "0 feature": Feature(
+                name="0 feature",
+                kind="numerical",
+                importance_score=feature.importance_score,
+            )
+        }
+    )
+    drift_results = get_drift_results(
+        pa.table({"0 feature": list(range(100))}),
+        pa.table({"0 feature": list(range(50, 150))}),
+        {"0 feature": FeatureType(name="0 feature", kind="numerical")},
+    )
+
+    with pytest.raises(BadFeatureMappingError) as excinfo:
+        create_record_from_drift_results(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            drift_results=drift_results,
+            timestamp="1970-01-01T00:00:00+00:00",
+            uuid="deadbeef0123456",
+        )
+
+    assert excinfo.value.args[1] == "Feature name '0 feature' is not valid."
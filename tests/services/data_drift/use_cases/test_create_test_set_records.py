@@ -0,0 +1,96 @@
+"""Tests for create test set records use case."""
+
+import json
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+
+from raitools.exceptions import BadJobConfigError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_test_set_records import (
+    create_test_set_records_from_bundle,
+)
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def _prepare_bundle_with_test_sets(
+    tmp_path: Path, other_test_data_filename: str
+) -> Path:
+    """Prepares a bundle with a copy of the baseline as a second test set."""
+    single_bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle_path = tmp_path / "test_sets_bundle.zip"
+    with ZipFile(single_bundle_path) as single_zip_file, ZipFile(
+        bundle_path, "w"
+    ) as zip_file:
+        job_config = json.loads(single_zip_file.read("some_job_config.json"))
+        job_config["additional_test_data_filenames"] = ["other_test_data.csv"]
+        zip_file.writestr("some_job_config.json", json.dumps(job_config))
+        for filename in single_zip_file.namelist():
+            if filename != "some_job_config.json":
+                zip_file.writestr(filename, single_zip_file.read(filename))
+        zip_file.writestr(
+            other_test_data_filename, single_zip_file.read("some_baseline_data.csv")
+        )
+
+    return bundle_path
+
+
+@pytest.mark.parametrize("execution_mode", [("serial"), ("thread")])
+def test_one_record_per_test_set(execution_mode: str, tmp_path: Path) -> None:
+    """Tests that each test set is compared against the shared baseline."""
+    bundle_path = _prepare_bundle_with_test_sets(tmp_path, "other_test_data.csv")
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    records = create_test_set_records_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+        execution_mode=execution_mode,
+        max_workers=2,
+    )
+
+    assert list(records) == ["some_test_data.csv", "other_test_data.csv"]
+    assert_equal_records(expected_record, records["some_test_data.csv"])
+    other_record = records["other_test_data.csv"]
+    assert other_record.bundle.data["test_data"].filename == "other_test_data.csv"
+    assert other_record.results.drift_summary.num_features_drifted == 0
+
+
+def test_error_if_test_set_not_in_bundle(tmp_path: Path) -> None:
+    """Tests that we raise error if an additional test set is missing."""
+    bundle_path = _prepare_bundle_with_test_sets(tmp_path, "misnamed_test_data.csv")
+    expected_error = BadJobConfigError(
+        "Test data file `other_test_data.csv` referenced in `some_job_config.json` "
+        f"not in `{bundle_path}`."
+    )
+
+    with pytest.raises(BadJobConfigError) as excinfo:
+        create_bundle_from_zip(bundle_path)
+
+    assert excinfo.value.args == expected_error.args
+
+
+def test_error_if_execution_mode_unknown(tmp_path: Path) -> None:
+    """Tests that test sets are not evaluated in an unknown execution mode."""
+    bundle_path = _prepare_bundle_with_test_sets(tmp_path, "other_test_data.csv")
+    bundle = create_bundle_from_zip(bundle_path)
+
+    with pytest.raises(KeyError):
+        create_test_set_records_from_bundle(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            execution_mode="process",
+        )
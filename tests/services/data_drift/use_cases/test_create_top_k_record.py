@@ -0,0 +1,104 @@
+"""Tests for create top-k record use case."""
+
+from pathlib import Path
+
+import pytest
+
+from raitools.exceptions import BadTopKError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.data_drift_record import PositiveCount
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_top_k_record import (
+    create_top_k_record_from_bundle,
+    iter_ranked_drift_results,
+    rank_features,
+)
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.mark.parametrize("execution_mode", [("serial"), ("thread")])
+def test_top_k_record_covers_most_important_features(
+    execution_mode: str, tmp_path: Path
+) -> None:
+    """Tests that the record covers just the top-k features, as ranked overall."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    full_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    record = create_top_k_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        top_k=5,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+        execution_mode=execution_mode,
+        max_workers=2,
+    )
+
+    assert record.results.metadata.top_k == 5
+    assert record.results.drift_summary.num_total_features == 5
+    assert record.results.drift_details.observations["rank"] == [1, 2, 3, 4, 5]
+    assert record.results.features == {
+        name: feature
+        for name, feature in full_record.results.features.items()
+        if feature.rank <= 5
+    }
+
+
+def test_top_k_record_for_all_features_matches_full_record(tmp_path: Path) -> None:
+    """Tests that a top-k covering every feature gives the full record."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    num_features = len(bundle.feature_mapping.feature_mapping)
+
+    record = create_top_k_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        top_k=num_features,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    expected_record.results.metadata.top_k = PositiveCount(num_features)
+    assert_equal_records(expected_record, record)
+
+
+def test_ranked_results_stream_in_importance_order(tmp_path: Path) -> None:
+    """Tests that results are yielded most important first and can stop early."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    ranked_names = rank_features(bundle.feature_mapping.feature_mapping)
+
+    results = iter_ranked_drift_results(bundle)
+    first_names = [next(results)[0], next(results)[0]]
+    results.close()
+
+    assert first_names == ranked_names[:2]
+
+
+def test_error_if_top_k_not_positive(tmp_path: Path) -> None:
+    """Tests that we raise error if top-k is not positive."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+
+    expected_error = BadTopKError("Top-k 0 is not positive.")
+
+    with pytest.raises(BadTopKError) as excinfo:
+        iter_ranked_drift_results(bundle, top_k=0)
+
+    assert excinfo.value.args == expected_error.args
@@ -0,0 +1,126 @@
+"""Tests for create windowed records use case."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from raitools.exceptions import BadJobConfigError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.bundle import Bundle
+from raitools.services.data_drift.data.data_drift_record import ResultWindow
+from raitools.services.data_drift.data.job_config import WindowSpec
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.create_windowed_records import (
+    create_windowed_records_from_bundle,
+    get_windows,
+)
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+TIMESTAMPS = [
+    datetime(2022, 1, 1, hour) + timedelta(days=day)
+    for day, hour in [(0, 1), (0, 2), (0, 3), (1, 1), (1, 2), (1, 3), (1, 4)]
+    + [(2, 1), (2, 2), (2, 3)]
+]
+
+
+def _windowed_bundle(tmp_path: Path, window: WindowSpec) -> Bundle:
+    """Prepares a bundle whose test data has a timestamp column."""
+    bundle = create_bundle_from_zip(
+        prepare_bundle("simple_drifted_spec.json", tmp_path)
+    )
+    test_data = bundle.test_data.append_column(
+        "event_time", pa.array(TIMESTAMPS, pa.timestamp("s"))
+    )
+    job_config = bundle.job_config.copy(
+        update={"timestamp_column": "event_time", "window": window}
+    )
+    windowed_bundle = bundle.copy(
+        update={"job_config": job_config, "test_data": test_data}
+    )
+    return windowed_bundle
+
+
+def test_tumbling_windows_match_records_per_window(tmp_path: Path) -> None:
+    """Tests that each window's record matches a record for just that window."""
+    bundle = _windowed_bundle(tmp_path, WindowSpec(kind="tumbling", size="P1D"))
+
+    actual_records = create_windowed_records_from_bundle(
+        bundle=bundle,
+        bundle_filename="bundle.zip",
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    assert [record.results.metadata.window for record in actual_records] == [
+        ResultWindow(
+            start="2022-01-01T00:00:00+00:00", end="2022-01-02T00:00:00+00:00"
+        ),
+        ResultWindow(
+            start="2022-01-02T00:00:00+00:00", end="2022-01-03T00:00:00+00:00"
+        ),
+        ResultWindow(
+            start="2022-01-03T00:00:00+00:00", end="2022-01-04T00:00:00+00:00"
+        ),
+    ]
+    for index, (offset, length) in enumerate([(0, 3), (3, 4), (7, 3)]):
+        actual_record = actual_records[index]
+        window_bundle = bundle.copy(
+            update={"test_data": bundle.test_data.slice(offset, length)}
+        )
+        expected_record = create_record_from_bundle(
+            bundle=window_bundle,
+            bundle_filename="bundle.zip",
+            timestamp="1970-01-01T00:00:00+00:00",
+            uuid="deadbeef0123456",
+        )
+        expected_record.results.metadata.window = actual_record.results.metadata.window
+        assert_equal_records(expected_record, actual_record)
+
+
+def test_sliding_windows_overlap() -> None:
+    """Tests that sliding windows start every step and may overlap."""
+    data = pa.table({"event_time": pa.array(TIMESTAMPS, pa.timestamp("s"))})
+
+    windows = get_windows(
+        data, "event_time", WindowSpec(kind="sliding", size="P2D", step="P1D")
+    )
+
+    assert [window.data.num_rows for window in windows] == [3, 7, 7, 3]
+    assert [window.end - window.start for window in windows] == [timedelta(days=2)] * 4
+
+
+def test_sliding_windows_cover_first_and_last_rows() -> None:
+    """Tests that windows partly before the first row or after the last are kept."""
+    data = pa.table(
+        {"event_time": pa.array([datetime(2022, 1, 2, 1)], pa.timestamp("s"))}
+    )
+
+    windows = get_windows(
+        data, "event_time", WindowSpec(kind="sliding", size="P2D", step="P1D")
+    )
+
+    assert [window.start for window in windows] == [
+        datetime(2022, 1, 1, tzinfo=timezone.utc),
+        datetime(2022, 1, 2, tzinfo=timezone.utc),
+    ]
+    assert [window.data.num_rows for window in windows] == [1, 1]
+
+
+def test_error_if_no_window(tmp_path: Path) -> None:
+    """Tests that we raise error if the job config does not specify a window."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_error = BadJobConfigError(
+        "Job config `some_job_config.json` does not specify a window."
+    )
+
+    with pytest.raises(BadJobConfigError) as excinfo:
+        create_windowed_records_from_bundle(bundle, bundle_path.name)
+
+    assert excinfo.value.args == expected_error.args
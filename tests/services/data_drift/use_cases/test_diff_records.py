@@ -0,0 +1,77 @@
+"""Tests for record diff use case."""
+
+from pathlib import Path
+
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.data_drift_record import DataDriftRecord
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.diff_records import diff_records
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def _record(tmp_path: Path) -> DataDriftRecord:
+    """Creates a record with 13 features."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    record = create_record_from_bundle(
+        bundle=create_bundle_from_zip(bundle_path),
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    return record
+
+
+def test_diff_of_record_with_itself_is_empty(tmp_path: Path) -> None:
+    """Tests that a record does not differ from itself."""
+    record = _record(tmp_path)
+
+    record_diff = diff_records(record, record)
+
+    assert record_diff.added_features == []
+    assert record_diff.removed_features == []
+    assert record_diff.flipped_features == []
+    assert record_diff.changes.num_rows == len(record.results.features)
+    assert set(record_diff.changes.column("rank_change").to_pylist()) == {0}
+    assert set(record_diff.changes.column("p_value_change").to_pylist()) == {0.0}
+
+
+def test_diff_reports_changed_features(tmp_path: Path) -> None:
+    """Tests that we get added, removed, flipped and moved features."""
+    old_record = _record(tmp_path)
+    new_record = old_record.copy(deep=True)
+    observations = new_record.results.drift_details.observations
+    first, second, last = (
+        observations["name"][0],
+        observations["name"][1],
+        observations["name"][-1],
+    )
+    # The last feature is replaced, and the first two swap places.
+    observations["name"][-1] = "new_feature"
+    new_record.results.features["new_feature"] = new_record.results.features.pop(last)
+    observations["name"][0], observations["name"][1] = second, first
+    observations["drift_status"][0], observations["drift_status"][1] = (
+        observations["drift_status"][1],
+        observations["drift_status"][0],
+    )
+    flipped = (
+        "drifted" if observations["drift_status"][0] != "drifted" else "not drifted"
+    )
+    observations["drift_status"][0] = flipped
+    observations["p_value"][0] = observations["p_value"][1] + 0.5
+    new_record.results.features[second].statistical_test.result.test_statistic += 1.0
+
+    record_diff = diff_records(old_record, new_record)
+
+    changes = record_diff.changes.to_pylist()
+    assert record_diff.added_features == ["new_feature"]
+    assert record_diff.removed_features == [last]
+    assert record_diff.flipped_features == [second]
+    assert [change["name"] for change in changes[:2]] == [second, first]
+    assert [change["rank_change"] for change in changes[:2]] == [1, -1]
+    assert changes[0]["new_drift_status"] == flipped
+    assert changes[0]["p_value_change"] == 0.5
+    assert changes[0]["test_statistic_change"] == 1.0
+    assert all(change["rank_change"] == 0 for change in changes[2:])
@@ -0,0 +1,78 @@
+"""Tests for the drift monitor."""
+
+from pathlib import Path
+
+import pytest
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.drift_monitor import DriftMonitor
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.mark.parametrize(
+    "spec_filename",
+    [
+        ("simple_undrifted_spec.json"),
+        ("simple_drifted_spec.json"),
+        ("no_numerical_spec.json"),
+        ("no_categorical_spec.json"),
+        ("with_13_features_spec.json"),
+    ],
+)
+def test_snapshot_matches_record_from_bundle(
+    spec_filename: str, tmp_path: Path
+) -> None:
+    """Tests that folding in test data batch by batch gives the same record."""
+    bundle_path = prepare_bundle(spec_filename, tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    monitor = DriftMonitor(bundle)
+    for batch in bundle.test_data.to_batches(max_chunksize=3):
+        monitor.update(batch)
+    actual_record = monitor.snapshot(
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    assert_equal_records(expected_record, actual_record)
+
+
+def test_snapshot_without_test_data(tmp_path: Path) -> None:
+    """Tests that we raise error if no test data has been folded in."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    monitor = DriftMonitor(create_bundle_from_zip(bundle_path))
+    expected_error = BadDataFileError("Drift monitor has not received any test data.")
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        monitor.snapshot(bundle_filename=bundle_path.name)
+
+    assert excinfo.value.args == expected_error.args
+
+
+def test_update_with_missing_feature(tmp_path: Path) -> None:
+    """Tests that we raise error if a batch is missing a mapped feature."""
+    bundle_path = prepare_bundle("simple_drifted_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    monitor = DriftMonitor(bundle)
+    batch = bundle.test_data.drop(["numerical_feature_0"])
+    expected_error = BadDataFileError(
+        "Test data batch does not contain feature 'numerical_feature_0' from feature mapping."
+    )
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        monitor.update(batch)
+
+    assert excinfo.value.args == expected_error.args
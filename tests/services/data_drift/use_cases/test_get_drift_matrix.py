@@ -0,0 +1,102 @@
+"""Tests for get drift matrix use case."""
+
+import pyarrow as pa
+import pytest
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.stats.profiles import (
+    CategoricalProfile,
+    NumericalProfile,
+)
+from raitools.services.data_drift.use_cases.get_drift_matrix import get_drift_matrix
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    get_drift_results,
+)
+
+FEATURE_MAPPING = {
+    "numerical_feature_0": FeatureType(name="numerical_feature_0", kind="numerical"),
+    "categorical_feature_0": FeatureType(
+        name="categorical_feature_0", kind="categorical"
+    ),
+}
+
+
+def _datasets() -> dict:
+    """Creates a few monthly snapshots."""
+    datasets = {
+        f"month_{month}": pa.table(
+            {
+                "numerical_feature_0": [
+                    float((value * 7 + month) % 50) + month for value in range(100)
+                ],
+                "categorical_feature_0": [
+                    "ABCDEF"[(value + month) % (3 + month)] for value in range(100)
+                ],
+            }
+        )
+        for month in range(4)
+    }
+    return datasets
+
+
+@pytest.mark.parametrize("execution_mode", [("serial"), ("thread")])
+def test_matrix_matches_pairwise_results(execution_mode: str) -> None:
+    """Tests that every pair matches drift results computed on the raw data."""
+    datasets = _datasets()
+
+    drift_matrix = get_drift_matrix(
+        datasets, FEATURE_MAPPING, execution_mode=execution_mode, max_workers=2
+    )
+
+    assert drift_matrix.num_rows == 6 * len(FEATURE_MAPPING)
+    for row in drift_matrix.to_pylist():
+        expected_results = get_drift_results(
+            datasets[row["baseline"]], datasets[row["test"]], FEATURE_MAPPING
+        )
+        expected_result = expected_results[row["feature"]]["drift_result"]
+        expected_test = expected_result["statistical_test"]
+        assert row["test_statistic"] == pytest.approx(expected_test["test_statistic"])
+        assert row["p_value"] == pytest.approx(expected_test["p_value"])
+        assert row["drift_status"] == expected_result["drift_status"]
+
+
+def test_error_if_dataset_missing_feature() -> None:
+    """Tests that we raise error if a dataset is missing a mapped feature."""
+    datasets = _datasets()
+    datasets["month_2"] = datasets["month_2"].drop(["categorical_feature_0"])
+    expected_error = BadDataFileError(
+        "Dataset `month_2` does not contain feature 'categorical_feature_0' from feature mapping."
+    )
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        get_drift_matrix(datasets, FEATURE_MAPPING)
+
+    assert excinfo.value.args == expected_error.args
+
+
+def test_error_if_dataset_empty() -> None:
+    """Tests that we raise error if a dataset has no rows."""
+    datasets = _datasets()
+    datasets["month_2"] = datasets["month_2"].slice(0, 0)
+    expected_error = BadDataFileError("Dataset `month_2` has no rows.")
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        get_drift_matrix(datasets, FEATURE_MAPPING)
+
+    assert excinfo.value.args == expected_error.args
+
+
+def test_error_if_profiles_differ_in_kind() -> None:
+    """Tests that we raise error if profiles of different kinds are compared."""
+    data = _datasets()["month_0"]
+    numerical_profile = NumericalProfile(data.column("numerical_feature_0"))
+    categorical_profile = CategoricalProfile(data.column("categorical_feature_0"))
+    expected_error = BadDataFileError(
+        "CategoricalProfile cannot be compared with a NumericalProfile."
+    )
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        numerical_profile.compare(categorical_profile)
+
+    assert excinfo.value.args == expected_error.args
@@ -0,0 +1,195 @@
+"""Tests for get drift results use case."""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from pytest_mock import MockerFixture
+
+from raitools.services.data_drift.stats import statistical_tests
+from raitools.services.data_drift.stats.common import StatisticalTestResultType
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    RESULTS_SCHEMA,
+    FeatureType,
+    get_drift_results,
+    to_results_table,
+)
+
+
+def _data() -> Dict[str, pa.Table]:
+    """Creates small baseline and test datasets."""
+    baseline_data = pa.table(
+        {
+            "numerical_feature_0": list(range(100)),
+            "numerical_feature_1": [float(x) / 3 for x in range(100)],
+            "categorical_feature_0": ["A", "B", "C", "D"] * 25,
+        }
+    )
+    test_data = pa.table(
+        {
+            "numerical_feature_0": list(range(50, 150)),
+            "numerical_feature_1": [float(x) / 3 for x in range(100)],
+            "categorical_feature_0": ["C", "D", "E", "F"] * 25,
+        }
+    )
+    return {"baseline_data": baseline_data, "test_data": test_data}
+
+
+def _feature_mapping() -> Dict[str, FeatureType]:
+    """Creates feature mapping for the small datasets."""
+    feature_mapping = {
+        "numerical_feature_0": FeatureType(
+            name="numerical_feature_0", kind="numerical"
+        ),
+        "numerical_feature_1": FeatureType(
+            name="numerical_feature_1", kind="numerical"
+        ),
+        "categorical_feature_0": FeatureType(
+            name="categorical_feature_0", kind="categorical"
+        ),
+    }
+    return feature_mapping
+
+
+def test_thread_mode_matches_serial_mode() -> None:
+    """Tests that thread-pool execution gives the same results as serial."""
+    expected_results = get_drift_results(**_data(), feature_mapping=_feature_mapping())
+
+    actual_results = get_drift_results(
+        **_data(),
+        feature_mapping=_feature_mapping(),
+        execution_mode="thread",
+        max_workers=2,
+    )
+
+    assert list(actual_results) == list(expected_results)
+    assert actual_results == expected_results
+
+
+def test_thread_mode_runs_unsafe_tests_serially(mocker: MockerFixture) -> None:
+    """Tests that tests not marked thread-safe run in the calling thread."""
+    calling_thread = threading.current_thread()
+    chi_squared = statistical_tests["categorical"]["method"]
+    threads_used = []
+
+    def unsafe_chi_squared(
+        baseline_data: List, test_data: List
+    ) -> StatisticalTestResultType:
+        threads_used.append(threading.current_thread())
+        return chi_squared(baseline_data, test_data)
+
+    mocker.patch.dict(
+        statistical_tests,
+        {
+            "categorical": {
+                "name": "chi-squared",
+                "kind": "categorical",
+                "method": unsafe_chi_squared,
+                "thread_safe": False,
+            }
+        },
+    )
+
+    get_drift_results(
+        **_data(),
+        feature_mapping=_feature_mapping(),
+        execution_mode="thread",
+        max_workers=2,
+    )
+
+    assert threads_used == [calling_thread]
+
+
+def test_generous_budget_gives_exact_results() -> None:
+    """Tests that features within budget are tested exactly."""
+    expected_results = get_drift_results(**_data(), feature_mapping=_feature_mapping())
+
+    actual_results = get_drift_results(
+        **_data(), feature_mapping=_feature_mapping(), feature_budget=60.0
+    )
+
+    assert actual_results == expected_results
+
+
+@pytest.mark.parametrize(
+    "feature_budget,job_budget",
+    [
+        (0.0, None),
+        (None, 0.0),
+        (60.0, 0.0),
+    ],
+)
+def test_exhausted_budget_gives_approximate_results(
+    feature_budget: Optional[float], job_budget: Optional[float]
+) -> None:
+    """Tests that features over budget are tested approximately."""
+    exact_results = get_drift_results(**_data(), feature_mapping=_feature_mapping())
+
+    actual_results = get_drift_results(
+        **_data(),
+        feature_mapping=_feature_mapping(),
+        feature_budget=feature_budget,
+        job_budget=job_budget,
+    )
+
+    assert actual_results["numerical_feature_0"]["approximation"] == "subsample"
+    assert actual_results["categorical_feature_0"]["approximation"] == "binned"
+    for feature_name, result in actual_results.items():
+        # The datasets are smaller than any approximation, so nothing is lost.
+        assert result["drift_result"] == exact_results[feature_name]["drift_result"]
+
+
+def test_subsample_approximates_large_numerical_feature() -> None:
+    """Tests that a subsampled test reaches the same conclusion."""
+    generator = np.random.default_rng(42)
+    baseline_data = pa.table({"feature": generator.normal(0.0, 1.0, 100_000)})
+    test_data = pa.table({"feature": generator.normal(0.5, 1.0, 100_000)})
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+    exact_results = get_drift_results(baseline_data, test_data, feature_mapping)
+
+    actual_results = get_drift_results(
+        baseline_data, test_data, feature_mapping, feature_budget=0.0
+    )
+
+    exact_statistic = exact_results["feature"]["drift_result"]["statistical_test"]
+    actual_statistic = actual_results["feature"]["drift_result"]["statistical_test"]
+    assert actual_results["feature"]["approximation"] == "subsample"
+    assert actual_statistic["test_statistic"] == pytest.approx(
+        exact_statistic["test_statistic"], abs=0.1
+    )
+    assert actual_statistic["outcome"] == exact_statistic["outcome"]
+
+
+def test_binned_approximates_high_cardinality_categorical_feature() -> None:
+    """Tests that rare categories are binned together."""
+    baseline_data = pa.table({"feature": [str(x % 1000) for x in range(10_000)]})
+    test_data = pa.table({"feature": [str(x % 100) for x in range(10_000)]})
+    feature_mapping = {"feature": FeatureType(name="feature", kind="categorical")}
+
+    actual_results = get_drift_results(
+        baseline_data, test_data, feature_mapping, feature_budget=0.0
+    )
+
+    assert actual_results["feature"]["approximation"] == "binned"
+    assert actual_results["feature"]["drift_result"]["drift_status"] == "drifted"
+
+
+def test_results_table_has_row_per_feature() -> None:
+    """Tests that results are laid out as columns in feature order."""
+    drift_results = get_drift_results(
+        **_data(), feature_mapping=_feature_mapping(), job_budget=0.0
+    )
+
+    results_table = to_results_table(drift_results)
+
+    assert results_table.schema == RESULTS_SCHEMA
+    assert results_table.column("name").to_pylist() == list(_feature_mapping())
+    assert results_table.column("p_value").to_pylist() == [
+        result["drift_result"]["statistical_test"]["p_value"]
+        for result in drift_results.values()
+    ]
+    assert results_table.column("approximation").to_pylist() == [
+        result.get("approximation") for result in drift_results.values()
+    ]
@@ -0,0 +1,123 @@
+"""Tests for drift trends use case."""
+
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.record_store import RecordStore
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.get_drift_trends import (
+    detect_change_points,
+    get_feature_trends,
+    get_model_trends,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+def _statistics(test_statistics: np.ndarray) -> pa.Table:
+    """Lays out a [features x records] array of statistics as a table."""
+    num_features, num_records = test_statistics.shape
+    # Rows are shuffled, to show that they are put in order.
+    order = np.random.default_rng(0).permutation(num_features * num_records)
+    statistics = pa.table(
+        {
+            "record_id": np.tile(np.arange(num_records), num_features),
+            "timestamp": np.tile(
+                [
+                    f"2022-01-01T00:{i // 60:02d}:{i % 60:02d}"
+                    for i in range(num_records)
+                ],
+                num_features,
+            ),
+            "name": np.repeat(
+                [f"feature_{i}" for i in range(num_features)], num_records
+            ),
+            "test_statistic": test_statistics.ravel(),
+            "p_value": 1.0 - test_statistics.ravel(),
+            "drift_status": np.where(
+                test_statistics.ravel() > 0.5, "drifted", "not drifted"
+            ),
+        }
+    ).take(order)
+    return statistics
+
+
+def test_trends_are_laid_out_by_feature_and_record() -> None:
+    """Tests that we get each feature's statistics in order of timestamp."""
+    test_statistics = np.random.default_rng(0).random((3, 5))
+    statistics = _statistics(test_statistics)
+    # A feature missing from a record has no statistics there.
+    statistics = statistics.filter(
+        pa.compute.invert(
+            pa.compute.and_(
+                pa.compute.equal(statistics.column("name"), "feature_2"),
+                pa.compute.equal(statistics.column("record_id"), 4),
+            )
+        )
+    )
+
+    trends = get_feature_trends(statistics)
+
+    order = np.argsort(trends.features)
+    expected_test_statistics = test_statistics.copy()
+    expected_test_statistics[2, 4] = np.nan
+    assert sorted(trends.features) == ["feature_0", "feature_1", "feature_2"]
+    assert trends.record_ids == [0, 1, 2, 3, 4]
+    np.testing.assert_array_equal(
+        trends.test_statistics[order], expected_test_statistics
+    )
+    np.testing.assert_array_equal(
+        trends.drifted[order], np.nan_to_num(expected_test_statistics) > 0.5
+    )
+
+
+def test_change_points_are_detected_in_shifted_features() -> None:
+    """Tests that we find where statistics shift, and only there."""
+    test_statistics = np.random.default_rng(0).normal(0.2, 0.01, (50, 100))
+    test_statistics[:10, 60:] += 0.1
+    trends = get_feature_trends(_statistics(test_statistics))
+
+    change_points = detect_change_points(trends).sort_by("feature")
+
+    shifted = [f"feature_{i}" for i in range(10)]
+    timestamps = {
+        row["feature"]: row["change_point"] for row in change_points.to_pylist()
+    }
+    assert {name for name, timestamp in timestamps.items() if timestamp} == set(shifted)
+    assert all(timestamps[name] >= trends.timestamps[60] for name in shifted)
+    assert all(timestamps[name] <= trends.timestamps[62] for name in shifted)
+
+
+def test_model_trends_are_read_from_store(tmp_path: Path) -> None:
+    """Tests that we get trends of the records of a model in a store."""
+    bundle_path = prepare_bundle("with_13_features_spec.json", tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    timestamps = ["2022-01-15T00:00:00+00:00", "2022-02-15T00:00:00+00:00"]
+    records = [
+        create_record_from_bundle(
+            bundle=bundle,
+            bundle_filename=bundle_path.name,
+            timestamp=timestamp,
+            uuid=f"deadbeef{i}",
+        )
+        for i, timestamp in enumerate(timestamps)
+    ]
+    with RecordStore(tmp_path / "store") as store:
+        for record in records:
+            store.ingest(record)
+
+        trends = get_model_trends(store, bundle.job_config.model_catalog_id)
+        change_points = detect_change_points(trends)
+
+    features = records[0].results.features
+    assert trends.timestamps == timestamps
+    assert sorted(trends.features) == sorted(features)
+    for index, name in enumerate(trends.features):
+        expected = features[name].statistical_test.result.test_statistic
+        assert trends.test_statistics[index].tolist() == [expected, expected]
+    assert change_points.column("change_point").null_count == len(features)
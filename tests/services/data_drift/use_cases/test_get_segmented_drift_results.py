@@ -0,0 +1,111 @@
+"""Tests for get segmented drift results use case."""
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.data.bundle import Bundle
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import (
+    FeatureType,
+    get_drift_results,
+)
+from raitools.services.data_drift.use_cases.get_segmented_drift_results import (
+    get_segments,
+)
+
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+BASELINE_REGIONS = ["east", "west"] * 5
+TEST_REGIONS = ["east", "west", "west", "north", "west", "east", "west", "east"] + [
+    "west",
+    None,
+]
+
+
+def _segmented_bundle(tmp_path: Path, min_segment_rows: int) -> Bundle:
+    """Prepares a bundle with a region slice column."""
+    bundle = create_bundle_from_zip(
+        prepare_bundle("simple_drifted_spec.json", tmp_path)
+    )
+    job_config = bundle.job_config.copy(
+        update={"slice_columns": ["region"], "min_segment_rows": min_segment_rows}
+    )
+    segmented_bundle = bundle.copy(
+        update={
+            "job_config": job_config,
+            "baseline_data": bundle.baseline_data.append_column(
+                "region", pa.array(BASELINE_REGIONS)
+            ),
+            "test_data": bundle.test_data.append_column(
+                "region", pa.array(TEST_REGIONS)
+            ),
+        }
+    )
+    return segmented_bundle
+
+
+def test_segments_partition_both_datasets() -> None:
+    """Tests that segments hold the matching rows of both datasets."""
+    baseline_data = pa.table(
+        {"region": ["a", "b", "a", "b"], "product": ["x", "x", "y", "x"]}
+    )
+    test_data = pa.table(
+        {"region": ["b", "a", "a", "c"], "product": ["x", "x", "y", "y"]}
+    )
+
+    segments, num_skipped_segments = get_segments(
+        baseline_data, test_data, ["region", "product"]
+    )
+
+    assert [segment.key for segment in segments] == [
+        {"region": "a", "product": "x"},
+        {"region": "a", "product": "y"},
+        {"region": "b", "product": "x"},
+    ]
+    assert [segment.baseline_data.num_rows for segment in segments] == [1, 1, 2]
+    assert [segment.test_data.num_rows for segment in segments] == [1, 1, 1]
+    assert num_skipped_segments == 1
+
+
+def test_record_has_results_by_segment(tmp_path: Path) -> None:
+    """Tests that each segment's results match results for just its rows."""
+    bundle = _segmented_bundle(tmp_path, min_segment_rows=3)
+    feature_mapping = {
+        name: FeatureType(name=name, kind=feature.kind)
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename="bundle.zip",
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    segments = record.results.segments
+    assert segments is not None
+    assert segments.num_skipped_segments == 2
+    assert [segment.key for segment in segments.segments] == [
+        {"region": "east"},
+        {"region": "west"},
+    ]
+    for segment in segments.segments:
+        region = segment.key["region"]
+        expected_results = get_drift_results(
+            bundle.baseline_data.filter(
+                pc.equal(bundle.baseline_data.column("region"), region)
+            ),
+            bundle.test_data.filter(
+                pc.equal(bundle.test_data.column("region"), region)
+            ),
+            feature_mapping,
+        )
+        for name, feature in segment.features.items():
+            expected_test = expected_results[name]["drift_result"]["statistical_test"]
+            assert feature.statistical_test.result.p_value == expected_test["p_value"]
+            assert feature.rank == record.results.features[name].rank
@@ -0,0 +1,160 @@
+"""Tests for partial aggregates use case."""
+
+import json
+from pathlib import Path
+import random
+
+import pyarrow as pa
+import pytest
+
+from raitools.exceptions import BadDataFileError
+from raitools.services.data_drift.bundles import create_bundle_from_zip
+from raitools.services.data_drift.use_cases.create_record import (
+    create_record_from_bundle,
+)
+from raitools.services.data_drift.use_cases.get_drift_results import FeatureType
+from raitools.services.data_drift.use_cases.partial_aggregates import (
+    create_record_from_state,
+    finalize,
+    merge,
+    partial,
+)
+
+from tests.asserts import assert_equal_records
+from tests.services.data_drift.use_cases.common import prepare_bundle
+
+
+@pytest.mark.parametrize(
+    "spec_filename",
+    [
+        ("simple_drifted_spec.json"),
+        ("no_numerical_spec.json"),
+        ("no_categorical_spec.json"),
+        ("with_13_features_spec.json"),
+    ],
+)
+def test_record_from_merged_states_matches_record_from_bundle(
+    spec_filename: str, tmp_path: Path
+) -> None:
+    """Tests that partials merged in any grouping give the same record."""
+    bundle_path = prepare_bundle(spec_filename, tmp_path)
+    bundle = create_bundle_from_zip(bundle_path)
+    expected_record = create_record_from_bundle(
+        bundle=bundle,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+    feature_mapping = {
+        name: FeatureType(name=name, kind=feature.kind)
+        for name, feature in bundle.feature_mapping.feature_mapping.items()
+    }
+
+    states = [
+        partial(batch, feature_mapping, "baseline")
+        for batch in bundle.baseline_data.to_batches(max_chunksize=3)
+    ] + [
+        partial(batch, feature_mapping, "test")
+        for batch in bundle.test_data.to_batches(max_chunksize=4)
+    ]
+    random.Random(0).shuffle(states)
+    # States survive serialization, and merges can be nested.
+    states = [json.loads(json.dumps(state)) for state in states]
+    state = merge([merge(states[:2]), merge(states[2:])])
+
+    record = create_record_from_state(
+        state=state,
+        job_config=bundle.job_config,
+        job_config_filename=bundle.job_config_filename,
+        feature_mapping=bundle.feature_mapping,
+        bundle_filename=bundle_path.name,
+        timestamp="1970-01-01T00:00:00+00:00",
+        uuid="deadbeef0123456",
+    )
+
+    assert_equal_records(expected_record, record)
+
+
+def test_state_is_compact() -> None:
+    """Tests that states hold distinct values only."""
+    feature_mapping = {"feature": FeatureType(name="feature", kind="categorical")}
+    batch = pa.table({"feature": ["A", "B"] * 1000})
+
+    state = merge([partial(batch, feature_mapping, "baseline")] * 10)
+
+    assert state["baseline"]["num_rows"] == 20_000
+    assert state["features"]["feature"]["baseline"] == {
+        "values": ["A", "B"],
+        "counts": [10_000, 10_000],
+    }
+
+
+def test_error_if_finalized_without_test_data() -> None:
+    """Tests that we raise error if a feature has no test observations."""
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+    state = partial(pa.table({"feature": [1, 2, 3]}), feature_mapping, "baseline")
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        finalize(state)
+
+    assert excinfo.value.args[1] == "Feature 'feature' has no test observations."
+
+
+def test_error_if_batch_missing_feature() -> None:
+    """Tests that we raise error if a batch does not contain a feature."""
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+
+    with pytest.raises(BadDataFileError):
+        partial(pa.table({"other_feature": [1, 2, 3]}), feature_mapping, "test")
+
+
+def test_numerical_state_is_bounded() -> None:
+    """Tests that numerical states hold at most the requested number of values."""
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+    rng = random.Random(0)
+    baseline_batches = [
+        pa.table({"feature": [rng.gauss(0, 1) for _ in range(1000)]}) for _ in range(10)
+    ]
+    test_batches = [
+        pa.table({"feature": [rng.gauss(0.1, 1) for _ in range(1000)]})
+        for _ in range(10)
+    ]
+    states = [partial(batch, feature_mapping, "baseline") for batch in baseline_batches]
+    states += [partial(batch, feature_mapping, "test") for batch in test_batches]
+    bounded_states = [
+        partial(batch, feature_mapping, "baseline", max_numerical_values=100)
+        for batch in baseline_batches
+    ]
+    bounded_states += [
+        partial(batch, feature_mapping, "test", max_numerical_values=100)
+        for batch in test_batches
+    ]
+
+    exact_state = merge(states)
+    bounded_state = merge(bounded_states, max_numerical_values=100)
+
+    assert len(exact_state["features"]["feature"]["baseline"]["values"]) == 10_000
+    bounded_feature_state = bounded_state["features"]["feature"]
+    for summary in [bounded_feature_state["baseline"], bounded_feature_state["test"]]:
+        assert len(summary["values"]) <= 100
+        assert sum(summary["counts"]) == 10_000
+    exact_result = finalize(exact_state)["feature"]["drift_result"]["statistical_test"]
+    bounded_result = finalize(bounded_state)["feature"]["drift_result"][
+        "statistical_test"
+    ]
+    assert bounded_result["test_statistic"] == pytest.approx(
+        exact_result["test_statistic"], abs=2 / 100
+    )
+
+
+def test_error_if_dataset_unknown() -> None:
+    """Tests that we raise error if a batch is of neither dataset."""
+    feature_mapping = {"feature": FeatureType(name="feature", kind="numerical")}
+
+    with pytest.raises(BadDataFileError) as excinfo:
+        partial(pa.table({"feature": [1, 2, 3]}), feature_mapping, "other")
+
+    assert excinfo.value.args[1] == (
+        "Dataset 'other' is not supported. "
+        "Supported datasets are 'baseline' and 'test'."
+    )
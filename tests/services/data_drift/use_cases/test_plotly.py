@@ -1,9 +1,18 @@
 """Plotly tests."""
 
+import json
 from pathlib import Path
+import re
+from typing import Dict, Iterator, List, Tuple
 
+import bs4
+from plotly.offline import get_plotlyjs
 import pytest
 
+from raitools.services.data_drift.reports.plotly_report_builder import (
+    plotly_report_builder,
+    write_plotlyjs,
+)
 from raitools.services.data_drift.use_cases.create_report import create_report
 from tests.services.data_drift.use_cases.common import prepare_record
 
@@ -54,3 +63,60 @@ def test_can_generate_report_with_plotly(
     output_path.mkdir(parents=True, exist_ok=True)
     report_path = output_path / report_html_filename
     report_path.write_text(report.results)
+
+
+def test_report_loads_plotlyjs_once_in_head() -> None:
+    """Tests that plotly.js is included once, in the head of the report."""
+    record = prepare_record("with_13_features_record.json")
+
+    report = create_report(record, report_builder="plotly")
+
+    soup = bs4.BeautifulSoup(report.results, "html.parser")
+    assert soup.head is not None
+    assert report.results.count(get_plotlyjs()) == 1
+    assert get_plotlyjs() in soup.head.decode()
+    assert len(soup.find_all("html")) == 1
+
+
+def test_report_can_load_shared_plotlyjs(tmp_path: Path) -> None:
+    """Tests that reports can load plotly.js from a shared file."""
+    record = prepare_record("with_13_features_record.json")
+    plotlyjs_path = write_plotlyjs(tmp_path)
+
+    report_html = plotly_report_builder(record, plotlyjs_src=plotlyjs_path.name)
+
+    soup = bs4.BeautifulSoup(report_html, "html.parser")
+    assert soup.head is not None
+    assert plotlyjs_path.read_text(encoding="utf-8") == get_plotlyjs()
+    assert soup.head.find("script", src="plotly.min.js") is not None
+    assert get_plotlyjs() not in report_html
+
+
+def test_drift_details_table_has_one_payload_of_every_feature() -> None:
+    """Tests that the table's data is a single payload, with every feature."""
+    record = prepare_record("with_113_features_record.json")
+
+    report_html = plotly_report_builder(record, plotlyjs_src="plotly.min.js")
+
+    soup = bs4.BeautifulSoup(report_html, "html.parser")
+    payloads = soup.find_all("script", id="drift-details-data")
+    assert len(payloads) == 1
+    assert payloads[0].string is not None
+    payload = json.loads(payloads[0].string)
+    observations = record.results.drift_details.observations
+    assert payload["columns"]["name"] == observations["name"]
+    assert payload["columns"]["p_value"] == observations["p_value"]
+    for data, layout in _plotly_figures(report_html):
+        assert "sliders" not in layout
+        assert all(trace["type"] != "table" for trace in data)
+
+
+def _plotly_figures(report_html: str) -> Iterator[Tuple[List[Dict], Dict]]:
+    """Gets the data and layout of each Plotly figure in a report."""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r'Plotly\.newPlot\(\s*"[^"]*",\s*', report_html):
+        data, end = decoder.raw_decode(report_html, match.end())
+        layout_start = re.compile(r",\s*").match(report_html, end)
+        assert layout_start is not None
+        layout, _ = decoder.raw_decode(report_html, layout_start.end())
+        yield data, layout